@@ -0,0 +1,176 @@
+"""
+Before/after benchmark for the IndicatorValue covering indexes added in
+migration 0006.
+
+Loads a synthetic tract-level indicator_value table, then runs EXPLAIN ANALYZE
+for the hot read paths with and without the indexes. Everything runs inside
+one transaction that is rolled back, so it can be pointed at a development
+copy of a real database. Dropping the indexes inside the transaction locks
+indicator_value until the benchmark finishes -- do not run it against
+production.
+
+Run it from a project that has django_d3_indicator_viz installed and migrated:
+
+    DJANGO_SETTINGS_MODULE=myproject.settings python benchmarks/indicator_value_indexes.py --rows 5000000
+"""
+import argparse
+import statistics
+
+import django
+
+
+INDEXES = {
+    "iv_loc_ind_end_idx": (
+        "create index iv_loc_ind_end_idx on indicator_value (location_id, indicator_id, end_date) "
+        "include (source_id, filter_option_id, start_date, value)"
+    ),
+    "iv_ind_src_end_idx": (
+        "create index iv_ind_src_end_idx on indicator_value (indicator_id, source_id, end_date)"
+    ),
+}
+
+QUERIES = {
+    # Section read: a handful of locations and every indicator in a section
+    "section_values": (
+        """
+        select iv.*
+        from indicator_value iv
+            join indicator i on iv.indicator_id = i.id
+            join category c on i.category_id = c.id
+        where iv.location_id = any(%(location_ids)s) and c.section_id = %(section_id)s
+        """
+    ),
+    # The MAX(end_date) subquery used by the profile raw SQL
+    "latest_vintage": (
+        """
+        select max(end_date)
+        from indicator_value
+        where indicator_id = %(indicator_id)s and source_id = %(source_id)s
+        """
+    ),
+    # Header data: every value for a location and a set of indicators
+    "header_values": (
+        """
+        select indicator_id, source_id, end_date, value
+        from indicator_value
+        where location_id = %(location_id)s and indicator_id = any(%(indicator_ids)s)
+        """
+    ),
+}
+
+
+def load_synthetic_data(cursor, rows, indicators, years):
+    """
+    Creates a synthetic location type, section, indicators and sources, and
+    fills indicator_value with roughly `rows` rows spread over tract-like
+    locations. Returns the query parameters for the benchmark queries.
+    """
+    locations = max(rows // (indicators * years), 1)
+
+    cursor.execute("insert into location_type (name, sort_order) values ('bench tract', 0) returning id")
+    location_type_id = cursor.fetchone()[0]
+    cursor.execute("insert into section (name, sort_order) values ('bench section', 0) returning id")
+    section_id = cursor.fetchone()[0]
+    cursor.execute(
+        "insert into category (name, about, sort_order, section_id, share_axes) "
+        "values ('bench category', '', 0, %s, false) returning id",
+        [section_id],
+    )
+    category_id = cursor.fetchone()[0]
+    cursor.execute("insert into indicator_source (name) values ('bench source') returning id")
+    source_id = cursor.fetchone()[0]
+    cursor.execute(
+        "insert into indicator (name, sort_order, category_id) "
+        "select 'bench indicator ' || n, n, %s from generate_series(1, %s) n returning id",
+        [category_id, indicators],
+    )
+    indicator_ids = [row[0] for row in cursor.fetchall()]
+    cursor.execute(
+        "insert into location (id, name, location_type_id) "
+        "select 'bench-' || n, 'Bench tract ' || n, %s from generate_series(1, %s) n",
+        [location_type_id, locations],
+    )
+    cursor.execute(
+        """
+        insert into indicator_value (source_id, start_date, end_date, indicator_id, location_id, value, active_data)
+        select %s, make_date(y, 1, 1), make_date(y, 12, 31), i, 'bench-' || l, random() * 1000, true
+        from generate_series(1, %s) l
+            cross join unnest(%s::bigint[]) i
+            cross join generate_series(2024 - %s, 2023) y
+        """,
+        [source_id, locations, indicator_ids, years],
+    )
+    cursor.execute("analyze indicator_value")
+
+    return {
+        "location_ids": ["bench-1", "bench-2", "bench-3"],
+        "location_id": "bench-1",
+        "section_id": section_id,
+        "indicator_id": indicator_ids[0],
+        "indicator_ids": indicator_ids[:10],
+        "source_id": source_id,
+    }
+
+
+def explain(cursor, sql, params, repeat):
+    """
+    Runs EXPLAIN ANALYZE `repeat` times and returns the top plan node types
+    and the median execution time in milliseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        cursor.execute("explain (analyze, buffers, format json) " + sql, params)
+        plan = cursor.fetchone()[0][0]
+        timings.append(plan["Execution Time"])
+
+    nodes = []
+    stack = [plan["Plan"]]
+    while stack:
+        node = stack.pop()
+        if "Relation Name" in node and node["Relation Name"] == "indicator_value":
+            nodes.append(f"{node['Node Type']}" + (f" ({node['Index Name']})" if "Index Name" in node else ""))
+        stack.extend(node.get("Plans", []))
+
+    return ", ".join(nodes) or plan["Plan"]["Node Type"], statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5_000_000, help="Approximate indicator_value rows to load.")
+    parser.add_argument("--indicators", type=int, default=50, help="Indicators in the synthetic section.")
+    parser.add_argument("--years", type=int, default=10, help="Vintages per indicator and location.")
+    parser.add_argument("--repeat", type=int, default=5, help="EXPLAIN ANALYZE runs per query.")
+    args = parser.parse_args()
+
+    django.setup()
+    from django.db import connection, transaction
+
+    results = {}
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            params = load_synthetic_data(cursor, args.rows, args.indicators, args.years)
+            cursor.execute("select count(*) from indicator_value")
+            print(f"indicator_value rows: {cursor.fetchone()[0]:,}")
+
+            for index_name in INDEXES:
+                cursor.execute(f"drop index if exists {index_name}")
+            cursor.execute("analyze indicator_value")
+            for name, sql in QUERIES.items():
+                results[name] = {"before": explain(cursor, sql, params, args.repeat)}
+
+            for create_sql in INDEXES.values():
+                cursor.execute(create_sql)
+            cursor.execute("analyze indicator_value")
+            for name, sql in QUERIES.items():
+                results[name]["after"] = explain(cursor, sql, params, args.repeat)
+
+        transaction.set_rollback(True)
+
+    print(f"{'query':<16} {'before ms':>10} {'after ms':>10}  plan before -> plan after")
+    for name, result in results.items():
+        (plan_before, ms_before), (plan_after, ms_after) = result["before"], result["after"]
+        print(f"{name:<16} {ms_before:>10.2f} {ms_after:>10.2f}  {plan_before} -> {plan_after}")
+
+
+if __name__ == "__main__":
+    main()
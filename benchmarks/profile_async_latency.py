@@ -0,0 +1,105 @@
+"""
+Wall-clock latency of the sync and async profile builds.
+
+For a sample of locations, builds the profile page context and renders every
+later section with the sync path (build_profile_page_context and
+render_section, one query after another) and the async path
+(abuild_profile_page_context and arender_section, independent queries run
+concurrently on their own connections). The profile cache is turned off so
+every build queries the database.
+
+The async path's worker threads only see committed rows, so point it at a
+development copy of a real, migrated database rather than synthetic rows in a
+rolled-back transaction:
+
+    DJANGO_SETTINGS_MODULE=myproject.settings python benchmarks/profile_async_latency.py --location-type Tract --sample 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import django
+
+
+def percentile(timings, fraction):
+    ordered = sorted(timings)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def summarize(name, timings):
+    return (
+        f"{name:<24} {statistics.median(timings):>10.1f} {percentile(timings, 0.95):>10.1f} "
+        f"{max(timings):>10.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--location-type", help="Sample locations of this location type name.")
+    parser.add_argument("--location", action="append", help="Benchmark these location ids instead of a sample.")
+    parser.add_argument("--sample", type=int, default=20, help="Locations to sample.")
+    parser.add_argument("--repeat", type=int, default=3, help="Builds per location and path.")
+    args = parser.parse_args()
+
+    django.setup()
+    from django.conf import settings
+    from django.test import RequestFactory
+
+    from django_d3_indicator_viz.models import Location, Section
+    from django_d3_indicator_viz.views import (
+        abuild_profile_page_context,
+        arender_section,
+        build_profile_page_context,
+        render_section,
+    )
+
+    settings.D3_INDICATOR_VIZ_PROFILE_CACHE = None
+
+    location_ids = args.location
+    if not location_ids:
+        locations = Location.objects.order_by("?")
+        if args.location_type:
+            locations = locations.filter(location_type__name=args.location_type)
+        location_ids = list(locations.values_list("id", flat=True)[: args.sample])
+    sections = list(Section.objects.order_by("sort_order")[1:])
+    request = RequestFactory().get("/")
+
+    def build_sync(location_id):
+        started = time.perf_counter()
+        context = build_profile_page_context(location_id)
+        built = time.perf_counter()
+        for section in sections:
+            render_section(request, section, location_id, context["parent_loc_ids"])
+        return (built - started) * 1000, (time.perf_counter() - built) * 1000
+
+    async def build_async(location_id):
+        started = time.perf_counter()
+        context = await abuild_profile_page_context(location_id)
+        built = time.perf_counter()
+        for section in sections:
+            await arender_section(request, section, location_id, context["parent_loc_ids"])
+        return (built - started) * 1000, (time.perf_counter() - built) * 1000
+
+    timings = {"profile (sync)": [], "profile (async)": [], "sections (sync)": [], "sections (async)": []}
+    for location_id in location_ids:
+        for _ in range(args.repeat):
+            profile_ms, sections_ms = build_sync(location_id)
+            timings["profile (sync)"].append(profile_ms)
+            timings["sections (sync)"].append(sections_ms)
+
+            profile_ms, sections_ms = asyncio.run(build_async(location_id))
+            timings["profile (async)"].append(profile_ms)
+            timings["sections (async)"].append(sections_ms)
+
+    print(f"{len(location_ids)} locations, {len(sections) + 1} sections, {args.repeat} builds each")
+    print(f"{'path':<24} {'median ms':>10} {'p95 ms':>10} {'max ms':>10}")
+    for name, values in timings.items():
+        print(summarize(name, values))
+    for step in ("profile", "sections"):
+        speedup = statistics.median(timings[f"{step} (sync)"]) / statistics.median(timings[f"{step} (async)"])
+        print(f"{step} speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Encode time of a full profile's JSON payloads with each encoder.
+
+Builds synthetic payloads shaped like build_profile_context's: indicator,
+location, location type, color scale, data visual and filter option rows,
+and indicator values with dates and Decimals for a primary location, its
+parents and its siblings. Each encoder writes all of them once per run:
+json.dumps(..., default=str) as the views used to, and the stdlib and orjson
+encoders of payloads.py.
+
+    python benchmarks/profile_json_encode.py --indicators 300 --locations 40 --years 10
+"""
+import argparse
+import datetime
+import decimal
+import json
+import os
+import random
+import sys
+import timeit
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+settings.configure()
+django.setup()
+
+from django_d3_indicator_viz import payloads  # noqa: E402
+
+
+def synthetic_profile(indicators, locations, years):
+    location_ids = [f"26163{n:06d}" for n in range(locations)]
+    values = []
+    for indicator_id in range(1, indicators + 1):
+        for location_id in location_ids:
+            for year in range(2024 - years, 2024):
+                value = decimal.Decimal(random.uniform(0, 1000)).quantize(decimal.Decimal("0.0001"))
+                values.append({
+                    "id": len(values) + 1,
+                    "indicator_id": indicator_id,
+                    "location_id": location_id,
+                    "source_id": 1,
+                    "filter_option_id": None,
+                    "start_date": datetime.date(year, 1, 1),
+                    "end_date": datetime.date(year, 12, 31),
+                    "value": value,
+                    "value_moe": value / 10,
+                    "count": None,
+                    "count_moe": None,
+                    "universe": None,
+                    "universe_moe": None,
+                })
+    return {
+        "indicators": [
+            {"id": i, "name": f"Indicator {i}", "category_id": i // 10, "sort_order": i, "format": "percentage"}
+            for i in range(1, indicators + 1)
+        ],
+        "locations": [
+            {"id": location_id, "name": f"Tract {location_id}", "location_type_id": 3, "color": None}
+            for location_id in location_ids
+        ],
+        "parent_locations": [
+            {"id": "26163", "name": "Wayne County", "location_type_id": 2, "color": "#333"},
+            {"id": "26", "name": "Michigan", "location_type_id": 1, "color": "#666"},
+        ],
+        "location_types": [{"id": i, "name": f"Type {i}", "sort_order": i} for i in range(1, 4)],
+        "color_scales": [{"id": i, "name": f"Scale {i}", "colors": ["#fff", "#000"]} for i in range(1, 10)],
+        "data_visuals": [
+            {"id": i, "indicator_id": i, "data_visual_type": "bar", "columns": 3, "updated_at": datetime.datetime(2024, 1, 1)}
+            for i in range(1, indicators + 1)
+        ],
+        "indicator_values": values,
+        "filter_options": [{"id": i, "name": f"Option {i}", "filter_id": 1} for i in range(1, 6)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--indicators", type=int, default=300, help="Indicators in the profile.")
+    parser.add_argument("--locations", type=int, default=40, help="Primary, parent and sibling locations.")
+    parser.add_argument("--years", type=int, default=10, help="Vintages per indicator and location.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs; the fastest is reported.")
+    args = parser.parse_args()
+
+    random.seed(0)
+    profile = synthetic_profile(args.indicators, args.locations, args.years)
+    encoders = {
+        "json.dumps(default=str)": lambda value: json.dumps(value, default=str),
+        "payloads.stdlib_dumps": payloads.stdlib_dumps,
+    }
+    if payloads.orjson is not None:
+        encoders["payloads.orjson_dumps"] = payloads.orjson_dumps
+
+    print(f"indicator values: {len(profile['indicator_values']):,}")
+    print(f"{'encoder':<26} {'bytes':>12} {'encode ms':>10}")
+    for name, encode in encoders.items():
+        size = sum(len(encode(payload)) for payload in profile.values())
+        seconds = min(timeit.repeat(
+            lambda: [encode(payload) for payload in profile.values()], number=1, repeat=args.repeat
+        ))
+        print(f"{name:<26} {size:>12,} {seconds * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
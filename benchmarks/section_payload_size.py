@@ -0,0 +1,81 @@
+"""
+Payload size and parse time of the section indicator values, as a list of
+dicts and with the columnar encoding from payloads.py.
+
+Builds synthetic rows shaped like Section.get_indicator_values(): a primary
+location and its comparison locations, every indicator of a section, a few
+filter options and several vintages for line charts. Parse time is measured
+with Python's json module, which tracks JSON.parse closely for the same text;
+the columnar numbers include decoding back to dicts.
+
+    python benchmarks/section_payload_size.py --indicators 40 --locations 3 --years 10
+"""
+import argparse
+import datetime
+import gzip
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from django_d3_indicator_viz.payloads import decode_columnar, encode_columnar  # noqa: E402
+
+
+def synthetic_rows(indicators, locations, years, filter_options):
+    rows = []
+    location_ids = [f"26163{n:06d}" for n in range(locations)]
+    for indicator_id in range(1, indicators + 1):
+        for location_id in location_ids:
+            for year in range(2024 - years, 2024):
+                for filter_option_id in [None, *range(1, filter_options + 1)]:
+                    value = random.uniform(0, 1000)
+                    rows.append({
+                        "id": len(rows) + 1,
+                        "indicator_id": indicator_id,
+                        "location_id": location_id,
+                        "source_id": 1,
+                        "filter_option_id": filter_option_id,
+                        "start_date": datetime.date(year, 1, 1).isoformat(),
+                        "end_date": datetime.date(year, 12, 31).isoformat(),
+                        "value": value,
+                        "value_moe": value / 10,
+                        "count": round(value * 3),
+                        "count_moe": value / 5,
+                        "universe": 3000,
+                        "universe_moe": None,
+                    })
+    return rows
+
+
+def measure(text, decode, repeat):
+    seconds = min(timeit.repeat(lambda: decode(json.loads(text)), number=1, repeat=repeat))
+    return len(text.encode()), len(gzip.compress(text.encode())), seconds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--indicators", type=int, default=40, help="Indicators in the section.")
+    parser.add_argument("--locations", type=int, default=3, help="Primary plus comparison locations.")
+    parser.add_argument("--years", type=int, default=10, help="Vintages per indicator and location.")
+    parser.add_argument("--filter-options", type=int, default=2, help="Filter options besides none.")
+    parser.add_argument("--repeat", type=int, default=20, help="Timing runs; the fastest is reported.")
+    args = parser.parse_args()
+
+    random.seed(0)
+    rows = synthetic_rows(args.indicators, args.locations, args.years, args.filter_options)
+    results = {
+        "dicts": measure(json.dumps(rows), lambda payload: payload, args.repeat),
+        "columnar": measure(json.dumps(encode_columnar(rows)), decode_columnar, args.repeat),
+    }
+
+    print(f"rows: {len(rows):,}")
+    print(f"{'encoding':<10} {'bytes':>12} {'gzip bytes':>12} {'parse ms':>10}")
+    for name, (size, gzip_size, ms) in results.items():
+        print(f"{name:<10} {size:>12,} {gzip_size:>12,} {ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
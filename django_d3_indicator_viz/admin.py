@@ -1,16 +1,32 @@
+import logging
+import threading
+
 from django.contrib import admin
-from django.db import models as django_models
+from django.core.exceptions import PermissionDenied
+from django.db import connections, models as django_models
 from django.forms import TextInput
-from django.urls import reverse
+from django.http import JsonResponse
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
 from django.utils.html import format_html
 
 from import_export.admin import ImportExportMixin
+from import_export.signals import post_import
 from adminsortable2.admin import SortableAdminBase
 from adminsortable2.admin import SortableAdminMixin
 from adminsortable2.admin import SortableTabularInline
 
 
 from .models import *
+from .resources import (
+    IndicatorValueResource,
+    finish_import_progress,
+    get_import_progress,
+    set_import_progress,
+)
+
+
+logger = logging.getLogger(__name__)
 
 
 class HiddenFromIndex(admin.ModelAdmin):
@@ -174,6 +190,91 @@ class IndicatorValueAdmin(ImportExportMixin, HiddenFromIndex):
     ]
     readonly_fields = ("id",)
     ordering = ["indicator", "location", "start_date", "end_date", "source"]
+    resource_classes = [IndicatorValueResource]
+    import_template_name = "admin/django_d3_indicator_viz/indicatorvalue/import.html"
+    import_running_template_name = "admin/django_d3_indicator_viz/indicatorvalue/import_running.html"
+
+    def get_urls(self):
+        return [
+            path(
+                "import_progress/",
+                self.admin_site.admin_view(self.import_progress),
+                name="django_d3_indicator_viz_indicatorvalue_import_progress",
+            ),
+            *super().get_urls(),
+        ]
+
+    def import_progress(self, request):
+        """
+        The progress of the user's running import, polled by the import page.
+        """
+        return JsonResponse(get_import_progress(request.user.pk) or {})
+
+    def process_import(self, request, **kwargs):
+        """
+        Runs the confirmed import in a background thread rather than the
+        request, so a whole vintage doesn't have to finish before the proxy
+        or worker times out. The page it returns polls import_progress until
+        the import is done.
+        """
+        if not self.has_import_permission(request):
+            raise PermissionDenied
+
+        confirm_form = self.create_confirm_form(request)
+        if not confirm_form.is_valid():
+            # Renders the form errors
+            return super().process_import(request, **kwargs)
+
+        input_format = self.get_import_formats()[int(confirm_form.cleaned_data["format"])](
+            encoding=self.from_encoding
+        )
+        tmp_storage = self.get_tmp_storage_class()(
+            name=confirm_form.cleaned_data["import_file_name"],
+            encoding=None if input_format.is_binary() else self.from_encoding,
+            read_mode=input_format.get_read_mode(),
+            **self.get_tmp_storage_class_kwargs(),
+        )
+        dataset = input_format.create_dataset(tmp_storage.read())
+        # Running from now on, before the thread gets to before_import
+        set_import_progress(
+            request.user.pk, {"processed": 0, "total": len(dataset), "dry_run": False, "done": False}
+        )
+
+        threading.Thread(
+            target=self.run_import,
+            args=(dataset, confirm_form, request, tmp_storage),
+            kwargs=kwargs,
+            name=f"indicator-value-import-{request.user.pk}",
+        ).start()
+
+        context = self.admin_site.each_context(request)
+        context.update({
+            "title": "Import",
+            "opts": self.model._meta,
+            "total": len(dataset),
+            "changelist_url": reverse(
+                "admin:%s_%s_changelist" % self.get_model_info(), current_app=self.admin_site.name
+            ),
+        })
+        return TemplateResponse(request, [self.import_running_template_name], context)
+
+    def run_import(self, dataset, confirm_form, request, tmp_storage, **kwargs):
+        """
+        Imports a confirmed dataset and records the outcome in the user's
+        import progress. Runs in a background thread with its own database
+        connection.
+        """
+        try:
+            result = self.process_dataset(dataset, confirm_form, request, **kwargs)
+            self.generate_log_entries(result, request)
+            post_import.send(sender=None, model=self.model)
+            finish_import_progress(request.user.pk, totals=dict(result.totals))
+        except Exception as e:
+            logger.exception("Indicator value import failed")
+            finish_import_progress(request.user.pk, error=str(e))
+        finally:
+            tmp_storage.remove()
+            connections.close_all()
 
 
 admin.site.register(IndicatorValue, IndicatorValueAdmin)
@@ -5,3 +5,8 @@ class DjangoD3DataVisualsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'django_d3_indicator_viz'
     label = 'django_d3_indicator_viz'
+
+    def ready(self):
+        # Keeps the derived tables in sync with the source data
+        from . import signals  # noqa: F401
+        from . import checks  # noqa: F401
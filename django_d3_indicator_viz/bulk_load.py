@@ -0,0 +1,401 @@
+"""
+Bulk loading of indicator values with COPY.
+
+Rows are read from a CSV or Parquet file with the same columns as the admin
+import (indicator, location, source and filter_option as ids, or as names for
+indicators, sources and filter options), resolved against lookup maps built
+once per load, and validated in Python. Each chunk is then copied into a
+temporary staging table and merged into indicator_value in one transaction,
+by a pool of workers with a database connection each.
+
+On PostgreSQL 15+, every row is merged with ON CONFLICT on the value key's
+NULLS NOT DISTINCT constraint (migration 0014), so chunks merge in parallel
+without locks. Without it, rows with a source and a filter option are merged
+with ON CONFLICT on the unique_together constraint, which considers NULLs
+distinct, so rows without one are merged with an update of the matching
+rows followed by an insert of the missing ones, one chunk at a time so
+parallel chunks can't both insert the same value. When a chunk holds the
+same value more than once, its last row wins; across chunks, the chunk
+merged last does.
+
+Like the other bulk operations, loads don't send model signals. The derived
+tables of the loaded indicators are refreshed and the profile cache is
+invalidated once the load finishes.
+"""
+import csv
+import datetime
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from io import StringIO
+from itertools import batched
+
+from django.db import connection, connections, transaction
+
+from .exports import pa
+from .models import (
+    Indicator,
+    IndicatorFilterOption,
+    IndicatorLatestVintage,
+    IndicatorSource,
+    Location,
+    ResolvedIndicatorValue,
+    UNCATEGORIZED,
+)
+from .partitioning import ensure_partitions, get_partition_key
+from .profile_cache import bump_data_version
+
+
+# The staging table columns, in COPY order
+STAGING_COLUMNS = (
+    "ordinal",
+    "source_id",
+    "start_date",
+    "end_date",
+    "indicator_id",
+    "filter_option_id",
+    "location_id",
+    "value",
+    "value_moe",
+    "count",
+    "count_moe",
+    "universe",
+    "universe_moe",
+)
+
+KEY_COLUMNS = ("source_id", "start_date", "end_date", "indicator_id", "filter_option_id", "location_id")
+
+VALUE_COLUMNS = ("value", "value_moe", "count", "count_moe", "universe", "universe_moe")
+
+STAGING_TABLE = "indicator_value_staging"
+
+# The unique constraint on the value key with NULLs not distinct
+KEY_CONSTRAINT = "indicator_value_key_uniq"
+
+# The advisory lock serializing merges of rows without a source or filter
+# option, when KEY_CONSTRAINT doesn't exist
+NULL_KEYS_LOCK = "d3iv:indicator_value:null_keys"
+
+CREATE_STAGING_SQL = f"""
+    create temp table {STAGING_TABLE} (
+        ordinal bigint not null,
+        source_id bigint,
+        start_date date not null,
+        end_date date not null,
+        indicator_id bigint not null,
+        filter_option_id bigint,
+        location_id text not null,
+        value double precision,
+        value_moe double precision,
+        count double precision,
+        count_moe double precision,
+        universe double precision,
+        universe_moe double precision
+    ) on commit drop
+"""
+
+# The last row of each key, with the denormalized category and section,
+# stamped the way IndicatorValue.stamp() does. Under section or category
+# partitioning the key can't be NULL.
+DEDUPLICATED_SQL = f"""
+    select distinct on ({", ".join(f"s.{column}" for column in KEY_COLUMNS)})
+        {", ".join(f"s.{column}" for column in STAGING_COLUMNS[1:])},
+        coalesce(i.category_id, {UNCATEGORIZED}),
+        coalesce(c.section_id, {UNCATEGORIZED})
+    from {STAGING_TABLE} s
+        join indicator i on i.id = s.indicator_id
+        left join category c on c.id = i.category_id
+    where {{where}}
+    order by {", ".join(f"s.{column}" for column in KEY_COLUMNS)}, s.ordinal desc
+"""
+
+INSERT_COLUMNS = (*STAGING_COLUMNS[1:], "category_id", "section_id")
+
+UPSERT_SQL = f"""
+    insert into indicator_value ({", ".join(INSERT_COLUMNS)}, active_data)
+    select d.*, false
+    from ({DEDUPLICATED_SQL}) d
+    on conflict on constraint {{constraint}} do update set
+        {", ".join(f"{column} = excluded.{column}" for column in VALUE_COLUMNS)}
+"""
+
+# Rows without a source or filter option, matched with the NULLs as equal.
+# Matches are found through the (location, indicator, end_date) index.
+NULL_KEY_MATCH = """
+    iv.location_id = d.location_id
+    and iv.indicator_id = d.indicator_id
+    and iv.end_date = d.end_date
+    and iv.start_date = d.start_date
+    and iv.source_id is not distinct from d.source_id
+    and iv.filter_option_id is not distinct from d.filter_option_id
+"""
+
+NULL_KEY_WHERE = "s.source_id is null or s.filter_option_id is null"
+
+NON_NULL_KEY_WHERE = "s.source_id is not null and s.filter_option_id is not null"
+
+UPDATE_NULL_KEYS_SQL = f"""
+    update indicator_value iv set
+        {", ".join(f"{column} = d.{column}" for column in VALUE_COLUMNS)}
+    from ({DEDUPLICATED_SQL.format(where=NULL_KEY_WHERE)}) d
+    where {NULL_KEY_MATCH}
+"""
+
+INSERT_NULL_KEYS_SQL = f"""
+    insert into indicator_value ({", ".join(INSERT_COLUMNS)}, active_data)
+    select d.*, false
+    from ({DEDUPLICATED_SQL.format(where=NULL_KEY_WHERE)}) d
+    where not exists (select 1 from indicator_value iv where {NULL_KEY_MATCH})
+"""
+
+
+class RejectedRow(ValueError):
+    pass
+
+
+@dataclass
+class LoadResult:
+    rows: int = 0
+    merged: int = 0
+    seconds: float = 0
+    rejects: Counter = field(default_factory=Counter)
+    indicator_ids: set = field(default_factory=set)
+    years: set = field(default_factory=set)
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0
+
+
+def name_map(queryset):
+    """
+    Maps ids, as strings, and names that are unique to ids.
+    """
+    names = Counter()
+    mapping = {}
+    rows = list(queryset.values_list("id", "name"))
+    for _, name in rows:
+        names[name] += 1
+    for id, name in rows:
+        mapping[str(id)] = id
+        if names[name] == 1:
+            mapping.setdefault(name, id)
+    return mapping
+
+
+class LookupMaps:
+    """
+    The ids that keys of the input resolve to, loaded once per load.
+    """
+
+    def __init__(self):
+        self.indicators = name_map(Indicator.objects.all())
+        self.sources = name_map(IndicatorSource.objects.all())
+        self.filter_options = name_map(IndicatorFilterOption.objects.all())
+        self.locations = set(Location.objects.values_list("id", flat=True))
+
+    def resolve(self, row):
+        """
+        The staging columns of an input row, without the ordinal. Raises
+        RejectedRow naming the problem.
+        """
+        indicator_id = self.lookup(self.indicators, row.get("indicator"), "indicator", required=True)
+        source_id = self.lookup(self.sources, row.get("source"), "source")
+        filter_option_id = self.lookup(self.filter_options, row.get("filter_option"), "filter_option")
+
+        location_id = blank_to_none(row.get("location"))
+        if location_id is None or str(location_id) not in self.locations:
+            raise RejectedRow("unknown location")
+
+        return (
+            source_id,
+            parse_date(row.get("start_date"), "start_date"),
+            parse_date(row.get("end_date"), "end_date"),
+            indicator_id,
+            filter_option_id,
+            str(location_id),
+            *(parse_float(row.get(column), column) for column in VALUE_COLUMNS),
+        )
+
+    @staticmethod
+    def lookup(mapping, key, name, required=False):
+        key = blank_to_none(key)
+        if key is None:
+            if required:
+                raise RejectedRow(f"missing {name}")
+            return None
+        try:
+            return mapping[str(key)]
+        except KeyError:
+            raise RejectedRow(f"unknown {name}")
+
+
+def blank_to_none(value):
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def parse_date(value, name):
+    value = blank_to_none(value)
+    if isinstance(value, datetime.date):
+        return value
+    try:
+        return datetime.date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise RejectedRow(f"invalid {name}")
+
+
+def parse_float(value, name):
+    value = blank_to_none(value)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise RejectedRow(f"invalid {name}")
+
+
+def read_rows(path, format=None, batch_size=100_000):
+    """
+    Yields the rows of a CSV or Parquet file as dicts. The format defaults to
+    the file extension.
+    """
+    format = format or ("parquet" if str(path).endswith(".parquet") else "csv")
+    if format == "parquet":
+        if pa is None:
+            raise ImportError("Loading Parquet files requires pyarrow: pip install django-d3-indicator-viz[export]")
+        for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield from batch.to_pylist()
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.DictReader(f)
+
+
+def unique_constraint_name(connection=connection):
+    """
+    The name of indicator_value's NULLS NOT DISTINCT key constraint when it
+    exists, and whether it does. Otherwise the name of the unique_together
+    constraint, which may include a partition key.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            select conname
+            from pg_constraint
+            where conrelid = 'indicator_value'::regclass and contype = 'u'
+            order by conname = %s desc, array_length(conkey, 1) desc
+            limit 1
+            """,
+            [KEY_CONSTRAINT],
+        )
+        name = cursor.fetchone()[0]
+    return name, name == KEY_CONSTRAINT
+
+
+def copy_rows(cursor, rows):
+    """
+    Copies rows into the staging table, with psycopg 3 or psycopg2.
+    """
+    sql = f"copy {STAGING_TABLE} ({', '.join(STAGING_COLUMNS)}) from stdin"
+    raw_cursor = cursor.cursor
+    if hasattr(raw_cursor, "copy"):
+        with raw_cursor.copy(sql) as copy:
+            for row in rows:
+                copy.write_row(row)
+    else:
+        buffer = StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        raw_cursor.copy_expert(f"{sql} with (format csv)", buffer)
+
+
+def merge_rows(cursor, rows, constraint, nulls_not_distinct):
+    """
+    Copies resolved rows, with their ordinals, into staging and merges them
+    into indicator_value inside the cursor's transaction. Returns the number
+    of rows merged.
+    """
+    cursor.execute(CREATE_STAGING_SQL)
+    copy_rows(cursor, rows)
+    cursor.execute(f"analyze {STAGING_TABLE}")
+
+    if nulls_not_distinct:
+        cursor.execute(UPSERT_SQL.format(where="true", constraint=constraint))
+        return cursor.rowcount
+
+    cursor.execute(UPSERT_SQL.format(where=NON_NULL_KEY_WHERE, constraint=constraint))
+    merged = cursor.rowcount
+
+    cursor.execute(f"select exists (select 1 from {STAGING_TABLE} s where {NULL_KEY_WHERE})")
+    if cursor.fetchone()[0]:
+        # Nothing stops two chunks from inserting the same value with a NULL
+        # key, so those merges take turns until commit
+        cursor.execute("select pg_advisory_xact_lock(hashtext(%s))", [NULL_KEYS_LOCK])
+        cursor.execute(UPDATE_NULL_KEYS_SQL)
+        merged += cursor.rowcount
+        cursor.execute(INSERT_NULL_KEYS_SQL)
+        merged += cursor.rowcount
+    return merged
+
+
+def merge_chunk(rows, constraint, nulls_not_distinct):
+    """
+    Merges a chunk of resolved rows in one transaction. Runs in a worker
+    thread with its own connection.
+    """
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            return merge_rows(cursor, rows, constraint, nulls_not_distinct)
+    finally:
+        connections.close_all()
+
+
+def load_indicator_values(rows, chunk_size=50_000, workers=4, on_reject=None, refresh=True):
+    """
+    Loads input rows, as dicts, into indicator_value. on_reject is called
+    with each rejected row and the reason. Returns a LoadResult.
+    """
+    started = time.perf_counter()
+    result = LoadResult()
+    maps = LookupMaps()
+    constraint, nulls_not_distinct = unique_constraint_name()
+    partition_key = get_partition_key()
+
+    def resolved_rows():
+        for ordinal, row in enumerate(rows):
+            result.rows += 1
+            try:
+                resolved = maps.resolve(row)
+            except RejectedRow as e:
+                result.rejects[str(e)] += 1
+                if on_reject is not None:
+                    on_reject(row, str(e))
+                continue
+            result.indicator_ids.add(resolved[3])
+            result.years.add(resolved[2].year)
+            yield (ordinal, *resolved)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in batched(resolved_rows(), chunk_size):
+            if partition_key == "end_date":
+                # Values past the last yearly partition have nowhere to go
+                ensure_partitions(partition_key, first_year=min(result.years), last_year=max(result.years))
+            # Bound the chunks held in memory while workers catch up
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                result.merged += sum(future.result() for future in done)
+            pending.add(executor.submit(merge_chunk, chunk, constraint, nulls_not_distinct))
+        result.merged += sum(future.result() for future in pending)
+
+    if refresh and result.indicator_ids:
+        indicator_ids = sorted(result.indicator_ids)
+        ResolvedIndicatorValue.refresh(indicator_ids=indicator_ids)
+        IndicatorLatestVintage.refresh(indicator_ids=indicator_ids)
+        bump_data_version()
+
+    result.seconds = time.perf_counter() - started
+    return result
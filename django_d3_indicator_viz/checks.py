@@ -0,0 +1,43 @@
+"""
+System checks of the database schema the package relies on. They are tagged
+database, so they run with migrate and check --database.
+"""
+from django.core.checks import Tags, Warning, register
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+
+from .bulk_load import KEY_CONSTRAINT, unique_constraint_name
+
+
+# The migration creating KEY_CONSTRAINT
+KEY_MIGRATION = ("django_d3_indicator_viz", "0014_indicatorvalue_key_nulls_not_distinct")
+
+@register(Tags.database)
+def check_key_constraint(app_configs, databases=None, **kwargs):
+    """
+    Warns when migration 0014 couldn't create the value key's NULLS NOT
+    DISTINCT constraint on PostgreSQL 15+, so the schema lacks a constraint
+    the model state declares.
+    """
+    warnings = []
+    for alias in databases or []:
+        connection = connections[alias]
+        if connection.vendor != "postgresql" or connection.pg_version < 150000:
+            continue
+        if KEY_MIGRATION not in MigrationRecorder(connection).applied_migrations():
+            continue
+        _, nulls_not_distinct = unique_constraint_name(connection)
+        if not nulls_not_distinct:
+            warnings.append(
+                Warning(
+                    f"indicator_value has no {KEY_CONSTRAINT} constraint, so bulk loads merge "
+                    f"values without a source or filter option one chunk at a time.",
+                    hint=(
+                        "Remove the duplicate values without a source or filter option, then run "
+                        "migrate django_d3_indicator_viz 0013 and migrate again to create it."
+                    ),
+                    obj=alias,
+                    id="django_d3_indicator_viz.W001",
+                )
+            )
+    return warnings
@@ -0,0 +1,80 @@
+"""
+HTTP conditional GET for the profile and section views.
+
+ETags are derived from the profile cache's data and structure versions plus
+the request's path and query string, which hold the location and parent ids.
+Computing one only reads the versions from the cache, so a request carrying a
+matching If-None-Match is answered with 304 Not Modified before any profile
+query runs. Last-Modified is when a version was last bumped. Change the ETAG_SALT
+setting on deploys that change the profile templates, so browsers don't keep
+the old pages.
+
+Versions are only tracked with the profile cache on, and must be shared by
+every process, so conditional responses require D3_INDICATOR_VIZ_PROFILE_CACHE
+to name a shared cache such as Redis or memcached. Without it the views
+answer as before.
+"""
+import hashlib
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from .conf import get_setting
+from .profile_cache import data_version, last_modified, structure_version
+
+
+# Cache-Control directives per view, overridden by the CACHE_CONTROL setting.
+# Revalidating on every request is cheap, since unchanged pages are a 304.
+DEFAULT_CACHE_CONTROL = {
+    "profile": {"public": True, "max_age": 0, "must_revalidate": True},
+    "get_section": {"public": True, "max_age": 0, "must_revalidate": True},
+}
+
+
+def cache_control_for(view_name):
+    return get_setting("CACHE_CONTROL", {}).get(view_name, DEFAULT_CACHE_CONTROL.get(view_name, {}))
+
+
+def profile_etag(request, *args, **kwargs):
+    """
+    A strong ETag for a profile or section request, or None when versions
+    aren't tracked.
+    """
+    version = data_version()
+    if version is None:
+        return None
+    digest = hashlib.sha256(
+        f"{get_setting('ETAG_SALT', '')}:{version}:{structure_version()}:{request.get_full_path()}".encode()
+    ).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def profile_last_modified(request, *args, **kwargs):
+    return last_modified()
+
+
+def conditional_view(view_name):
+    """
+    Decorates a profile view with ETag and Last-Modified validation and its
+    configured Cache-Control header.
+    """
+    def decorator(view):
+        conditional = condition(etag_func=profile_etag, last_modified_func=profile_last_modified)(view)
+
+        def patch(response):
+            if response.status_code in (200, 304):
+                patch_cache_control(response, **cache_control_for(view_name))
+            return response
+
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                return patch(await conditional(request, *args, **kwargs))
+        else:
+            @wraps(view)
+            def wrapper(request, *args, **kwargs):
+                return patch(conditional(request, *args, **kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,27 @@
+"""
+Package settings, read from the project's Django settings with defaults.
+
+Every setting is prefixed with D3_INDICATOR_VIZ_, for example
+D3_INDICATOR_VIZ_GEOMETRY_TIER_TOLERANCES. They are read on each call so
+override_settings works in tests.
+"""
+from django.conf import settings
+
+
+def get_setting(name, default=None):
+    return getattr(settings, f"D3_INDICATOR_VIZ_{name}", default)
+
+
+def geometry_tier_tolerances():
+    """
+    Simplification tolerance per geometry tier, in geometry units (degrees
+    for the default SRID 4326).
+    """
+    return get_setting(
+        "GEOMETRY_TIER_TOLERANCES",
+        {
+            "overview": 0.001,
+            "city": 0.0003,
+            "neighborhood": 0.0001,
+        },
+    )
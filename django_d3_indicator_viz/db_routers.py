@@ -0,0 +1,150 @@
+"""
+Database router sending profile reads to a read replica.
+
+Profile pages and the API only read, so they can be served from a replica
+while the admin and imports keep writing to the primary. Reads go to the
+replica only inside use_read_replica() (or a view decorated with
+read_replica) and only when the D3_INDICATOR_VIZ_READ_REPLICA setting names
+a database alias; everything else keeps Django's default routing.
+
+Replicas lag behind the primary, so ReadYourWritesMiddleware pins a client's
+reads to the primary for a few seconds after it changes something, and any
+write inside a replica block pins the rest of that block to the primary.
+
+    DATABASE_ROUTERS = ["django_d3_indicator_viz.db_routers.ReadReplicaRouter"]
+    D3_INDICATOR_VIZ_READ_REPLICA = "replica"
+"""
+import contextvars
+from contextlib import contextmanager
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from .conf import get_setting
+
+
+APP_LABEL = "django_d3_indicator_viz"
+
+# The cookie that pins a client's reads to the primary after a write
+PIN_PRIMARY_COOKIE = "d3iv_pin_primary"
+
+# The alias reads are routed to, when inside a replica block
+_read_alias = contextvars.ContextVar("d3iv_read_alias", default=None)
+
+# Whether reads are pinned to the primary, after a write
+_pinned_to_primary = contextvars.ContextVar("d3iv_pinned_to_primary", default=False)
+
+
+def replica_alias():
+    return get_setting("READ_REPLICA")
+
+
+@contextmanager
+def use_read_replica():
+    """
+    Routes this app's reads inside the block to the read replica.
+    """
+    token = _read_alias.set(replica_alias())
+    # Writes inside the block pin reads to the primary until it ends
+    pinned_token = _pinned_to_primary.set(_pinned_to_primary.get())
+    try:
+        yield
+    finally:
+        _pinned_to_primary.reset(pinned_token)
+        _read_alias.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """
+    Pins this app's reads inside the block to the primary, even inside a
+    replica block.
+    """
+    token = _pinned_to_primary.set(True)
+    try:
+        yield
+    finally:
+        _pinned_to_primary.reset(token)
+
+
+def read_replica(view):
+    """
+    Decorates a view so its reads go to the read replica.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            with use_read_replica():
+                return await view(*args, **kwargs)
+    else:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            with use_read_replica():
+                return view(*args, **kwargs)
+    return wrapper
+
+
+class ReadReplicaMixin:
+    """
+    Class-based view mixin routing the view's reads to the read replica.
+    """
+
+    def dispatch(self, *args, **kwargs):
+        with use_read_replica():
+            return super().dispatch(*args, **kwargs)
+
+
+class ReadReplicaRouter:
+    """
+    Routes this app's reads to the read replica inside replica blocks, and
+    everything else to the default database.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label != APP_LABEL or _pinned_to_primary.get():
+            return None
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label == APP_LABEL and _read_alias.get() is not None:
+            # Read the write back from the primary for the rest of the block
+            _pinned_to_primary.set(True)
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        if obj1._meta.app_label == APP_LABEL and obj2._meta.app_label == APP_LABEL:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == replica_alias():
+            return False
+        return None
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pins a client's reads to the primary for D3_INDICATOR_VIZ_READ_YOUR_WRITES_SECONDS
+    (5) after a successful unsafe request, such as an admin save, so they
+    don't read from a replica that hasn't caught up yet.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _pinned_to_primary.set(PIN_PRIMARY_COOKIE in request.COOKIES)
+        try:
+            response = self.get_response(request)
+        finally:
+            _pinned_to_primary.reset(token)
+
+        if request.method not in ("GET", "HEAD", "OPTIONS", "TRACE") and response.status_code < 400:
+            response.set_cookie(
+                PIN_PRIMARY_COOKIE,
+                "1",
+                max_age=get_setting("READ_YOUR_WRITES_SECONDS", 5),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
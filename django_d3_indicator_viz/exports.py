@@ -0,0 +1,121 @@
+"""
+Columnar bulk export of indicator values as Parquet or Arrow IPC streams.
+
+Rows are read with a server-side cursor and written one record batch per
+chunk, so memory stays flat however large the slice. Location, indicator and
+source ids are dictionary-encoded.
+
+Requires pyarrow: pip install django-d3-indicator-viz[export]
+"""
+from itertools import batched
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pa = None
+
+from .models import IndicatorValue
+
+
+EXPORT_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+# The exported columns, in order
+EXPORT_COLUMNS = (
+    "location_id",
+    "indicator_id",
+    "source_id",
+    "filter_option_id",
+    "start_date",
+    "end_date",
+    "value",
+    "value_moe",
+    "count",
+    "count_moe",
+    "universe",
+    "universe_moe",
+)
+
+DICTIONARY_COLUMNS = ("location_id", "indicator_id", "source_id")
+
+
+def export_schema():
+    return pa.schema([
+        ("location_id", pa.dictionary(pa.int32(), pa.string())),
+        ("indicator_id", pa.dictionary(pa.int32(), pa.int64())),
+        ("source_id", pa.dictionary(pa.int32(), pa.int64())),
+        ("filter_option_id", pa.int64()),
+        ("start_date", pa.date32()),
+        ("end_date", pa.date32()),
+        ("value", pa.float64()),
+        ("value_moe", pa.float64()),
+        ("count", pa.float64()),
+        ("count_moe", pa.float64()),
+        ("universe", pa.float64()),
+        ("universe_moe", pa.float64()),
+    ])
+
+
+def export_queryset(section_ids=None, location_type_ids=None, source_ids=None):
+    """
+    The indicator values of a slice, filtered by any of section, location
+    type and source.
+    """
+    queryset = IndicatorValue.objects.all()
+    if section_ids:
+        queryset = queryset.filter(section_id__in=section_ids)
+    if location_type_ids:
+        queryset = queryset.filter(location__location_type_id__in=location_type_ids)
+    if source_ids:
+        queryset = queryset.filter(source_id__in=source_ids)
+    return queryset.order_by().values_list(*EXPORT_COLUMNS)
+
+
+def iter_record_batches(queryset, chunk_size=100_000):
+    """
+    Yields one record batch per chunk of rows, read with a server-side
+    cursor.
+    """
+    schema = export_schema()
+    for chunk in batched(queryset.iterator(chunk_size=chunk_size), chunk_size):
+        arrays = []
+        for name, column in zip(EXPORT_COLUMNS, zip(*chunk)):
+            field = schema.field(name)
+            if name in DICTIONARY_COLUMNS:
+                arrays.append(
+                    pa.array(column, type=field.type.value_type).dictionary_encode()
+                )
+            else:
+                arrays.append(pa.array(column, type=field.type))
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def export_indicator_values(sink, format="parquet", chunk_size=100_000, **filters):
+    """
+    Writes a slice of indicator values to a path or binary file-like sink.
+    filters are the export_queryset filters. Returns the number of rows
+    written.
+    """
+    if pa is None:
+        raise ImportError("Columnar exports require pyarrow: pip install django-d3-indicator-viz[export]")
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}, not {format!r}.")
+
+    schema = export_schema()
+    if format == "parquet":
+        writer = pa.parquet.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        # The stream format, unlike the file format, allows each batch its own
+        # dictionaries
+        writer = pa.ipc.new_stream(sink, schema)
+
+    rows = 0
+    with writer:
+        for batch in iter_record_batches(export_queryset(**filters), chunk_size):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
@@ -0,0 +1,73 @@
+"""
+GeoJSON built by PostGIS instead of django.core.serializers.
+
+The "geojson" serializer loads every geometry into a GEOS object and encodes
+it again in Python. Here each Feature is rendered by the database with
+ST_AsGeoJSON and only the FeatureCollection around them is written in Python,
+so no geometry is ever parsed. The output matches the serializer: the
+primary key as the Feature id, the selected fields as properties (foreign
+keys as their raw id), coordinates in EPSG:4326 and no crs member.
+"""
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+
+from .conf import get_setting
+
+
+FEATURE_COLLECTION_START = '{"type": "FeatureCollection", "features": ['
+FEATURE_COLLECTION_END = "]}"
+
+
+def iter_geojson(queryset, geometry_field="geometry", fields=(), precision=None):
+    """
+    Yields the GeoJSON FeatureCollection of a queryset in chunks, one Feature
+    per row in the queryset's order. fields are model field names, as for
+    serialize("geojson", ...). precision is the number of decimal digits of
+    the coordinates and defaults to the GEOJSON_PRECISION setting.
+    """
+    if precision is None:
+        precision = get_setting("GEOJSON_PRECISION", 6)
+
+    opts = queryset.model._meta
+    properties = [
+        opts.get_field(name) for name in fields if not opts.get_field(name).primary_key
+    ]
+
+    # Name the columns of the inner query positionally, since joins can make
+    # Django's own column names ambiguous
+    inner = queryset.values_list(
+        opts.pk.attname, *(field.attname for field in properties), geometry_field
+    )
+    try:
+        inner_sql, inner_params = inner.query.sql_with_params()
+    except EmptyResultSet:
+        yield FEATURE_COLLECTION_START + FEATURE_COLLECTION_END
+        return
+    columns = ["pk", *(f"p{i}" for i in range(len(properties))), "geom"]
+
+    sql = f"""
+        select json_build_object(
+            'type', 'Feature',
+            'id', t.pk,
+            'properties', json_build_object({", ".join(f"%s, t.p{i}" for i in range(len(properties)))}),
+            'geometry', st_asgeojson(st_transform(t.geom, 4326), %s)::json
+        )::text
+        from ({inner_sql}) t({", ".join(columns)})
+    """
+    params = [*(field.name for field in properties), precision, *inner_params]
+
+    yield FEATURE_COLLECTION_START
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(sql, params)
+        separator = ""
+        while rows := cursor.fetchmany(1000):
+            yield separator + ", ".join(row[0] for row in rows)
+            separator = ", "
+    yield FEATURE_COLLECTION_END
+
+
+def to_geojson(queryset, geometry_field="geometry", fields=(), precision=None):
+    """
+    The GeoJSON FeatureCollection of a queryset as a string. See iter_geojson.
+    """
+    return "".join(iter_geojson(queryset, geometry_field, fields, precision))
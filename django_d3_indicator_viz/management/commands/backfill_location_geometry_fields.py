@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from django_d3_indicator_viz.models import CustomLocation, Location
+
+
+# Mirrors DerivedGeometryFields.set_derived_geometry_fields()
+BACKFILL_SQL = """
+    update {table}
+    set area = st_area(geometry),
+        point_on_surface = st_pointonsurface(geometry),
+        bbox = st_makeenvelope(
+            st_xmin(geometry), st_ymin(geometry), st_xmax(geometry), st_ymax(geometry), st_srid(geometry)
+        )
+    where geometry is not null and not st_isempty(geometry)
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfills the stored area, point on surface and bounding box of "
+        "locations and custom locations from their geometries. Run after "
+        "loading geometries with raw SQL or queryset.update()."
+    )
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            for model in (Location, CustomLocation):
+                cursor.execute(BACKFILL_SQL.format(table=model._meta.db_table))
+                self.stdout.write(f"{model._meta.verbose_name_plural}: {cursor.rowcount} rows backfilled.")
+
+        self.stdout.write(self.style.SUCCESS("Done."))
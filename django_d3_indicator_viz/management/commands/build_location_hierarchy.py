@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from django_d3_indicator_viz.models import LocationAncestor
+from django_d3_indicator_viz.profile_cache import bump_data_version
+
+
+class Command(BaseCommand):
+    help = (
+        "Builds the location containment closure table used for parent lookups. "
+        "Run after loading or replacing location geometries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--location",
+            action="append",
+            dest="location_ids",
+            help="Only rebuild the ancestors of the given location id. May be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        LocationAncestor.rebuild(location_ids=options["location_ids"])
+        bump_data_version()
+        self.stdout.write(
+            self.style.SUCCESS(f"Location ancestors: {LocationAncestor.objects.count()} rows.")
+        )
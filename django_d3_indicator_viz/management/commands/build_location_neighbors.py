@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from django_d3_indicator_viz.models import Location, LocationNeighbor
+from django_d3_indicator_viz.profile_cache import bump_data_version
+
+
+class Command(BaseCommand):
+    help = (
+        "Builds the sibling adjacency table used for sibling maps. "
+        "Run after loading or replacing location geometries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--location-type",
+            type=int,
+            action="append",
+            dest="location_type_ids",
+            help="Only rebuild locations of the given location type id. May be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        location_ids = None
+        if options["location_type_ids"]:
+            location_ids = Location.objects.filter(
+                location_type_id__in=options["location_type_ids"]
+            ).values_list("id", flat=True)
+
+        LocationNeighbor.rebuild(location_ids=location_ids)
+        bump_data_version()
+        self.stdout.write(
+            self.style.SUCCESS(f"Location neighbors: {LocationNeighbor.objects.count()} rows.")
+        )
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from django_d3_indicator_viz.exports import EXPORT_FORMATS, export_indicator_values
+
+
+class Command(BaseCommand):
+    help = (
+        "Exports indicator values as a Parquet file or Arrow IPC stream, "
+        "optionally limited to sections, location types or sources. "
+        "Requires pyarrow."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="The file to write.")
+        parser.add_argument(
+            "--format",
+            choices=list(EXPORT_FORMATS),
+            default="parquet",
+            help="The file format. Defaults to parquet.",
+        )
+        parser.add_argument(
+            "--section",
+            type=int,
+            action="append",
+            dest="section_ids",
+            help="Only export values of the given section id. May be repeated.",
+        )
+        parser.add_argument(
+            "--location-type",
+            type=int,
+            action="append",
+            dest="location_type_ids",
+            help="Only export values of locations of the given location type id. May be repeated.",
+        )
+        parser.add_argument(
+            "--source",
+            type=int,
+            action="append",
+            dest="source_ids",
+            help="Only export values of the given source id. May be repeated.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100_000,
+            help="Number of rows to read and write at a time.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            rows = export_indicator_values(
+                options["path"],
+                options["format"],
+                chunk_size=options["chunk_size"],
+                section_ids=options["section_ids"],
+                location_type_ids=options["location_type_ids"],
+                source_ids=options["source_ids"],
+            )
+        except ImportError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(f"Exported {rows} indicator values to {options['path']}."))
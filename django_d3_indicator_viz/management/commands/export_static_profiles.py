@@ -0,0 +1,115 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import batched
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils.module_loading import import_string
+
+from django_d3_indicator_viz.models import CustomLocation, Location
+from django_d3_indicator_viz.static_export import export_batch, init_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders every profile and its sections to static HTML files, with the "
+        "section URLs rewritten to the files. Already exported locations are "
+        "skipped, so an interrupted export resumes where it stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="The directory to write profiles to.")
+        parser.add_argument(
+            "--location",
+            action="append",
+            dest="location_ids",
+            help="Only export the location with the given id. May be repeated.",
+        )
+        parser.add_argument(
+            "--location-type",
+            type=int,
+            action="append",
+            dest="location_type_ids",
+            help="Only export locations of the given location type id. May be repeated.",
+        )
+        parser.add_argument(
+            "--template",
+            default="django_d3_indicators_viz/profile.html",
+            help="The profile template, as passed to the profile view.",
+        )
+        parser.add_argument(
+            "--base-url",
+            help=(
+                "The URL the directory is served from, such as /static-profiles/. "
+                "Section URLs are relative to each profile page when not given."
+            ),
+        )
+        parser.add_argument(
+            "--aggregator",
+            help=(
+                "Dotted path of the IndicatorValueAggregator for custom locations. "
+                "Custom locations are only exported when given, with --custom-template."
+            ),
+        )
+        parser.add_argument(
+            "--custom-template",
+            help="The template custom location profiles are rendered with build_profile_context's context.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of worker processes, each with its own database connection.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Number of locations sent to a worker at a time.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Export locations that were already exported again.",
+        )
+
+    def handle(self, *args, **options):
+        if bool(options["aggregator"]) != bool(options["custom_template"]):
+            raise CommandError("--aggregator and --custom-template must be given together.")
+        aggregator = import_string(options["aggregator"]) if options["aggregator"] else None
+
+        locations = Location.objects.order_by("id")
+        if options["location_ids"]:
+            locations = locations.filter(id__in=options["location_ids"])
+        if options["location_type_ids"]:
+            locations = locations.filter(location_type_id__in=options["location_type_ids"])
+        items = [("location", location_id) for location_id in locations.values_list("id", flat=True)]
+        if aggregator is not None:
+            items += [("custom", slug) for slug in CustomLocation.objects.values_list("slug", flat=True)]
+
+        worker_options = {
+            "template": options["template"],
+            "base_url": options["base_url"],
+            "force": options["force"],
+            "aggregator": aggregator,
+            "custom_template": options["custom_template"],
+        }
+
+        # Forked workers must not share this process's connection
+        connections.close_all()
+
+        written = done = 0
+        with ProcessPoolExecutor(max_workers=options["workers"], initializer=init_worker) as executor:
+            futures = {
+                executor.submit(export_batch, options["path"], batch, worker_options): len(batch)
+                for batch in batched(items, options["batch_size"])
+            }
+            for future in as_completed(futures):
+                written += future.result()
+                done += futures[future]
+                self.stdout.write(f"Exported {done} of {len(items)} profiles.")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done. Wrote {written} profiles, skipped {len(items) - written} already exported."
+            )
+        )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from django_d3_indicator_viz.tiles import invalidate_tiles
+
+
+class Command(BaseCommand):
+    help = (
+        "Invalidates the cached location vector tiles. Run after changing "
+        "locations with raw SQL or queryset.update()."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--location-type",
+            type=int,
+            action="append",
+            dest="location_type_ids",
+            help="Only invalidate tiles of the given location type id. May be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        invalidate_tiles(options["location_type_ids"])
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,82 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_d3_indicator_viz.bulk_load import load_indicator_values, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Loads indicator values from a CSV or Parquet file with COPY, inserting "
+        "new values and updating existing ones. The file has the admin import "
+        "columns: indicator, location, source, filter_option, start_date, "
+        "end_date and the value columns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="The file to load.")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "parquet"],
+            help="The file format. Defaults to the file extension, or csv.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=50_000,
+            help="Number of rows copied and merged per transaction.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of chunks merged at the same time, each on its own database connection.",
+        )
+        parser.add_argument(
+            "--rejects",
+            help="Write rejected rows, with the reason, to this CSV file.",
+        )
+        parser.add_argument(
+            "--no-refresh",
+            action="store_false",
+            dest="refresh",
+            help=(
+                "Don't refresh the derived tables after loading, when more files "
+                "follow. Run the rebuild commands after the last one."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        rejects_file = writer = None
+        if options["rejects"]:
+            rejects_file = open(options["rejects"], "w", newline="", encoding="utf-8")
+
+        def on_reject(row, reason):
+            nonlocal writer
+            if writer is None:
+                writer = csv.DictWriter(rejects_file, [*row, "reason"], extrasaction="ignore")
+                writer.writeheader()
+            writer.writerow({**row, "reason": reason})
+
+        try:
+            result = load_indicator_values(
+                read_rows(options["path"], options["format"]),
+                chunk_size=options["chunk_size"],
+                workers=options["workers"],
+                on_reject=on_reject if rejects_file else None,
+                refresh=options["refresh"],
+            )
+        except ImportError as e:
+            raise CommandError(str(e))
+        finally:
+            if rejects_file:
+                rejects_file.close()
+
+        for reason, count in result.rejects.most_common():
+            self.stdout.write(self.style.WARNING(f"Rejected {count} rows: {reason}."))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Loaded {result.merged} of {result.rows} rows in {result.seconds:.1f}s "
+                f"({result.rows_per_second:,.0f} rows/s), rejected {sum(result.rejects.values())}."
+            )
+        )
@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from django_d3_indicator_viz.models import IndicatorLatestVintage, ResolvedIndicatorValue
+from django_d3_indicator_viz.partitioning import (
+    PARTITION_KEYS,
+    detach_years_before,
+    ensure_partitions,
+    get_partition_key,
+    partition_key_setting,
+    partition_table,
+)
+from django_d3_indicator_viz.profile_cache import bump_data_version
+
+
+class Command(BaseCommand):
+    help = (
+        "Partitions the indicator value table, creates missing partitions "
+        "and detaches old vintages. Run ahead of loading a new vintage when "
+        "partitioned by end date."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--key",
+            choices=list(PARTITION_KEYS),
+            help=(
+                "Partition key to convert an unpartitioned table to. Defaults to "
+                "D3_INDICATOR_VIZ_INDICATOR_VALUE_PARTITIONING."
+            ),
+        )
+        parser.add_argument(
+            "--detach-before",
+            type=int,
+            metavar="YEAR",
+            help="Detach the yearly partitions of vintages ending before YEAR.",
+        )
+
+    def handle(self, *args, **options):
+        current_key = get_partition_key()
+        key = options["key"] or partition_key_setting()
+
+        if current_key is None:
+            if key is None:
+                raise CommandError(
+                    "indicator_value is not partitioned. Pass --key or set "
+                    "D3_INDICATOR_VIZ_INDICATOR_VALUE_PARTITIONING."
+                )
+            self.stdout.write(f"Partitioning indicator_value by {key}...")
+            partition_table(key)
+            current_key = key
+        elif key is not None and key != current_key:
+            raise CommandError(
+                f"indicator_value is already partitioned by {current_key}, not {key}."
+            )
+
+        for name in ensure_partitions(current_key):
+            self.stdout.write(f"Created {name}.")
+
+        if options["detach_before"] is not None:
+            if current_key != "end_date":
+                raise CommandError("Only end_date partitions can be detached by year.")
+            detached = detach_years_before(options["detach_before"], connection)
+            for name in detached:
+                self.stdout.write(f"Detached {name}.")
+            if detached:
+                # Detached values may have been resolved winners or latest vintages
+                ResolvedIndicatorValue.refresh()
+                IndicatorLatestVintage.refresh()
+                bump_data_version()
+
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from django_d3_indicator_viz.profile_cache import reset_section_cache_stats, section_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Reports the hits and misses of the section fragment cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after reporting them.",
+        )
+
+    def handle(self, *args, **options):
+        stats = section_cache_stats()
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / lookups if lookups else 0
+        self.stdout.write(f"Section hits: {stats['hits']}, misses: {stats['misses']} ({hit_rate:.1%} hit rate).")
+
+        if options["reset"]:
+            reset_section_cache_stats()
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from django_d3_indicator_viz.models import IndicatorLatestVintage
+from django_d3_indicator_viz.profile_cache import bump_data_version
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the latest vintage table that backs profile reads. "
+        "Run after bulk loads that bypass model signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--indicator",
+            type=int,
+            action="append",
+            dest="indicator_ids",
+            help="Only rebuild the given indicator id. May be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        IndicatorLatestVintage.refresh(indicator_ids=options["indicator_ids"])
+        bump_data_version()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indicator latest vintages: {IndicatorLatestVintage.objects.count()} rows."
+            )
+        )
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from django_d3_indicator_viz.models import ResolvedIndicatorValue
+from django_d3_indicator_viz.profile_cache import bump_data_version
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the resolved indicator value table that backs section reads. "
+        "Run after bulk loads that bypass model signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--indicator",
+            type=int,
+            action="append",
+            dest="indicator_ids",
+            help="Only rebuild the given indicator id. May be repeated.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of rows to insert per batch.",
+        )
+
+    def handle(self, *args, **options):
+        ResolvedIndicatorValue.refresh(
+            indicator_ids=options["indicator_ids"],
+            batch_size=options["batch_size"],
+        )
+        bump_data_version()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Resolved indicator values: {ResolvedIndicatorValue.objects.count()} rows."
+            )
+        )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from django_d3_indicator_viz.models import IndicatorValue
+from django_d3_indicator_viz.profile_cache import bump_data_version
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-stamps the denormalized category and section columns on indicator "
+        "values. Run after bulk loads or bulk indicator/category moves that "
+        "bypass model signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--indicator",
+            type=int,
+            action="append",
+            dest="indicator_ids",
+            help="Only re-stamp values of the given indicator id. May be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        updated = IndicatorValue.restamp(indicator_ids=options["indicator_ids"])
+        bump_data_version()
+        self.stdout.write(self.style.SUCCESS(f"Re-stamped {updated} indicator values."))
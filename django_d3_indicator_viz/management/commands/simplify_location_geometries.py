@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from django_d3_indicator_viz.conf import geometry_tier_tolerances
+from django_d3_indicator_viz.models import Location
+from django_d3_indicator_viz.tiles import invalidate_tiles
+from django_d3_indicator_viz.profile_cache import bump_data_version
+
+
+class Command(BaseCommand):
+    help = (
+        "Builds the simplified geometry tiers used for profile maps. "
+        "Run after loading geometries with raw SQL or queryset.update(), "
+        "or after changing D3_INDICATOR_VIZ_GEOMETRY_TIER_TOLERANCES."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--location",
+            action="append",
+            dest="location_ids",
+            help="Only simplify the location with the given id. May be repeated.",
+        )
+        parser.add_argument(
+            "--coverage",
+            action="store_true",
+            help=(
+                "Simplify all locations of a type together with ST_CoverageSimplify "
+                "(PostGIS 3.4+) so neighboring locations keep shared edges."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        Location.simplify_geometries(
+            location_ids=options["location_ids"], coverage=options["coverage"]
+        )
+        # Tiles are built from the tiers
+        invalidate_tiles()
+        bump_data_version()
+        for tier, tolerance in geometry_tier_tolerances().items():
+            self.stdout.write(f"{tier}: tolerance {tolerance}")
+
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,104 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import batched
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils.module_loading import import_string
+
+from django_d3_indicator_viz.models import CustomLocation, Location, Section
+from django_d3_indicator_viz.profile_cache import bump_data_version, profile_cache
+from django_d3_indicator_viz.views import (
+    build_profile_context,
+    build_profile_page_context,
+    render_section,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Builds and caches the profile context and sections of every location, "
+        "so the first visitor after a data load doesn't wait for them. Requires "
+        "D3_INDICATOR_VIZ_PROFILE_CACHE."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--location-type",
+            type=int,
+            action="append",
+            dest="location_type_ids",
+            help="Only warm locations of the given location type id. May be repeated.",
+        )
+        parser.add_argument(
+            "--aggregator",
+            help=(
+                "Dotted path of the IndicatorValueAggregator passed to build_profile_context. "
+                "Custom locations are only warmed when given."
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of locations built at the same time.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Number of locations each worker builds per database connection.",
+        )
+        parser.add_argument(
+            "--invalidate",
+            action="store_true",
+            help="Invalidate the cached profiles first, instead of only filling the missing ones.",
+        )
+
+    def handle(self, *args, **options):
+        if profile_cache() is None:
+            raise CommandError("Set D3_INDICATOR_VIZ_PROFILE_CACHE to a cache alias to cache profiles.")
+        aggregator = import_string(options["aggregator"]) if options["aggregator"] else None
+
+        if options["invalidate"]:
+            bump_data_version()
+
+        locations = Location.objects.order_by("id")
+        if options["location_type_ids"]:
+            locations = locations.filter(location_type_id__in=options["location_type_ids"])
+        slugs = [("location", location_id) for location_id in locations.values_list("id", flat=True)]
+        if aggregator is not None and not options["location_type_ids"]:
+            slugs += [("custom", slug) for slug in CustomLocation.objects.values_list("slug", flat=True)]
+
+        # The first section is part of the profile page, the rest are loaded
+        # as the page scrolls
+        sections = list(Section.objects.order_by("sort_order")[1:])
+
+        warmed = 0
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            futures = [
+                executor.submit(self.warm, batch, aggregator, sections)
+                for batch in batched(slugs, options["batch_size"])
+            ]
+            for future in as_completed(futures):
+                warmed += future.result()
+                self.stdout.write(f"Warmed {warmed} of {len(slugs)} profiles.")
+
+        self.stdout.write(self.style.SUCCESS("Done."))
+
+    def warm(self, batch, aggregator, sections):
+        """
+        Builds the profiles of a batch of locations in a worker thread.
+        """
+        try:
+            for kind, slug in batch:
+                # build_profile_context resolves slugs and keys entries the same
+                # way for both kinds of location
+                build_profile_context(None, slug, aggregator)
+                if kind == "location":
+                    context = build_profile_page_context(slug)
+                    for section in sections:
+                        render_section(None, section, slug, context["parent_loc_ids"])
+            return len(batch)
+        finally:
+            # Each thread has its own connections
+            connections.close_all()
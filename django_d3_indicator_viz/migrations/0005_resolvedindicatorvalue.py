@@ -0,0 +1,96 @@
+# Generated by Django 5.2.8 on 2026-10-17 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Initial fill of the derived table. Mirrors ResolvedIndicatorValue.refresh().
+POPULATE_RESOLVED_INDICATOR_VALUE = """
+    insert into resolved_indicator_value (indicator_value_id, indicator_id, location_id, filter_option_id)
+    select distinct id, indicator_id, location_id, filter_option_id
+    from (
+        select iv.id, iv.indicator_id, iv.location_id, iv.filter_option_id, idv.data_visual_type,
+            row_number() over (
+                partition by iv.indicator_id, iv.location_id, iv.filter_option_id
+                order by (
+                    select idvs.priority
+                    from indicator_data_visual_source idvs
+                    where idvs.data_visual_id = idv.id and idvs.source_id = iv.source_id
+                    limit 1
+                ) asc nulls last, iv.start_date desc
+            ) as rn
+        from indicator_value iv
+            left join indicator_data_visual idv on idv.indicator_id = iv.indicator_id
+    ) ranked
+    where rn = 1 or data_visual_type in ('line', 'multiline')
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_d3_indicator_viz", "0004_remove_indicatordatavisual_source_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResolvedIndicatorValue",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "filter_option",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="django_d3_indicator_viz.indicatorfilteroption",
+                    ),
+                ),
+                (
+                    "indicator",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="django_d3_indicator_viz.indicator",
+                    ),
+                ),
+                (
+                    "indicator_value",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="django_d3_indicator_viz.indicatorvalue",
+                    ),
+                ),
+                (
+                    "location",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="django_d3_indicator_viz.location",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "resolved_indicator_value",
+                "indexes": [
+                    models.Index(
+                        fields=["location", "indicator"],
+                        name="resolved_iv_loc_ind_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            POPULATE_RESOLVED_INDICATOR_VALUE, reverse_sql=migrations.RunSQL.noop
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-17 10:03
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # indicator_value is the largest table; build the indexes without
+    # locking out writes.
+    atomic = False
+
+    dependencies = [
+        ("django_d3_indicator_viz", "0005_resolvedindicatorvalue"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="indicatorvalue",
+            index=models.Index(
+                fields=["location", "indicator", "end_date"],
+                include=("source", "filter_option", "start_date", "value"),
+                name="iv_loc_ind_end_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="indicatorvalue",
+            index=models.Index(
+                fields=["indicator", "source", "end_date"],
+                name="iv_ind_src_end_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.8 on 2026-10-17 11:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Mirrors IndicatorValue.restamp() for existing rows
+STAMP_INDICATOR_VALUES = """
+    update indicator_value iv
+    set category_id = i.category_id, section_id = c.section_id
+    from indicator i
+        left join category c on i.category_id = c.id
+    where iv.indicator_id = i.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_d3_indicator_viz", "0006_indicatorvalue_covering_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="indicatorvalue",
+            name="category",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                db_index=False,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="django_d3_indicator_viz.category",
+            ),
+        ),
+        migrations.AddField(
+            model_name="indicatorvalue",
+            name="section",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                db_index=False,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="django_d3_indicator_viz.section",
+            ),
+        ),
+        migrations.RunSQL(STAMP_INDICATOR_VALUES, reverse_sql=migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="indicatorvalue",
+            index=models.Index(
+                fields=["section", "location"], name="iv_section_loc_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="indicatorvalue",
+            index=models.Index(
+                fields=["category", "location"], name="iv_category_loc_idx"
+            ),
+        ),
+    ]
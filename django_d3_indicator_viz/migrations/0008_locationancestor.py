@@ -0,0 +1,56 @@
+# Generated by Django 5.2.8 on 2026-10-17 12:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_d3_indicator_viz", "0007_indicatorvalue_category_section"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LocationAncestor",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("depth", models.PositiveSmallIntegerField()),
+                ("area_rank", models.PositiveIntegerField()),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="descendant_links",
+                        to="django_d3_indicator_viz.location",
+                    ),
+                ),
+                (
+                    "child",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ancestor_links",
+                        to="django_d3_indicator_viz.location",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "location_ancestor",
+                "indexes": [
+                    models.Index(
+                        fields=["child", "depth", "area_rank"],
+                        name="location_ancestor_rank_idx",
+                    )
+                ],
+                "unique_together": {("child", "ancestor")},
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-17 13:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_d3_indicator_viz", "0008_locationancestor"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LocationNeighbor",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("distance", models.FloatField()),
+                ("adjacent", models.BooleanField(default=False)),
+                ("in_viewport", models.BooleanField(default=False)),
+                (
+                    "location",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="neighbor_links",
+                        to="django_d3_indicator_viz.location",
+                    ),
+                ),
+                (
+                    "neighbor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="neighbor_of_links",
+                        to="django_d3_indicator_viz.location",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "location_neighbor",
+                "unique_together": {("location", "neighbor")},
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.8 on 2026-10-17 15:07
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations, models
+
+
+# Mirrors the backfill_location_geometry_fields management command
+BACKFILL_SQL = """
+    update {table}
+    set area = st_area(geometry),
+        point_on_surface = st_pointonsurface(geometry),
+        bbox = st_makeenvelope(
+            st_xmin(geometry), st_ymin(geometry), st_xmax(geometry), st_ymax(geometry), st_srid(geometry)
+        )
+    where geometry is not null and not st_isempty(geometry)
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_d3_indicator_viz", "0009_locationneighbor"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="location",
+            name="area",
+            field=models.FloatField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="point_on_surface",
+            field=django.contrib.gis.db.models.fields.PointField(
+                blank=True, editable=False, null=True, srid=4326
+            ),
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="bbox",
+            field=django.contrib.gis.db.models.fields.PolygonField(
+                blank=True, editable=False, null=True, srid=4326
+            ),
+        ),
+        migrations.AddField(
+            model_name="customlocation",
+            name="area",
+            field=models.FloatField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="customlocation",
+            name="point_on_surface",
+            field=django.contrib.gis.db.models.fields.PointField(
+                blank=True, editable=False, null=True, srid=4326
+            ),
+        ),
+        migrations.AddField(
+            model_name="customlocation",
+            name="bbox",
+            field=django.contrib.gis.db.models.fields.PolygonField(
+                blank=True, editable=False, null=True, srid=4326
+            ),
+        ),
+        migrations.RunSQL(
+            BACKFILL_SQL.format(table="location"), reverse_sql=migrations.RunSQL.noop
+        ),
+        migrations.RunSQL(
+            BACKFILL_SQL.format(table="custom_location"), reverse_sql=migrations.RunSQL.noop
+        ),
+    ]
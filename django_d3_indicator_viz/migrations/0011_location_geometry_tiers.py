@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-17 16:21
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+# Mirrors Location.simplify_geometries() with the default tolerances
+SIMPLIFY_SQL = """
+    update location
+    set geometry_overview = st_multi(st_simplifypreservetopology(geometry, 0.001)),
+        geometry_city = st_multi(st_simplifypreservetopology(geometry, 0.0003)),
+        geometry_neighborhood = st_multi(st_simplifypreservetopology(geometry, 0.0001))
+    where geometry is not null
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_d3_indicator_viz", "0010_location_derived_geometry_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="location",
+            name="geometry_overview",
+            field=django.contrib.gis.db.models.fields.MultiPolygonField(
+                blank=True, editable=False, null=True, srid=4326
+            ),
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="geometry_city",
+            field=django.contrib.gis.db.models.fields.MultiPolygonField(
+                blank=True, editable=False, null=True, srid=4326
+            ),
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="geometry_neighborhood",
+            field=django.contrib.gis.db.models.fields.MultiPolygonField(
+                blank=True, editable=False, null=True, srid=4326
+            ),
+        ),
+        migrations.RunSQL(SIMPLIFY_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
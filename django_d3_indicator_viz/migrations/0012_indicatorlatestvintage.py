@@ -0,0 +1,62 @@
+# Generated by Django 5.2.8 on 2026-10-17 17:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Initial fill of the derived table. Mirrors IndicatorLatestVintage.refresh().
+POPULATE_INDICATOR_LATEST_VINTAGE = """
+    insert into indicator_latest_vintage (indicator_id, source_id, latest_end_date)
+    select indicator_id, source_id, max(end_date)
+    from indicator_value
+    where source_id is not null
+    group by indicator_id, source_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_d3_indicator_viz", "0011_location_geometry_tiers"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IndicatorLatestVintage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("latest_end_date", models.DateField()),
+                (
+                    "indicator",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="django_d3_indicator_viz.indicator",
+                    ),
+                ),
+                (
+                    "source",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="django_d3_indicator_viz.indicatorsource",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "indicator_latest_vintage",
+                "unique_together": {("indicator", "source")},
+            },
+        ),
+        migrations.RunSQL(
+            POPULATE_INDICATOR_LATEST_VINTAGE, reverse_sql=migrations.RunSQL.noop
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-17 17:48
+
+from django.db import migrations
+
+from django_d3_indicator_viz.partitioning import (
+    get_partition_key,
+    partition_key_setting,
+    partition_table,
+)
+
+
+def partition_indicator_value(apps, schema_editor):
+    """
+    Partitions indicator_value when the deployment opts in with the
+    D3_INDICATOR_VIZ_INDICATOR_VALUE_PARTITIONING setting. Deployments that
+    opt in later run the partition_indicator_values management command.
+    """
+    key = partition_key_setting()
+    connection = schema_editor.connection
+    if key is None or connection.vendor != "postgresql":
+        return
+    if get_partition_key(connection) is None:
+        partition_table(key, connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_d3_indicator_viz", "0012_indicatorlatestvintage"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_indicator_value, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:05
+
+import warnings
+
+from django.db import IntegrityError, migrations, models, transaction
+
+from django_d3_indicator_viz.partitioning import PARTITION_KEYS, get_partition_key
+
+
+KEY_CONSTRAINT = "indicator_value_key_uniq"
+
+KEY_COLUMNS = ["source_id", "start_date", "end_date", "indicator_id", "filter_option_id", "location_id"]
+
+
+def add_key_constraint(apps, schema_editor):
+    """
+    Adds the value key's unique constraint with NULLs not distinct, so
+    values without a source or filter option can be merged with ON CONFLICT.
+    Requires PostgreSQL 15. Partitioned tables need the partition key in it.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql" or connection.pg_version < 150000:
+        return
+
+    columns = list(KEY_COLUMNS)
+    key = get_partition_key(connection)
+    if key is not None and PARTITION_KEYS[key][1] not in columns:
+        columns.append(PARTITION_KEYS[key][1])
+
+    try:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(
+                f"alter table indicator_value add constraint {KEY_CONSTRAINT} "
+                f"unique nulls not distinct ({', '.join(columns)})"
+            )
+    except IntegrityError:
+        # Existing duplicates of a NULL key. The bulk loader falls back to
+        # merging those rows under a lock, and the django_d3_indicator_viz.W001
+        # check keeps reporting the missing constraint.
+        warnings.warn(
+            f"{KEY_CONSTRAINT} was not created: indicator_value holds duplicate values "
+            f"without a source or filter option.",
+            RuntimeWarning,
+        )
+
+
+def remove_key_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(f"alter table indicator_value drop constraint if exists {KEY_CONSTRAINT}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_d3_indicator_viz", "0013_partition_indicator_value"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name="indicatorvalue",
+                    constraint=models.UniqueConstraint(
+                        fields=("source", "start_date", "end_date", "indicator", "filter_option", "location"),
+                        name="indicator_value_key_uniq",
+                        nulls_distinct=False,
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(add_key_constraint, remove_key_constraint),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:20
+
+from django.db import migrations
+
+from django_d3_indicator_viz.models import LocationAncestor
+
+
+def backfill_location_ancestor(apps, schema_editor):
+    """
+    Initial fill of location_ancestor, which get_parents reads from.
+    Mirrors the build_location_hierarchy command. It runs here rather than in
+    0008, since the rebuild reads the derived geometry fields added in 0010.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    LocationAncestor.rebuild()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_d3_indicator_viz", "0014_indicatorvalue_key_nulls_not_distinct"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_location_ancestor, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:22
+
+from django.db import migrations
+
+from django_d3_indicator_viz.models import LocationNeighbor
+
+
+def backfill_location_neighbor(apps, schema_editor):
+    """
+    Initial fill of location_neighbor, which get_siblings reads from.
+    Mirrors the build_location_neighbors command. It runs here rather than in
+    0009, since the rebuild reads the bbox field added in 0010.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    LocationNeighbor.rebuild()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_d3_indicator_viz", "0015_backfill_location_ancestor"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_location_neighbor, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.8 on 2026-10-17 21:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Mirrors IndicatorValue.restamp() for values of uncategorized indicators,
+# which were stamped NULL before UNCATEGORIZED
+STAMP_UNCATEGORIZED = """
+    update indicator_value
+    set category_id = coalesce(category_id, 0), section_id = coalesce(section_id, 0)
+    where category_id is null or section_id is null
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_d3_indicator_viz", "0016_backfill_location_neighbor"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="indicatorvalue",
+            name="category",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                db_index=False,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="django_d3_indicator_viz.category",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="indicatorvalue",
+            name="section",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                db_index=False,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="django_d3_indicator_viz.section",
+            ),
+        ),
+        migrations.RunSQL(STAMP_UNCATEGORIZED, migrations.RunSQL.noop),
+    ]
@@ -1,10 +1,13 @@
 from django.contrib.gis.db import models
-from django.contrib.gis.geos import Polygon, GEOSGeometry
-from django.db.models import Window, Prefetch, F, Q, OuterRef, Value, Min, Max
-from django.db.models.functions import RowNumber
+from django.contrib.gis.geos import MultiPolygon, Polygon, GEOSGeometry
+from django.db import connection, transaction
+from django.db.models import Window, Prefetch, F, Q, OuterRef, Subquery, Value, Min, Max
+from django.db.models.functions import Coalesce, RowNumber
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.forms import ValidationError
 
+from .conf import geometry_tier_tolerances
+
 
 class Section(models.Model):
     """
@@ -40,36 +43,23 @@ class Section(models.Model):
         """
         The javascript works with a list of indicators, and it does all 
         the selecting for the appropriate indicators client-side.
-        """
-        priority_subquery = IndicatorDataVisualSource.objects.filter(
-            data_visual=OuterRef('indicator__indicatordatavisual'),
-            source=OuterRef('source')
-        ).values('priority')[:1]
 
+        Values are read from the ResolvedIndicatorValue table, which holds the
+        priority-winning value per indicator, location and filter option.
+        """
         qs = IndicatorValue.objects.filter(
+            section_id=self.id,
             location__in=locations,
-            indicator__category__section_id=self.id
-        ).annotate(
-            source_priority=priority_subquery,
-            rn=Window(
-                expression=RowNumber(),
-                partition_by=[F('indicator_id'), F('location_id'), F('filter_option_id')],
-                # FIXME(Mike): Ordering by date desc flips the order for the line chart so we may need
-                # to sort again after this somewhere -- for now we're handling it in the js.
-                order_by=[F('source_priority').asc(nulls_last=True), F('start_date').desc()]
-            ),
-            data_visual_type=F('indicator__indicatordatavisual__data_visual_type')
-        ).filter(
-            Q(rn=1) | Q(data_visual_type='line') | Q(data_visual_type='multiline')
-        ).select_related('filter_option', 'location', 'source', 'indicator')
+            resolvedindicatorvalue__isnull=False,
+        )
 
         return [
             {
                 "id": iv.id,
-                "indicator_id": iv.indicator.id,
-                "location_id": iv.location.id,
-                "source_id": iv.source.id,
-                "filter_option_id": iv.filter_option.id if iv.filter_option else None,
+                "indicator_id": iv.indicator_id,
+                "location_id": iv.location_id,
+                "source_id": iv.source_id,
+                "filter_option_id": iv.filter_option_id,
                 "start_date": iv.start_date.isoformat(),
                 "end_date": iv.end_date.isoformat(),
                 "value": iv.value,
@@ -81,6 +71,89 @@ class Section(models.Model):
             } for iv in qs
         ]
 
+    def get_visual_metadata(self, location):
+        """
+        Resolves the visual metadata for every indicator in the section in a
+        fixed number of queries, rather than calling
+        Indicator.get_visual_metadata once per indicator.
+
+        Returns a dict keyed by indicator id. Each value is the winning
+        IndicatorValue for the location, annotated the same way as
+        Indicator.get_visual_metadata (data_visual_type, columns,
+        location_comparison_type, color_scale_id). Indicators without a data
+        visual or without values for the location are left out.
+        """
+
+        # Tech debt in not combining these models -- take the first visual
+        # per indicator, which is what indicatordatavisual_set.first() did.
+        data_visuals = {}
+        for dv in (
+            IndicatorDataVisual.objects
+            .filter(indicator__category__section_id=self.id)
+            .order_by("indicator_id", "id")
+        ):
+            data_visuals.setdefault(dv.indicator_id, dv)
+
+        if not data_visuals:
+            return {}
+
+        priority_subquery = IndicatorDataVisualSource.objects.filter(
+            data_visual_id=OuterRef('data_visual_id'),
+            source=OuterRef('source')
+        ).values('priority')[:1]
+
+        data_visual_subquery = IndicatorDataVisual.objects.filter(
+            indicator_id=OuterRef('indicator_id')
+        ).order_by('id').values('id')[:1]
+
+        qs = IndicatorValue.objects.filter(
+            location=location,
+            indicator_id__in=data_visuals.keys(),
+        ).annotate(
+            data_visual_id=data_visual_subquery,
+        ).annotate(
+            source_priority=priority_subquery,
+            rn=Window(
+                expression=RowNumber(),
+                partition_by=[F('indicator_id'), F('location_id')],
+                order_by=[F('source_priority').asc(nulls_last=True), F('start_date').desc()]
+            ),
+        ).filter(rn=1).select_related('filter_option', 'location', 'source', 'indicator')
+
+        result = {}
+        for iv in qs:
+            data_visual = data_visuals[iv.indicator_id]
+            iv.data_visual_type = data_visual.data_visual_type
+            iv.columns = data_visual.columns
+            iv.location_comparison_type = data_visual.location_comparison_type
+            iv.color_scale_id = data_visual.color_scale_id
+            result[iv.indicator_id] = iv
+
+        # For line charts, get the full date range of the winning source
+        # instead of just the first row
+        line_indicator_ids = [
+            indicator_id for indicator_id, iv in result.items()
+            if iv.data_visual_type in ['line', 'multiline']
+        ]
+        if line_indicator_ids:
+            date_ranges = (
+                IndicatorValue.objects
+                .filter(location=location, indicator_id__in=line_indicator_ids)
+                .order_by()
+                .values('indicator_id', 'source_id')
+                .annotate(min_start=Min('start_date'), max_end=Max('end_date'))
+            )
+            for date_range in date_ranges:
+                iv = result[date_range['indicator_id']]
+                if iv.source_id != date_range['source_id']:
+                    continue
+                if date_range['min_start']:
+                    iv.start_date = date_range['min_start']
+                if date_range['max_end']:
+                    iv.end_date = date_range['max_end']
+
+        return result
+
     def get_comparison_types(self):
         """
         Returns list of comparison types needed for this section.
@@ -168,7 +241,67 @@ class LocationType(models.Model):
         db_table = "location_type"
 
 
-class Location(models.Model):
+# Map viewport margins around a location, as multiples of its width. Ordered like CSS.
+SIBLING_BOX_MARGINS = (1, 1, 1.5, 3.5)
+
+
+class GeometryTier(models.TextChoices):
+    """
+    Represents the simplified geometry stored for a map zoom level, from
+    coarsest to finest. Tolerances come from the GEOMETRY_TIER_TOLERANCES
+    setting.
+    """
+
+    OVERVIEW = "overview",
+    CITY = "city",
+    NEIGHBORHOOD = "neighborhood",
+
+    def __str__(self):
+        return self.name
+
+
+class DerivedGeometryFields(models.Model):
+    """
+    Columns derived from a model's `geometry`, stored so hot queries don't
+    recompute them from (and detoast) the full geometry. Set on save; the
+    backfill_location_geometry_fields management command fills existing rows.
+    """
+
+    DERIVED_GEOMETRY_FIELDS = ("area", "point_on_surface", "bbox")
+
+    # The planar area of the geometry, in the geometry's units (st_area)
+    area = models.FloatField(null=True, blank=True, editable=False, db_index=True)
+
+    # A point guaranteed to lie on the geometry (st_pointonsurface)
+    point_on_surface = models.PointField(null=True, blank=True, editable=False)
+
+    # The bounding box of the geometry
+    bbox = models.PolygonField(null=True, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def set_derived_geometry_fields(self):
+        if self.geometry is None or self.geometry.empty:
+            self.area = self.point_on_surface = self.bbox = None
+            return
+
+        self.area = self.geometry.area
+        self.point_on_surface = self.geometry.point_on_surface
+        self.point_on_surface.srid = self.geometry.srid
+        self.bbox = Polygon.from_bbox(self.geometry.extent)
+        self.bbox.srid = self.geometry.srid
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "geometry" in update_fields:
+            self.set_derived_geometry_fields()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *self.DERIVED_GEOMETRY_FIELDS}
+        super().save(*args, **kwargs)
+
+
+class Location(DerivedGeometryFields):
     """
     Represents a geographical location, such as a Detroit, Wayne County, or Michigan.
     """
@@ -188,41 +321,118 @@ class Location(models.Model):
     # The color associated with the location
     color = models.TextField(null=True, blank=True)
 
+    # Simplified geometries for map payloads, one per GeometryTier
+    geometry_overview = models.MultiPolygonField(null=True, blank=True, editable=False)
+    geometry_city = models.MultiPolygonField(null=True, blank=True, editable=False)
+    geometry_neighborhood = models.MultiPolygonField(null=True, blank=True, editable=False)
+
+    # Fields holding geometries, which are large and only needed for maps
+    GEOMETRY_FIELDS = (
+        "geometry",
+        "geometry_overview",
+        "geometry_city",
+        "geometry_neighborhood",
+        "point_on_surface",
+        "bbox",
+    )
+
     class Meta:
         db_table = "location"
 
     def __str__(self):
         return self.name
 
+    @staticmethod
+    def geometry_field_for(tier):
+        """
+        The name of the simplified geometry field for a GeometryTier.
+        """
+        return f"geometry_{GeometryTier(tier).value}"
+
+    def set_geometry_tiers(self):
+        tolerances = geometry_tier_tolerances()
+        for tier in GeometryTier:
+            simplified = None
+            if self.geometry is not None and not self.geometry.empty:
+                simplified = self.geometry.simplify(tolerances[tier.value], preserve_topology=True)
+                if simplified.geom_type == "Polygon":
+                    simplified = MultiPolygon(simplified)
+                simplified.srid = self.geometry.srid
+            setattr(self, self.geometry_field_for(tier), simplified)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "geometry" in update_fields:
+            self.set_geometry_tiers()
+            if update_fields is not None:
+                kwargs["update_fields"] = {
+                    *update_fields, *(self.geometry_field_for(tier) for tier in GeometryTier)
+                }
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def simplify_geometries(cls, location_ids=None, coverage=False):
+        """
+        Rebuilds the simplified geometry tiers in the database. With
+        coverage=True, locations of the same type are simplified together with
+        ST_CoverageSimplify (PostGIS 3.4+) so shared edges stay shared; the
+        coverage is always simplified as a whole, so location_ids is ignored.
+        """
+        tolerances = geometry_tier_tolerances()
+        with connection.cursor() as cursor:
+            for tier in GeometryTier:
+                field = cls.geometry_field_for(tier)
+                if coverage:
+                    simplified = "st_coveragesimplify(geometry, %(tolerance)s) over (partition by location_type_id)"
+                    scope = "true"
+                else:
+                    simplified = "st_simplifypreservetopology(geometry, %(tolerance)s)"
+                    scope = "(%(location_ids)s::text[] is null or id = any(%(location_ids)s::text[]))"
+                cursor.execute(
+                    f"""
+                    update location l
+                    set {field} = st_multi(s.simplified)
+                    from (
+                        select id, {simplified} as simplified
+                        from location
+                        where geometry is not null and {scope}
+                    ) s
+                    where l.id = s.id
+                    """,
+                    {
+                        "tolerance": tolerances[tier.value],
+                        "location_ids": None if location_ids is None else list(location_ids),
+                    },
+                )
+
     
-    def get_parents(self):
-        parent_location_types = self.location_type.parent_location_types.all()
-        parent_type_ids = list(parent_location_types.values_list("id", flat=True))
-
-        # Use Django ORM instead of PostgreSQL-specific SQL
-        # This is compatible with both PostgreSQL and SQLite
-        queryset = Location.objects.exclude(
-            location_type_id=self.location_type.id
-        ).filter(
-            location_type_id__in=parent_type_ids
-        ).extra(
-            select={"area": "st_area(geometry)"},
-            where=[
-                "st_area(geometry) > (select st_area(geometry) from location where id = %s)",
-                "st_contains(geometry, (select st_pointonsurface(geometry) from location where id = %s))",
-            ],
-            params=[self.id, self.id],
-            order_by=["area"],
-        )[:2]
+    def get_parents(self, defer_geom=False):
+        """
+        The two closest parent locations: locations of a parent type that
+        contain this location, smallest first. Read from the precomputed
+        LocationAncestor table.
+        """
+        qs = Location.objects.filter(
+            descendant_links__child=self,
+            descendant_links__depth=1,
+        )
+
+        if defer_geom:
+            qs = qs.defer(*Location.GEOMETRY_FIELDS)
 
-        return queryset
+        return qs.order_by("descendant_links__area_rank")[:2]
 
-    def sibling_box(self, margins=(1, 1, 1.5, 3.5)):
+    def sibling_box(self, margins=SIBLING_BOX_MARGINS):
         """
-        Find the bounding box based on the margins multiple
+        Find the bounding box based on the margins multiple. Falls back to
+        the geometry for rows whose bbox isn't backfilled yet, and returns
+        None for a location without geometry.
         """
+        geometry = self.bbox if self.bbox is not None else self.geometry
+        if geometry is None or geometry.empty:
+            return None
 
-        xmin, ymin, xmax, ymax = self.geometry.extent
+        xmin, ymin, xmax, ymax = geometry.extent
         width = xmax - xmin
         height = ymax - ymin
         
@@ -237,30 +447,254 @@ class Location(models.Model):
 
         return Polygon.from_bbox((box_xmin, box_ymin, box_xmax, box_ymax))
 
-    def get_siblings(self, nearby=False, defer_geom=False):
+    def get_siblings(self, nearby=False, adjacent=False, defer_geom=False):
         """
         If you apply nearby, it only gets roughly a bounding box around the object.
+        If you apply adjacent, it only gets the siblings touching or almost
+        touching the object. Both are read from the precomputed
+        LocationNeighbor table.
         """
         
         qs = (
-            Location.objects.filter(location_type_id=self.location_type.id)
+            Location.objects.filter(location_type_id=self.location_type_id)
             .exclude(id=self.id)
         )
 
         if nearby:
             # if 'nearby' is set, only get the siblings roughly in the map viewport
             # at the top of the profile page.
-            bbox = self.sibling_box()
-            qs = qs.filter(geometry__bboverlaps=bbox)
+            qs = qs.filter(neighbor_of_links__location=self, neighbor_of_links__in_viewport=True)
+
+        if adjacent:
+            qs = qs.filter(neighbor_of_links__location=self, neighbor_of_links__adjacent=True)
 
         if defer_geom:
             # If you don't need the geometry -- do not pull it
-            qs = qs.defer("geometry")
+            qs = qs.defer(*Location.GEOMETRY_FIELDS)
 
         return qs
 
 
-class CustomLocation(models.Model):
+class LocationAncestor(models.Model):
+    """
+    Closure table of location containment, precomputed from the geometries so
+    parent lookups are an indexed join instead of st_area/st_contains scans.
+
+    An ancestor is a location of a (transitive) parent type of the child's
+    type that has a larger area and contains the child's point on surface.
+    Filled by the build_location_hierarchy management command and refreshed
+    when a location's geometry changes.
+    """
+
+    # The contained location
+    child = models.ForeignKey(Location, on_delete=models.CASCADE, related_name="ancestor_links")
+
+    # The containing location
+    ancestor = models.ForeignKey(Location, on_delete=models.CASCADE, related_name="descendant_links")
+
+    # Location type hops from the child's type to the ancestor's type (1 = direct parent type)
+    depth = models.PositiveSmallIntegerField()
+
+    # Rank of the ancestor by area among the child's ancestors at the same depth (1 = smallest)
+    area_rank = models.PositiveIntegerField()
+
+    class Meta:
+        db_table = "location_ancestor"
+        unique_together = ("child", "ancestor")
+        indexes = [
+            models.Index(fields=["child", "depth", "area_rank"], name="location_ancestor_rank_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.child_id} < {self.ancestor_id} (depth {self.depth})"
+
+    @staticmethod
+    def get_ancestor_type_depths():
+        """
+        Returns {location_type_id: {ancestor_type_id: depth}} by walking the
+        parent location types breadth first.
+        """
+        parents = {}
+        for location_type in LocationType.objects.prefetch_related("parent_location_types"):
+            parents[location_type.id] = [p.id for p in location_type.parent_location_types.all()]
+
+        depths = {}
+        for location_type_id in parents:
+            seen = {location_type_id: 0}
+            frontier = [location_type_id]
+            while frontier:
+                next_frontier = []
+                for type_id in frontier:
+                    for parent_id in parents.get(type_id, []):
+                        if parent_id not in seen:
+                            seen[parent_id] = seen[type_id] + 1
+                            next_frontier.append(parent_id)
+                frontier = next_frontier
+            del seen[location_type_id]
+            depths[location_type_id] = seen
+        return depths
+
+    @classmethod
+    def rebuild(cls, location_ids=None):
+        """
+        Recomputes the ancestors of the given locations, or of every location.
+        """
+        scope = {} if location_ids is None else {"child_id__in": list(location_ids)}
+
+        with transaction.atomic():
+            cls.objects.filter(**scope).delete()
+
+            with connection.cursor() as cursor:
+                for location_type_id, ancestor_depths in cls.get_ancestor_type_depths().items():
+                    if not ancestor_depths:
+                        continue
+                    cursor.execute(
+                        """
+                        insert into location_ancestor (child_id, ancestor_id, depth, area_rank)
+                        select c.id, a.id, t.depth,
+                            row_number() over (partition by c.id, t.depth order by a.area)
+                        from location c
+                            cross join unnest(%s::bigint[], %s::int[]) as t(location_type_id, depth)
+                            join location a on a.location_type_id = t.location_type_id
+                                and st_contains(a.geometry, c.point_on_surface)
+                                and a.area > c.area
+                        where c.location_type_id = %s
+                            and c.point_on_surface is not null
+                            and (%s::text[] is null or c.id = any(%s::text[]))
+                        """,
+                        [
+                            list(ancestor_depths.keys()),
+                            list(ancestor_depths.values()),
+                            location_type_id,
+                            scope.get("child_id__in"),
+                            scope.get("child_id__in"),
+                        ],
+                    )
+
+    @classmethod
+    def refresh_for_location(cls, location):
+        """
+        Recomputes the ancestors of a location whose geometry changed, and of
+        every location it contains or used to contain.
+        """
+        child_type_ids = [
+            type_id for type_id, ancestor_depths in cls.get_ancestor_type_depths().items()
+            if location.location_type_id in ancestor_depths
+        ]
+        location_ids = {location.id}
+        location_ids.update(
+            cls.objects.filter(ancestor=location).values_list("child_id", flat=True)
+        )
+        location_ids.update(
+            Location.objects.filter(location_type_id__in=child_type_ids).extra(
+                where=["st_contains((select geometry from location where id = %s), point_on_surface)"],
+                params=[location.id],
+            ).values_list("id", flat=True)
+        )
+        cls.rebuild(location_ids=location_ids)
+
+
+class LocationNeighbor(models.Model):
+    """
+    Precomputed sibling adjacency, so profile pages don't run ST_DWithin or
+    bounding box scans over the location table. Holds every sibling (same
+    location type) that is adjacent to a location or inside its map viewport.
+
+    Filled by the build_location_neighbors management command and refreshed
+    when a location's geometry changes.
+    """
+
+    # Siblings within this distance (in geometry units) count as adjacent
+    ADJACENT_DISTANCE = 0.01
+
+    # The location
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name="neighbor_links")
+
+    # The sibling location
+    neighbor = models.ForeignKey(Location, on_delete=models.CASCADE, related_name="neighbor_of_links")
+
+    # The distance between the geometries (0 when they touch or overlap)
+    distance = models.FloatField()
+
+    # Whether the sibling is within ADJACENT_DISTANCE of the location
+    adjacent = models.BooleanField(default=False)
+
+    # Whether the sibling's bounding box overlaps the location's sibling_box
+    in_viewport = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = "location_neighbor"
+        unique_together = ("location", "neighbor")
+
+    def __str__(self):
+        return f"{self.location_id} ~ {self.neighbor_id}"
+
+    @classmethod
+    def rebuild(cls, location_ids=None, neighbor_ids=None):
+        """
+        Recomputes the neighbors of the given locations, the locations that
+        have the given neighbors, or every location.
+        """
+        scope = {}
+        if location_ids is not None:
+            scope["location_id__in"] = list(location_ids)
+        if neighbor_ids is not None:
+            scope["neighbor_id__in"] = list(neighbor_ids)
+
+        top, right, bottom, left = SIBLING_BOX_MARGINS
+
+        with transaction.atomic():
+            cls.objects.filter(**scope).delete()
+
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    insert into location_neighbor (location_id, neighbor_id, distance, adjacent, in_viewport)
+                    select l.id, n.id, st_distance(l.geometry, n.geometry),
+                        st_dwithin(l.geometry, n.geometry, %(adjacent_distance)s),
+                        n.bbox && v.box
+                    from location l
+                        cross join lateral (
+                            select st_xmin(l.bbox) as xmin, st_ymin(l.bbox) as ymin,
+                                st_xmax(l.bbox) as xmax, st_ymax(l.bbox) as ymax,
+                                st_xmax(l.bbox) - st_xmin(l.bbox) as width
+                        ) e
+                        cross join lateral (
+                            select st_makeenvelope(
+                                e.xmin - %(left)s * e.width, e.ymin - %(top)s * e.width,
+                                e.xmax + %(right)s * e.width, e.ymax + %(bottom)s * e.width,
+                                st_srid(l.bbox)
+                            ) as box
+                        ) v
+                        join location n on n.location_type_id = l.location_type_id
+                            and n.id <> l.id
+                            and (st_dwithin(l.geometry, n.geometry, %(adjacent_distance)s) or n.bbox && v.box)
+                    where l.bbox is not null
+                        and (%(location_ids)s::text[] is null or l.id = any(%(location_ids)s::text[]))
+                        and (%(neighbor_ids)s::text[] is null or n.id = any(%(neighbor_ids)s::text[]))
+                    """,
+                    {
+                        "adjacent_distance": cls.ADJACENT_DISTANCE,
+                        "top": top,
+                        "right": right,
+                        "bottom": bottom,
+                        "left": left,
+                        "location_ids": scope.get("location_id__in"),
+                        "neighbor_ids": scope.get("neighbor_id__in"),
+                    },
+                )
+
+    @classmethod
+    def refresh_for_location(cls, location):
+        """
+        Recomputes the neighbors of a location whose geometry changed, and
+        its place in every sibling's neighbors.
+        """
+        cls.rebuild(location_ids=[location.id])
+        cls.rebuild(neighbor_ids=[location.id])
+
+
+class CustomLocation(DerivedGeometryFields):
     """
     Represents a custom geographical location, such as a collection of specific tracts or zip codes.
     """
@@ -464,6 +898,13 @@ class IndicatorFilterOption(models.Model):
         ordering = ["sort_order"]
 
 
+# The category and section id stamped on values of uncategorized (header)
+# indicators. No category or section has it, so section reads never match
+# these values, and under list partitioning they land in the default
+# partition rather than a NULL partition key.
+UNCATEGORIZED = 0
+
+
 class IndicatorValue(models.Model):
     """
     Represents a value for an indicator at a specific location, time, and filter.
@@ -511,6 +952,22 @@ class IndicatorValue(models.Model):
     
     active_data = models.BooleanField(default=False)
 
+    # The indicator's category, denormalized so section reads scan a single
+    # table. Stamped on save and re-stamped in bulk when an indicator moves;
+    # UNCATEGORIZED for indicators without one. Deleting a category deletes
+    # its indicators and their values, so nothing is set NULL here, which a
+    # NOT NULL partition key would reject.
+    category = models.ForeignKey(
+        Category, on_delete=models.DO_NOTHING, null=True, blank=True,
+        editable=False, db_constraint=False, db_index=False, related_name="+"
+    )
+
+    # The indicator's section, denormalized the same way as the category
+    section = models.ForeignKey(
+        Section, on_delete=models.DO_NOTHING, null=True, blank=True,
+        editable=False, db_constraint=False, db_index=False, related_name="+"
+    )
+
 
     def __str__(self):
         return (
@@ -535,6 +992,257 @@ class IndicatorValue(models.Model):
             "filter_option",
             "location",
         )
+        indexes = [
+            # Section and header reads: location_id in (...) for a set of indicators
+            models.Index(
+                fields=["location", "indicator", "end_date"],
+                include=["source", "filter_option", "start_date", "value"],
+                name="iv_loc_ind_end_idx",
+            ),
+            # Latest vintage lookups: max(end_date) per indicator and source
+            models.Index(
+                fields=["indicator", "source", "end_date"],
+                name="iv_ind_src_end_idx",
+            ),
+            # Single-table section and category scans
+            models.Index(fields=["section", "location"], name="iv_section_loc_idx"),
+            models.Index(fields=["category", "location"], name="iv_category_loc_idx"),
+        ]
+        constraints = [
+            # unique_together with NULL sources and filter options equal, so
+            # the bulk loader can merge every row with ON CONFLICT. Only
+            # created on PostgreSQL 15+ (migration 0014).
+            models.UniqueConstraint(
+                fields=["source", "start_date", "end_date", "indicator", "filter_option", "location"],
+                name="indicator_value_key_uniq",
+                nulls_distinct=False,
+            ),
+        ]
+
+    def stamp(self):
+        """
+        Copies the category and section from the indicator onto the value,
+        or UNCATEGORIZED when the indicator has none.
+        """
+        category_id, section_id = (
+            Indicator.objects.filter(id=self.indicator_id)
+            .values_list("category_id", "category__section_id")
+            .first()
+        ) or (None, None)
+        self.category_id = UNCATEGORIZED if category_id is None else category_id
+        self.section_id = UNCATEGORIZED if section_id is None else section_id
+
+    @classmethod
+    def restamp(cls, indicator_ids=None):
+        """
+        Bulk re-stamps the denormalized category and section for the values of
+        the given indicators, or for every value. Returns the number of rows
+        updated.
+        """
+        indicators = Indicator.objects.filter(id=OuterRef("indicator_id"))
+        qs = cls.objects.all()
+        if indicator_ids is not None:
+            qs = qs.filter(indicator_id__in=list(indicator_ids))
+
+        return qs.update(
+            category_id=Coalesce(
+                Subquery(indicators.values("category_id")[:1]),
+                Value(UNCATEGORIZED),
+                output_field=models.IntegerField(),
+            ),
+            section_id=Coalesce(
+                Subquery(indicators.values("category__section_id")[:1]),
+                Value(UNCATEGORIZED),
+                output_field=models.IntegerField(),
+            ),
+        )
+
+
+class IndicatorLatestVintage(models.Model):
+    """
+    Derived table holding the latest end date per indicator and source, so
+    profile reads can find the latest vintage with a join instead of a
+    max(end_date) subquery per candidate row.
+
+    Rows are maintained incrementally by signals when indicator values
+    change. Bulk loads that bypass signals should run the
+    rebuild_indicator_latest_vintages management command.
+    """
+
+    # The indicator. Not constrained in the database since the table can
+    # always be rebuilt from indicator_value.
+    indicator = models.ForeignKey(Indicator, on_delete=models.CASCADE, db_constraint=False)
+
+    # The source of the indicator's values
+    source = models.ForeignKey(IndicatorSource, on_delete=models.CASCADE, db_constraint=False)
+
+    # The latest end date of the indicator's values from the source
+    latest_end_date = models.DateField()
+
+    class Meta:
+        db_table = "indicator_latest_vintage"
+        unique_together = ("indicator", "source")
+
+    def __str__(self):
+        return f"{self.indicator_id} - {self.source_id}: {self.latest_end_date}"
+
+    @classmethod
+    def refresh(cls, indicator_ids=None):
+        """
+        Recomputes the latest vintages of the given indicators, or of every
+        indicator.
+        """
+        scope = {}
+        if indicator_ids is not None:
+            scope["indicator_id__in"] = list(indicator_ids)
+
+        latest = (
+            IndicatorValue.objects.filter(source_id__isnull=False, **scope)
+            .values("indicator_id", "source_id")
+            .annotate(latest_end_date=Max("end_date"))
+        )
+
+        with transaction.atomic():
+            cls.objects.filter(**scope).delete()
+            cls.objects.bulk_create(cls(**row) for row in latest)
+
+    @classmethod
+    def refresh_pair(cls, indicator_id, source_id):
+        """
+        Recomputes the latest vintage of one indicator and source. A single
+        backward scan of the (indicator, source, end_date) index.
+        """
+        latest_end_date = IndicatorValue.objects.filter(
+            indicator_id=indicator_id, source_id=source_id
+        ).aggregate(latest=Max("end_date"))["latest"]
+
+        if latest_end_date is None:
+            cls.objects.filter(indicator_id=indicator_id, source_id=source_id).delete()
+        else:
+            cls.objects.update_or_create(
+                indicator_id=indicator_id,
+                source_id=source_id,
+                defaults={"latest_end_date": latest_end_date},
+            )
+
+    @classmethod
+    def refresh_for_value(cls, indicator_value, previous=None):
+        """
+        Recomputes the latest vintage an indicator value belongs to, and the
+        one it belonged to before it was edited, given as an (indicator id,
+        source id) pair.
+        """
+        pairs = {(indicator_value.indicator_id, indicator_value.source_id)}
+        if previous is not None:
+            pairs.add(previous)
+        for indicator_id, source_id in pairs:
+            # Values without a source never match a data visual source
+            if source_id is not None:
+                cls.refresh_pair(indicator_id, source_id)
+
+
+class ResolvedIndicatorValue(models.Model):
+    """
+    Derived table holding the priority-winning IndicatorValue per indicator,
+    location, and filter option. Line and multiline visuals keep every value
+    so the charts have their full history.
+
+    Rows are maintained incrementally by signals when indicator values or
+    data visual sources change. Bulk loads that bypass signals should run the
+    rebuild_resolved_indicator_values management command.
+    """
+
+    # The winning indicator value. Not constrained in the database since the
+    # table can always be rebuilt from indicator_value.
+    indicator_value = models.ForeignKey(
+        IndicatorValue, on_delete=models.CASCADE, db_constraint=False
+    )
+
+    # The indicator of the winning value
+    indicator = models.ForeignKey(Indicator, on_delete=models.CASCADE, db_constraint=False)
+
+    # The location of the winning value
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, db_constraint=False)
+
+    # The filter option of the winning value, if any
+    filter_option = models.ForeignKey(
+        IndicatorFilterOption, on_delete=models.CASCADE, null=True, blank=True, db_constraint=False
+    )
+
+    class Meta:
+        db_table = "resolved_indicator_value"
+        indexes = [
+            models.Index(fields=["location", "indicator"], name="resolved_iv_loc_ind_idx"),
+        ]
+
+    def __str__(self):
+        return str(self.indicator_value_id)
+
+    @classmethod
+    def refresh(cls, indicator_ids=None, location_ids=None, batch_size=5000):
+        """
+        Recomputes the resolved values for the given indicators and locations.
+        Leaving both out rebuilds the whole table.
+        """
+        scope = {}
+        if indicator_ids is not None:
+            scope["indicator_id__in"] = list(indicator_ids)
+        if location_ids is not None:
+            scope["location_id__in"] = list(location_ids)
+
+        priority_subquery = IndicatorDataVisualSource.objects.filter(
+            data_visual=OuterRef('indicator__indicatordatavisual'),
+            source=OuterRef('source')
+        ).values('priority')[:1]
+
+        winners = IndicatorValue.objects.filter(**scope).annotate(
+            source_priority=priority_subquery,
+            rn=Window(
+                expression=RowNumber(),
+                partition_by=[F('indicator_id'), F('location_id'), F('filter_option_id')],
+                order_by=[F('source_priority').asc(nulls_last=True), F('start_date').desc()]
+            ),
+            data_visual_type=F('indicator__indicatordatavisual__data_visual_type')
+        ).filter(
+            Q(rn=1) | Q(data_visual_type='line') | Q(data_visual_type='multiline')
+        ).values_list('id', 'indicator_id', 'location_id', 'filter_option_id')
+
+        with transaction.atomic():
+            cls.objects.filter(**scope).delete()
+
+            # An indicator with several data visuals joins in once per visual
+            seen = set()
+            batch = []
+            for iv_id, indicator_id, location_id, filter_option_id in winners.iterator(chunk_size=batch_size):
+                if iv_id in seen:
+                    continue
+                seen.add(iv_id)
+                batch.append(
+                    cls(
+                        indicator_value_id=iv_id,
+                        indicator_id=indicator_id,
+                        location_id=location_id,
+                        filter_option_id=filter_option_id,
+                    )
+                )
+                if len(batch) >= batch_size:
+                    cls.objects.bulk_create(batch)
+                    batch = []
+            cls.objects.bulk_create(batch)
+
+    @classmethod
+    def refresh_for_value(cls, indicator_value):
+        """
+        Recomputes the groups an indicator value belongs to, and any group
+        it used to win in before it was edited.
+        """
+        groups = {(indicator_value.indicator_id, indicator_value.location_id)}
+        groups.update(
+            cls.objects.filter(indicator_value_id=indicator_value.id)
+            .values_list("indicator_id", "location_id")
+        )
+        for indicator_id, location_id in groups:
+            cls.refresh(indicator_ids=[indicator_id], location_ids=[location_id])
 
 
 class DataVisualType(models.TextChoices):
@@ -675,27 +1383,89 @@ class IndicatorDataVisual(models.Model):
         ordering = ["indicator__category__section__sort_order", "indicator__category__sort_order", "indicator__sort_order"]
 
 
+HEADER_VALUES_SQL = """
+    select
+        idv.id as data_visual_id,
+        idv.indicator_id,
+        i.name as indicator_name,
+        (
+            select s.name
+            from indicator_data_visual_source idvs
+                join indicator_source s on s.id = idvs.source_id
+            where idvs.data_visual_id = idv.id
+            order by idvs.priority
+            limit 1
+        ) as source_name,
+        extract(year from coalesce(idv.end_date, hv.end_date))::int as year,
+        loc.id as location_id,
+        hv.id as indicator_value_id,
+        hv.source_id,
+        hv.filter_option_id,
+        hv.start_date,
+        hv.end_date,
+        hv.value,
+        hv.value_moe,
+        hv.count,
+        hv.count_moe,
+        hv.universe,
+        hv.universe_moe
+    from indicator_data_visual idv
+        join indicator i on i.id = idv.indicator_id
+        cross join unnest(%(location_ids)s::text[]) as loc(id)
+        left join lateral (
+            select iv.*
+            from indicator_value iv
+                join indicator_data_visual_source idvs
+                    on idvs.data_visual_id = idv.id and idvs.source_id = iv.source_id
+            where iv.location_id = loc.id
+                and iv.indicator_id = idv.indicator_id
+                -- A range rather than extract(year ...) on both sides, so the
+                -- (location, indicator, end_date) index serves it
+                and (
+                    idv.end_date is null
+                    or (
+                        iv.end_date >= date_trunc('year', idv.end_date)::date
+                        and iv.end_date < (date_trunc('year', idv.end_date) + interval '1 year')::date
+                    )
+                )
+            order by idvs.priority, iv.end_date desc
+            limit 1
+        ) hv on true
+    where i.category_id is null
+    order by i.sort_order, idv.id, loc.id
+"""
+
+
+def get_header_values(location_ids):
+    """
+    Resolves the header value of every header data visual for each of the
+    given locations in a single query. Indicators with no category are shown
+    in the header area; their value is the one from the data visual's
+    highest-priority source in the data visual's end year (or the latest
+    one when the data visual has no end date).
+
+    Returns one dict per data visual and location, in header order, with
+    the indicator value's columns set to None when there is no value.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(HEADER_VALUES_SQL, {"location_ids": [str(id) for id in location_ids]})
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
 def assemble_header_data(location_id):
-    # Indicators with no category will be shown in the header area
-    # They have no category and hence to section so they don't get pulled with
-    # the first-section query.
-
-    # Use database-specific date extraction
-    # PostgreSQL uses EXTRACT, SQLite uses strftime
-
-    return IndicatorValue.objects.filter(
-        location_id=location_id,
-        indicator__category_id__isnull=True,
-    ).select_related(
-        'indicator', 'source'
-    ).order_by(
-        'location_id',
-        'indicator_id',
-        'indicator__indicatordatavisual__indicatordatavisualsource__priority',
-        '-end_date',
-    ).distinct(
-        'location_id',
-        'indicator_id',
-    )
+    """
+    The header strip of a location: the indicator name, source name, year
+    and value of each header data visual.
+    """
+    return [
+        {
+            "indicator_name": hv["indicator_name"],
+            "source_name": hv["source_name"],
+            "year": str(hv["year"]) if hv["year"] else None,
+            "value": hv["value"],
+        }
+        for hv in get_header_values([location_id])
+    ]
 
     
@@ -0,0 +1,286 @@
+"""
+Declarative PostgreSQL partitioning of indicator_value.
+
+Django has no notion of partitioned tables, so the conversion happens here in
+SQL and the IndicatorValue model keeps describing the parent table.
+indicator_value can be partitioned by range on end_date, one partition per
+year, or by list on the denormalized section_id or category_id, one partition
+per section or category plus a default partition for everything else.
+
+Partitioned tables need the partition key in every unique constraint, so the
+primary key becomes (id, key) and the unique_together constraint gains the
+key when it isn't already part of it. Primary key columns can't be NULL, so
+under list partitioning the key column is made NOT NULL. Values of
+uncategorized (header) indicators are stamped with the UNCATEGORIZED id
+instead of NULL, which no section or category has, so they land in the default
+partition. section_id and category_id follow from indicator_id, so adding them
+doesn't change which rows are unique. id still comes from a sequence, so the
+ORM keeps using it as the primary key.
+"""
+import datetime
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection as default_connection, transaction
+
+from .conf import get_setting
+from .models import UNCATEGORIZED
+
+
+TABLE = "indicator_value"
+
+# Partition key -> (strategy, column)
+PARTITION_KEYS = {
+    "end_date": ("range", "end_date"),
+    "section": ("list", "section_id"),
+    "category": ("list", "category_id"),
+}
+
+# Yearly end_date partitions are created this many years past the current one
+YEARS_AHEAD = 2
+
+
+def partition_key_setting():
+    """
+    The partition key configured by the INDICATOR_VALUE_PARTITIONING
+    setting, or None when indicator_value is not partitioned.
+    """
+    key = get_setting("INDICATOR_VALUE_PARTITIONING")
+    if key is not None and key not in PARTITION_KEYS:
+        raise ImproperlyConfigured(
+            f"D3_INDICATOR_VIZ_INDICATOR_VALUE_PARTITIONING must be one of "
+            f"{', '.join(PARTITION_KEYS)} or None, not {key!r}."
+        )
+    return key
+
+
+def get_partition_key(connection=default_connection):
+    """
+    The key indicator_value is currently partitioned on, or None.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            select a.attname
+            from pg_partitioned_table p
+                join pg_attribute a on a.attrelid = p.partrelid and a.attnum = p.partattrs[0]
+            where p.partrelid = to_regclass(%s)
+            """,
+            [TABLE],
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    return next(key for key, (_, column) in PARTITION_KEYS.items() if column == row[0])
+
+
+def get_partitions(connection=default_connection):
+    """
+    The (name, bound) of every partition of indicator_value, by name.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            select c.relname, pg_get_expr(c.relpartbound, c.oid)
+            from pg_inherits i
+                join pg_class c on c.oid = i.inhrelid
+            where i.inhparent = to_regclass(%s)
+            order by c.relname
+            """,
+            [TABLE],
+        )
+        return cursor.fetchall()
+
+
+def year_partition_name(year):
+    return f"{TABLE}_y{year}"
+
+
+def partition_year(name):
+    """
+    The year of a yearly partition's name, or None for other partitions.
+    """
+    match = re.fullmatch(rf"{TABLE}_y(\d+)", name)
+    return int(match.group(1)) if match else None
+
+
+def list_partition_name(key, value):
+    return f"{TABLE}_{key}_{value}"
+
+
+def partition_table(key, connection=default_connection, years=None):
+    """
+    Converts indicator_value into a table partitioned on the given key,
+    keeping its rows, indexes and constraints. The table is rewritten, so
+    this locks it for the duration of the copy.
+    """
+    strategy, column = PARTITION_KEYS[key]
+    old_table = f"{TABLE}_unpartitioned"
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        # The table can't be altered while deferred foreign key checks on it
+        # are pending
+        cursor.execute("set constraints all immediate")
+
+        # Definitions of the indexes and constraints to recreate once the
+        # old table, and with it their names, is gone
+        cursor.execute(
+            """
+            select conname, contype, pg_get_constraintdef(oid)
+            from pg_constraint
+            where conrelid = %s::regclass and contype in ('p', 'u', 'f')
+            """,
+            [TABLE],
+        )
+        constraints = cursor.fetchall()
+        cursor.execute(
+            """
+            select i.relname, pg_get_indexdef(i.oid)
+            from pg_index x
+                join pg_class i on i.oid = x.indexrelid
+            where x.indrelid = %s::regclass
+                and not exists (select 1 from pg_constraint c where c.conindid = i.oid)
+            """,
+            [TABLE],
+        )
+        indexes = cursor.fetchall()
+
+        if strategy == "list":
+            # The key becomes part of the primary key, so it can't be NULL.
+            # Values stamped before UNCATEGORIZED existed may still be.
+            cursor.execute(f"update {TABLE} set {column} = %s where {column} is null", [UNCATEGORIZED])
+
+        cursor.execute(f"alter table {TABLE} rename to {old_table}")
+        cursor.execute(
+            f"create table {TABLE} (like {old_table} including defaults including constraints "
+            f"including storage including comments) partition by {strategy} ({column})"
+        )
+        cursor.execute(f"alter table {TABLE} alter column {column} set not null")
+
+        if strategy == "range":
+            if years is None:
+                cursor.execute(
+                    f"select extract(year from min(end_date))::int, extract(year from max(end_date))::int "
+                    f"from {old_table}"
+                )
+                years = cursor.fetchone()
+            ensure_partitions(key, connection, first_year=years[0], last_year=years[1])
+        else:
+            ensure_partitions(key, connection)
+
+        cursor.execute(f"insert into {TABLE} select * from {old_table}")
+        cursor.execute(f"drop table {old_table}")
+
+        # Identity columns are not supported on partitioned tables before
+        # PostgreSQL 17, so ids come from a plain sequence
+        cursor.execute(f"create sequence {TABLE}_id_seq owned by {TABLE}.id")
+        cursor.execute(f"alter table {TABLE} alter column id set default nextval('{TABLE}_id_seq')")
+        cursor.execute(f"select setval('{TABLE}_id_seq', coalesce(max(id), 0) + 1, false) from {TABLE}")
+
+        for name, contype, definition in constraints:
+            if contype == "p":
+                definition = f"primary key (id, {column})"
+            elif contype == "u":
+                unique, columns = re.fullmatch(r"(UNIQUE[^(]*)\((.*)\)", definition).groups()
+                if column not in [c.strip() for c in columns.split(",")]:
+                    definition = f"{unique}({columns}, {column})"
+            cursor.execute(f"alter table {TABLE} add constraint {name} {definition}")
+
+        for name, definition in indexes:
+            cursor.execute(definition)
+
+
+def ensure_partitions(key=None, connection=default_connection, first_year=None, last_year=None):
+    """
+    Creates the missing partitions of indicator_value: every year from the
+    first one (or the earliest partition) through YEARS_AHEAD past the current
+    year for end_date, or every section or category plus the default
+    partition for list keys.
+    """
+    key = key or get_partition_key(connection)
+    if key is None:
+        return []
+
+    strategy, column = PARTITION_KEYS[key]
+    existing = {name for name, _ in get_partitions(connection)}
+    created = []
+
+    with connection.cursor() as cursor:
+        if strategy == "range":
+            current_year = datetime.date.today().year
+            years = [partition_year(name) for name in existing if partition_year(name)]
+            first_year = first_year or min(years, default=current_year)
+            last_year = max(last_year or current_year, current_year + YEARS_AHEAD)
+            for year in range(first_year, last_year + 1):
+                name = year_partition_name(year)
+                if name in existing:
+                    continue
+                cursor.execute(
+                    f"create table {name} partition of {TABLE} "
+                    f"for values from ('{year}-01-01') to ('{year + 1}-01-01')"
+                )
+                created.append(name)
+        else:
+            default = f"{TABLE}_default"
+            if default not in existing:
+                cursor.execute(f"create table {default} partition of {TABLE} default")
+                created.append(default)
+            cursor.execute(f"select id from {key} order by id")
+            for (value,) in cursor.fetchall():
+                name = list_partition_name(key, value)
+                if name not in existing:
+                    add_list_partition(key, value, connection)
+                    created.append(name)
+
+    return created
+
+
+def add_list_partition(key, value, connection=default_connection):
+    """
+    Adds the partition of one section or category, moving any of its rows
+    out of the default partition first, since a partition can't be attached
+    while the default partition holds rows that belong in it.
+    """
+    _, column = PARTITION_KEYS[key]
+    value = int(value)
+    name = list_partition_name(key, value)
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"create table {name} (like {TABLE} including defaults including constraints)")
+        cursor.execute(
+            f"""
+            with moved as (
+                delete from {TABLE}_default where {column} = %s returning *
+            )
+            insert into {name} select * from moved
+            """,
+            [value],
+        )
+        cursor.execute(f"alter table {TABLE} attach partition {name} for values in ({value})")
+
+
+def detach_partition(name, connection=default_connection, concurrently=True):
+    """
+    Detaches a partition from indicator_value, leaving it as a standalone
+    table to archive or drop. Concurrent detaching (PostgreSQL 14+) doesn't
+    block reads or writes, but can't run inside a transaction or while a
+    default partition exists.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"alter table {TABLE} detach partition {name}{' concurrently' if concurrently else ''}"
+        )
+
+
+def detach_years_before(year, connection=default_connection, concurrently=True):
+    """
+    Detaches the yearly partitions of vintages ending before the given year.
+    Returns the names of the detached partitions.
+    """
+    detached = []
+    for name, _ in get_partitions(connection):
+        partition = partition_year(name)
+        if partition is not None and partition < year:
+            detach_partition(name, connection, concurrently=concurrently)
+            detached.append(name)
+    return detached
@@ -0,0 +1,137 @@
+"""
+Encodings of the JSON payloads embedded in profile and section HTML.
+
+Every payload is written with dumps(), which uses orjson when it is installed
+and the standard library json module otherwise. Dates and datetimes are
+written in ISO 8601, Decimals as strings and querysets as lists, so callers
+don't need default=str or list(). A project can plug in its own encoder with
+the JSON_DUMPS setting, a callable or its dotted path, taking the value and
+returning a str.
+
+By default a section's indicator values are a JSON list of dicts, one per
+value, which repeats every key on every row. With the COLUMNAR_PAYLOADS
+setting they are encoded column by column instead: one array per field, with
+location ids and dates replaced by indexes into lookup tables since they
+repeat across rows. decodeIndicatorValues in chart-connector.js turns either
+encoding back into the list of dicts.
+
+    {
+        "encoding": "columnar",
+        "length": 2,
+        "lookups": {"location_id": ["26163"], "start_date": [...], "end_date": [...]},
+        "columns": {"id": [1, 2], "location_id": [0, 0], "value": [1.5, 2.5], ...}
+    }
+"""
+import datetime
+import decimal
+import json
+import uuid
+
+from django.db.models.query import QuerySet
+from django.utils.module_loading import import_string
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .conf import get_setting
+
+
+def _default(value):
+    """
+    Encodes the types neither encoder handles natively.
+    """
+    # Most common first, since this runs for every date of every row
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, QuerySet):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def orjson_dumps(value):
+    return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def stdlib_dumps(value):
+    return json.dumps(value, default=_default, separators=(",", ":"))
+
+
+def get_dumps():
+    """
+    The encoder configured by the JSON_DUMPS setting, orjson when installed,
+    or the standard library.
+    """
+    dumps = get_setting("JSON_DUMPS")
+    if isinstance(dumps, str):
+        return import_string(dumps)
+    if dumps is not None:
+        return dumps
+    return orjson_dumps if orjson is not None else stdlib_dumps
+
+
+def dumps(value):
+    """
+    Encodes a payload to a JSON str with the configured encoder.
+    """
+    return get_dumps()(value)
+
+
+# The fields encoded through lookup tables
+LOOKUP_FIELDS = ("location_id", "start_date", "end_date")
+
+
+def encode_columnar(rows):
+    """
+    Encodes a list of dicts with the same keys column by column.
+    """
+    fields = list(rows[0]) if rows else []
+    columns = {field: [row[field] for row in rows] for field in fields}
+    lookups = {}
+
+    for field in LOOKUP_FIELDS:
+        if field not in columns:
+            continue
+        indexes = {}
+        columns[field] = [
+            None if value is None else indexes.setdefault(value, len(indexes))
+            for value in columns[field]
+        ]
+        lookups[field] = list(indexes)
+
+    return {
+        "encoding": "columnar",
+        "length": len(rows),
+        "lookups": lookups,
+        "columns": columns,
+    }
+
+
+def decode_columnar(payload):
+    """
+    Decodes a columnar payload back into its list of dicts, the Python
+    counterpart of decodeIndicatorValues in chart-connector.js for tests and
+    benchmarks. The JavaScript decoder itself isn't tested by the Python
+    suite, so a change to either must be made to both.
+    """
+    lookups, columns = payload["lookups"], payload["columns"]
+    return [
+        {
+            field: lookups[field][column[i]] if field in lookups and column[i] is not None else column[i]
+            for field, column in columns.items()
+        }
+        for i in range(payload["length"])
+    ]
+
+
+def encode_indicator_values(rows):
+    """
+    Encodes section indicator values for the page, columnar when the
+    COLUMNAR_PAYLOADS setting is on.
+    """
+    if get_setting("COLUMNAR_PAYLOADS", False):
+        return encode_columnar(rows)
+    return rows
@@ -0,0 +1,268 @@
+"""
+Cache of fully built profile contexts.
+
+Profile data only changes when values, indicators, data visuals or locations
+are loaded or edited, so the context of every profile page, including its JSON
+payloads, GeoJSON and header data, is cached per location. Every cache key
+carries a global data version, so invalidating is a single counter increment
+and stale contexts simply expire. The version is bumped by signals when those
+models are saved or deleted, and by the rebuild management commands after
+bulk loads.
+
+Versions are bumped once the writing transaction commits, and misses are
+built from the primary database rather than a read replica. Otherwise a
+request between the bump and the commit, or one reading from a replica that
+hasn't caught up, would cache the old data under the new version, where
+nothing would invalidate it.
+
+The HTML fragments get_section renders are cached the same way, per section,
+primary location and parent locations. Their keys also carry a version per
+section, bumped when the section or its categories are edited, so a section
+structure edit only invalidates that section. Profile contexts hold every
+section, so they carry a structure version bumped along with any section.
+
+Caching is off unless the D3_INDICATOR_VIZ_PROFILE_CACHE setting names a
+cache alias:
+
+    D3_INDICATOR_VIZ_PROFILE_CACHE = "default"
+"""
+import datetime
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.db import transaction
+
+from .conf import get_setting
+from .db_routers import use_primary
+
+
+DATA_VERSION_KEY = "d3iv:data:version"
+
+STRUCTURE_VERSION_KEY = "d3iv:structure:version"
+
+# When any version was last bumped, as a POSIX timestamp
+MODIFIED_KEY = "d3iv:modified"
+
+# Counters of section fragment cache lookups
+SECTION_HITS_KEY = "d3iv:sections:hits"
+SECTION_MISSES_KEY = "d3iv:sections:misses"
+
+
+def profile_cache():
+    """
+    The cache profile contexts are stored in, or None when caching is off.
+    """
+    alias = get_setting("PROFILE_CACHE")
+    return caches[alias] if alias is not None else None
+
+
+def _initial_version():
+    # Versions start from the clock rather than 1, so a version lost to a
+    # cache flush or eviction never repeats one that ETags were sent for
+    return time.time_ns()
+
+
+def _version(key):
+    cache = profile_cache()
+    if cache is None:
+        return None
+    return cache.get_or_set(key, _initial_version, timeout=None)
+
+
+def _bump(cache, key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Not cached yet (or evicted), so no entry can be keyed on it
+        cache.set(key, _initial_version(), timeout=None)
+    cache.set(MODIFIED_KEY, datetime.datetime.now(datetime.timezone.utc).timestamp(), timeout=None)
+
+
+def _increment(cache, key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def section_version_key(section_id):
+    return f"d3iv:section:{section_id}:version"
+
+
+def data_version():
+    return _version(DATA_VERSION_KEY)
+
+
+def section_version(section_id):
+    return _version(section_version_key(section_id))
+
+
+def structure_version():
+    return _version(STRUCTURE_VERSION_KEY)
+
+
+def last_modified():
+    """
+    When profile data or section structure last changed, or None if unknown.
+    """
+    cache = profile_cache()
+    timestamp = cache.get(MODIFIED_KEY) if cache is not None else None
+    if timestamp is None:
+        return None
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+
+
+def bump_data_version():
+    """
+    Invalidates every cached profile context and section once the current
+    transaction commits, or right away outside of one.
+    """
+    cache = profile_cache()
+    if cache is not None:
+        transaction.on_commit(lambda: _bump(cache, DATA_VERSION_KEY))
+
+
+def bump_section_versions(section_ids):
+    """
+    Invalidates the cached fragments of the given sections, and the profile
+    contexts that hold them, once the current transaction commits.
+    """
+    cache = profile_cache()
+    if cache is None:
+        return
+    section_ids = {section_id for section_id in section_ids if section_id is not None}
+
+    def bump():
+        for section_id in section_ids:
+            _bump(cache, section_version_key(section_id))
+        _bump(cache, STRUCTURE_VERSION_KEY)
+
+    transaction.on_commit(bump)
+
+
+def _hash_parts(*parts):
+    # Parts such as location ids come from the URL or query string, so they
+    # are hashed: memcached rejects keys with spaces or control characters
+    # and keys over 250 bytes, which would make them a client-triggered error
+    return hashlib.md5("\n".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def profile_cache_key(*parts):
+    return f"d3iv:profile:{data_version()}:{structure_version()}:{_hash_parts(*parts)}"
+
+
+def get_or_build(parts, build, force=False):
+    """
+    Returns the cached context keyed by parts, building and caching it on a
+    miss, or always when force is set. A context of None is not cached.
+    Misses are built from the primary database.
+    """
+    cache = profile_cache()
+    if cache is None:
+        return build()
+
+    key = profile_cache_key(*parts)
+    context = None if force else cache.get(key)
+    if context is None:
+        with use_primary():
+            context = build()
+        if context is not None:
+            cache.set(key, context, timeout=get_setting("PROFILE_CACHE_TIMEOUT", 60 * 60 * 24))
+    return context
+
+
+async def aget_or_build(parts, build, force=False):
+    """
+    get_or_build for async views, where build is a coroutine function.
+    """
+    cache = profile_cache()
+    if cache is None:
+        return await build()
+
+    key = await sync_to_async(profile_cache_key)(*parts)
+    context = None if force else await cache.aget(key)
+    if context is None:
+        with use_primary():
+            context = await build()
+        if context is not None:
+            await cache.aset(key, context, timeout=get_setting("PROFILE_CACHE_TIMEOUT", 60 * 60 * 24))
+    return context
+
+
+def section_cache_key(section_id, primary_location_id, parent_location_ids, next_section_view="next_section"):
+    locations = _hash_parts(primary_location_id, parent_location_ids, next_section_view)
+    return f"d3iv:section:{section_id}:{section_version(section_id)}:{data_version()}:{locations}"
+
+
+def get_or_render_section(
+    section_id, primary_location_id, parent_location_ids, render, next_section_view="next_section"
+):
+    """
+    Returns the cached HTML of a section for a primary location and its
+    comma-separated parent location ids, rendering and caching it on a miss
+    from the primary database.
+    The HTML links to the view loading the next section, so that view's URL
+    name is part of the key.
+    """
+    cache = profile_cache()
+    if cache is None:
+        return render()
+
+    key = section_cache_key(section_id, primary_location_id, parent_location_ids, next_section_view)
+    html = cache.get(key)
+    if html is None:
+        _increment(cache, SECTION_MISSES_KEY)
+        with use_primary():
+            html = render()
+        cache.set(key, html, timeout=get_setting("PROFILE_CACHE_TIMEOUT", 60 * 60 * 24))
+    else:
+        _increment(cache, SECTION_HITS_KEY)
+    return html
+
+
+async def aget_or_render_section(
+    section_id, primary_location_id, parent_location_ids, render, next_section_view="anext_section"
+):
+    """
+    get_or_render_section for async views, where render is a coroutine
+    function.
+    """
+    cache = profile_cache()
+    if cache is None:
+        return await render()
+
+    key = await sync_to_async(section_cache_key)(
+        section_id, primary_location_id, parent_location_ids, next_section_view
+    )
+    html = await cache.aget(key)
+    if html is None:
+        await sync_to_async(_increment)(cache, SECTION_MISSES_KEY)
+        with use_primary():
+            html = await render()
+        await cache.aset(key, html, timeout=get_setting("PROFILE_CACHE_TIMEOUT", 60 * 60 * 24))
+    else:
+        await sync_to_async(_increment)(cache, SECTION_HITS_KEY)
+    return html
+
+
+def section_cache_stats():
+    """
+    The hits and misses of the section fragment cache since it was last
+    reset.
+    """
+    cache = profile_cache()
+    if cache is None:
+        return {"hits": 0, "misses": 0}
+    counts = cache.get_many([SECTION_HITS_KEY, SECTION_MISSES_KEY])
+    return {
+        "hits": counts.get(SECTION_HITS_KEY, 0),
+        "misses": counts.get(SECTION_MISSES_KEY, 0),
+    }
+
+
+def reset_section_cache_stats():
+    cache = profile_cache()
+    if cache is not None:
+        cache.delete_many([SECTION_HITS_KEY, SECTION_MISSES_KEY])
@@ -0,0 +1,229 @@
+"""
+django-import-export resources for high-volume imports.
+
+The default ModelResource compares every row with the stored one and looks
+its foreign keys up one query at a time, which can't finish a 500k-row
+vintage within a request. IndicatorValueResource instead resolves foreign
+keys and existing values from maps loaded once per file, skips the diff, and
+writes with bulk_create and bulk_update in batches of
+D3_INDICATOR_VIZ_IMPORT_BATCH_SIZE rows. Existing values are matched on the
+unique key (source, dates, indicator, filter option and location), so files
+don't need an id column.
+
+bulk_create and bulk_update don't send model signals, so values are stamped
+with their category and section as they are saved, and the derived tables of
+the imported indicators are refreshed after the import.
+
+Progress is recorded in the D3_INDICATOR_VIZ_IMPORT_PROGRESS_CACHE cache
+("default"), which the process polling it must share with the one importing.
+The admin runs the confirmed import in a background thread and marks it done
+with finish_import_progress().
+"""
+import copy
+
+from django.core.cache import caches
+from import_export import fields, resources
+from import_export.instance_loaders import BaseInstanceLoader
+from import_export.widgets import ForeignKeyWidget
+
+from .conf import get_setting
+from .models import (
+    Indicator,
+    IndicatorFilterOption,
+    IndicatorLatestVintage,
+    IndicatorSource,
+    IndicatorValue,
+    Location,
+    ResolvedIndicatorValue,
+    UNCATEGORIZED,
+)
+from .profile_cache import bump_data_version
+
+
+# The columns identifying an existing value
+INDICATOR_VALUE_KEY = ("source", "start_date", "end_date", "indicator", "filter_option", "location")
+
+# Progress is recorded every this many rows
+PROGRESS_INTERVAL = 1000
+
+# Progress is kept this many seconds after its last update
+PROGRESS_TIMEOUT = 60 * 60
+
+
+def import_progress_key(user_id):
+    return f"d3iv:import-progress:{user_id}"
+
+
+def import_progress_cache():
+    return caches[get_setting("IMPORT_PROGRESS_CACHE", "default")]
+
+
+def get_import_progress(user_id):
+    """
+    The progress of a user's running or last import: the rows processed,
+    the total, whether it's the dry run and whether it's done.
+    """
+    return import_progress_cache().get(import_progress_key(user_id))
+
+
+def set_import_progress(user_id, progress):
+    import_progress_cache().set(import_progress_key(user_id), progress, timeout=PROGRESS_TIMEOUT)
+
+
+def finish_import_progress(user_id, **outcome):
+    """
+    Marks a user's import done, with its outcome: the totals of the result
+    or the error that stopped it.
+    """
+    progress = get_import_progress(user_id) or {}
+    set_import_progress(user_id, {**progress, **outcome, "done": True})
+
+
+class CachedForeignKeyWidget(ForeignKeyWidget):
+    """
+    A foreign key widget resolving ids from a set loaded once per import,
+    returning the id rather than the instance.
+    """
+
+    def __init__(self, model, **kwargs):
+        super().__init__(model, key_is_id=True, **kwargs)
+        self.ids = None
+
+    def load(self):
+        self.ids = {str(id): id for id in self.model.objects.values_list("pk", flat=True)}
+
+    def clean(self, value, row=None, **kwargs):
+        if value is None or str(value).strip() == "":
+            return None
+        if self.ids is None:
+            self.load()
+        try:
+            return self.ids[str(value).strip()]
+        except KeyError:
+            raise ValueError(f"{self.model._meta.verbose_name} {value} does not exist.")
+
+
+class IndicatorValueInstanceLoader(BaseInstanceLoader):
+    """
+    Loads the stored values of every indicator and location in the dataset
+    in one query, keyed on INDICATOR_VALUE_KEY.
+    """
+
+    def __init__(self, resource, dataset=None):
+        super().__init__(resource, dataset)
+        key_fields = [resource.fields[name] for name in INDICATOR_VALUE_KEY]
+
+        indicator_ids, location_ids, end_dates = set(), set(), set()
+        for row in dataset.dict if dataset else []:
+            try:
+                indicator_ids.add(resource.fields["indicator"].clean(row))
+                location_ids.add(resource.fields["location"].clean(row))
+                end_dates.add(resource.fields["end_date"].clean(row))
+            except (KeyError, ValueError):
+                # Reported as a row error when the row is imported
+                continue
+
+        self.instances = {}
+        if indicator_ids and location_ids:
+            existing = IndicatorValue.objects.filter(
+                indicator_id__in=indicator_ids, location_id__in=location_ids, end_date__in=end_dates
+            )
+            for instance in existing.iterator(chunk_size=10_000):
+                key = tuple(getattr(instance, field.attribute) for field in key_fields)
+                self.instances[key] = instance
+
+    def get_instance(self, row):
+        key_fields = [self.resource.fields[name] for name in INDICATOR_VALUE_KEY]
+        try:
+            key = tuple(field.clean(row) for field in key_fields)
+        except (KeyError, ValueError):
+            return None
+        return self.instances.get(key)
+
+
+class IndicatorValueResource(resources.ModelResource):
+    """
+    High-volume import and export of indicator values.
+    """
+
+    source = fields.Field(
+        attribute="source_id", column_name="source", widget=CachedForeignKeyWidget(IndicatorSource)
+    )
+    indicator = fields.Field(
+        attribute="indicator_id", column_name="indicator", widget=CachedForeignKeyWidget(Indicator)
+    )
+    filter_option = fields.Field(
+        attribute="filter_option_id",
+        column_name="filter_option",
+        widget=CachedForeignKeyWidget(IndicatorFilterOption),
+    )
+    location = fields.Field(
+        attribute="location_id", column_name="location", widget=CachedForeignKeyWidget(Location)
+    )
+
+    class Meta:
+        model = IndicatorValue
+        exclude = ("id", "category", "section")
+        import_id_fields = INDICATOR_VALUE_KEY
+        instance_loader_class = IndicatorValueInstanceLoader
+        skip_diff = True
+        use_bulk = True
+        report_skipped = False
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Read per resource rather than at import time, so the setting can
+        # change (or be overridden in tests) after this module is loaded. The
+        # options are copied first, since Meta's are shared by every instance.
+        self._meta = copy.copy(self._meta)
+        self._meta.batch_size = get_setting("IMPORT_BATCH_SIZE", 5000)
+
+    def before_import(self, dataset, **kwargs):
+        for field in self.fields.values():
+            if isinstance(field.widget, CachedForeignKeyWidget):
+                field.widget.load()
+
+        # The denormalized category and section of every indicator, stamped
+        # the way IndicatorValue.stamp() does
+        self.indicator_stamps = {
+            id: (
+                UNCATEGORIZED if category_id is None else category_id,
+                UNCATEGORIZED if section_id is None else section_id,
+            )
+            for id, category_id, section_id in Indicator.objects.values_list(
+                "id", "category_id", "category__section_id"
+            )
+        }
+        self.imported_indicator_ids = set()
+
+        self.progress_user_id = None
+        user = kwargs.get("user")
+        if user is not None:
+            self.progress_user_id = user.pk
+            self.progress = {"processed": 0, "total": len(dataset), "dry_run": None, "done": False}
+            set_import_progress(self.progress_user_id, self.progress)
+
+    def before_save_instance(self, instance, row, **kwargs):
+        instance.category_id, instance.section_id = self.indicator_stamps.get(
+            instance.indicator_id, (UNCATEGORIZED, UNCATEGORIZED)
+        )
+        self.imported_indicator_ids.add(instance.indicator_id)
+
+    def after_import_row(self, row, row_result, **kwargs):
+        if self.progress_user_id is not None and kwargs.get("row_number", 0) % PROGRESS_INTERVAL == 0:
+            self.progress["processed"] = kwargs["row_number"]
+            self.progress["dry_run"] = kwargs.get("dry_run")
+            set_import_progress(self.progress_user_id, self.progress)
+
+    def after_import(self, dataset, result, **kwargs):
+        if self.progress_user_id is not None:
+            self.progress["processed"] = self.progress["total"]
+            self.progress["dry_run"] = kwargs.get("dry_run")
+            set_import_progress(self.progress_user_id, self.progress)
+
+        if kwargs.get("dry_run") or not self.imported_indicator_ids:
+            return
+        indicator_ids = sorted(self.imported_indicator_ids)
+        ResolvedIndicatorValue.refresh(indicator_ids=indicator_ids)
+        IndicatorLatestVintage.refresh(indicator_ids=indicator_ids)
+        bump_data_version()
@@ -56,7 +56,19 @@ class DataVisualSerializer(serializers.ModelSerializer):
         return first_source.source.id if first_source else None
 
 
-class IndicatorValueSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """
+    Lets callers pass fields=[...] to serialize only some of the fields.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class IndicatorValueSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = IndicatorValue
         fields = ['id', 'indicator', 'location', 'source', 'filter_option',
@@ -0,0 +1,197 @@
+"""
+Signal handlers that keep the derived tables in sync with the source data.
+
+Bulk operations (queryset.update, bulk_create, raw SQL loads) do not send
+these signals; run the matching rebuild management commands after them.
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import (
+    Category,
+    ColorScale,
+    CustomLocation,
+    Indicator,
+    IndicatorDataVisual,
+    IndicatorDataVisualSource,
+    IndicatorFilterOption,
+    IndicatorLatestVintage,
+    IndicatorSource,
+    IndicatorValue,
+    Location,
+    LocationAncestor,
+    LocationNeighbor,
+    LocationType,
+    ResolvedIndicatorValue,
+    Section,
+)
+from .partitioning import add_list_partition, get_partition_key
+from .profile_cache import bump_data_version, bump_section_versions
+from .tiles import invalidate_tiles
+
+
+def geometry_changed(instance, update_fields=None):
+    """
+    Whether a location's geometry differs from the stored one.
+    """
+    if update_fields is not None and "geometry" not in update_fields:
+        return False
+    previous = type(instance).objects.filter(pk=instance.pk)
+    if instance.geometry is None:
+        return previous.filter(geometry__isnull=False).exists()
+    return not previous.filter(geometry__equals=instance.geometry).exists()
+
+
+@receiver(pre_save, sender=Location)
+def remember_location_geometry_change(sender, instance, update_fields=None, **kwargs):
+    instance._geometry_changed = geometry_changed(instance, update_fields)
+    instance._previous_location_type_id = (
+        Location.objects.filter(pk=instance.pk).values_list("location_type_id", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Location)
+def refresh_location_geometry_tables(sender, instance, **kwargs):
+    if instance._geometry_changed:
+        LocationAncestor.refresh_for_location(instance)
+        LocationNeighbor.refresh_for_location(instance)
+
+
+@receiver(post_save, sender=Location)
+def invalidate_location_tiles(sender, instance, **kwargs):
+    # Tiles carry names too, so any saved change invalidates them
+    invalidate_tiles(
+        [instance.location_type_id, instance._previous_location_type_id or instance.location_type_id]
+    )
+
+
+@receiver(post_delete, sender=Location)
+def invalidate_deleted_location_tiles(sender, instance, **kwargs):
+    invalidate_tiles([instance.location_type_id])
+
+
+@receiver(pre_save, sender=IndicatorValue)
+def stamp_indicator_value(sender, instance, **kwargs):
+    instance.stamp()
+
+
+@receiver(pre_save, sender=Indicator)
+def remember_indicator_category(sender, instance, **kwargs):
+    instance._previous_category_id = (
+        Indicator.objects.filter(pk=instance.pk).values_list("category_id", flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Indicator)
+def restamp_values_for_moved_indicator(sender, instance, created, **kwargs):
+    if not created and instance.category_id != instance._previous_category_id:
+        IndicatorValue.restamp(indicator_ids=[instance.id])
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_section(sender, instance, **kwargs):
+    instance._previous_section_id = (
+        Category.objects.filter(pk=instance.pk).values_list("section_id", flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Category)
+def restamp_values_for_moved_category(sender, instance, created, **kwargs):
+    if not created and instance.section_id != instance._previous_section_id:
+        IndicatorValue.restamp(indicator_ids=instance.indicator_set.values_list("id", flat=True))
+
+
+@receiver(post_save, sender=IndicatorValue)
+@receiver(post_delete, sender=IndicatorValue)
+def refresh_resolved_indicator_value(sender, instance, **kwargs):
+    ResolvedIndicatorValue.refresh_for_value(instance)
+
+
+@receiver(pre_save, sender=IndicatorValue)
+def remember_indicator_value_vintage(sender, instance, **kwargs):
+    instance._previous_vintage = (
+        IndicatorValue.objects.filter(pk=instance.pk).values_list("indicator_id", "source_id").first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=IndicatorValue)
+def refresh_indicator_latest_vintage(sender, instance, **kwargs):
+    IndicatorLatestVintage.refresh_for_value(instance, previous=instance._previous_vintage)
+
+
+@receiver(post_delete, sender=IndicatorValue)
+def refresh_deleted_indicator_latest_vintage(sender, instance, **kwargs):
+    IndicatorLatestVintage.refresh_for_value(instance)
+
+
+@receiver(post_save, sender=IndicatorDataVisualSource)
+@receiver(post_delete, sender=IndicatorDataVisualSource)
+def refresh_resolved_indicator_values_for_source(sender, instance, **kwargs):
+    # The data visual may already be gone when this is a cascaded delete
+    indicator_ids = IndicatorDataVisual.objects.filter(
+        id=instance.data_visual_id
+    ).values_list("indicator_id", flat=True)
+    for indicator_id in indicator_ids:
+        ResolvedIndicatorValue.refresh(indicator_ids=[indicator_id])
+
+
+@receiver(post_save, sender=IndicatorDataVisual)
+@receiver(post_delete, sender=IndicatorDataVisual)
+def refresh_resolved_indicator_values_for_visual(sender, instance, **kwargs):
+    # Line and multiline visuals keep their full history
+    ResolvedIndicatorValue.refresh(indicator_ids=[instance.indicator_id])
+
+
+@receiver(post_save, sender=Section)
+@receiver(post_save, sender=Category)
+def add_indicator_value_partition(sender, instance, created, **kwargs):
+    # Without its own partition, a new section's or category's values would
+    # land in the default partition
+    key = "section" if sender is Section else "category"
+    if created and get_partition_key() == key:
+        add_list_partition(key, instance.id)
+
+
+@receiver(post_save, sender=IndicatorValue)
+@receiver(post_delete, sender=IndicatorValue)
+@receiver(post_save, sender=Indicator)
+@receiver(post_delete, sender=Indicator)
+@receiver(post_save, sender=IndicatorDataVisual)
+@receiver(post_delete, sender=IndicatorDataVisual)
+@receiver(post_save, sender=IndicatorDataVisualSource)
+@receiver(post_delete, sender=IndicatorDataVisualSource)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=CustomLocation)
+@receiver(post_delete, sender=CustomLocation)
+# The lookups serialized into every profile's JSON payloads
+@receiver(post_save, sender=ColorScale)
+@receiver(post_delete, sender=ColorScale)
+@receiver(post_save, sender=IndicatorFilterOption)
+@receiver(post_delete, sender=IndicatorFilterOption)
+@receiver(post_save, sender=LocationType)
+@receiver(post_delete, sender=LocationType)
+@receiver(post_save, sender=IndicatorSource)
+@receiver(post_delete, sender=IndicatorSource)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    bump_data_version()
+
+
+@receiver(post_save, sender=Section)
+@receiver(post_delete, sender=Section)
+def invalidate_section_cache(sender, instance, **kwargs):
+    bump_section_versions([instance.id])
+
+
+@receiver(post_save, sender=Category)
+def invalidate_category_section_cache(sender, instance, **kwargs):
+    # A moved category changes both sections
+    bump_section_versions([instance.section_id, instance._previous_section_id])
+
+
+@receiver(post_delete, sender=Category)
+def invalidate_deleted_category_section_cache(sender, instance, **kwargs):
+    bump_section_versions([instance.section_id])
@@ -14,6 +14,30 @@ import DonutChart from './donutchart.js';
 import DataTable from './datatable.js';
 
 
+/**
+ * Decode the indicator values of a section. They are either a list of
+ * values, or encoded column by column (see payloads.py), with one array
+ * per field and lookup tables for repeated location ids and dates.
+ */
+function decodeIndicatorValues(payload) {
+    if (Array.isArray(payload)) return payload;
+
+    const { length, lookups, columns } = payload;
+    const fields = Object.keys(columns);
+    const values = new Array(length);
+
+    for (let i = 0; i < length; i++) {
+        const value = {};
+        for (const field of fields) {
+            const cell = columns[field][i];
+            value[field] = lookups[field] && cell !== null ? lookups[field][cell] : cell;
+        }
+        values[i] = value;
+    }
+
+    return values;
+}
+
 /**
  * Draw all charts in a container.
  */
@@ -32,7 +56,7 @@ function drawCharts(container = document) {
         if (section.dataset.chartsDrawn === 'true') return;
 
         // Parse indicator values
-        const allValues = JSON.parse(section.dataset.indicatorValues);
+        const allValues = decodeIndicatorValues(JSON.parse(section.dataset.indicatorValues));
 
         // Find all chart containers in this section
         const chartContainers = section.querySelectorAll('.chart-container[data-indicator-id]');
@@ -252,4 +276,4 @@ document.addEventListener('DOMContentLoaded', function() {
 });
 
 // Export for manual usage
-export default { drawAll: drawCharts };
+export default { drawAll: drawCharts, decodeIndicatorValues };
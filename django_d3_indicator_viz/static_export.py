@@ -0,0 +1,151 @@
+"""
+Static-site export of profile pages.
+
+Every profile is rendered from the profile view's context and every section
+it loads as it scrolls with render_section, into a directory per location:
+
+    <root>/<location id>/index.html
+    <root>/<location id>/sections/after-<sort order>.html
+
+The HTMX next_section URLs in the pages are rewritten to the section files, so
+the tree can be served by any static file server or CDN. A location's
+directory is only marked complete once all its files are written, so an
+interrupted export can be resumed by running it again.
+"""
+import html
+import os
+import re
+
+import django
+from django.apps import apps
+from django.template import loader
+from django.urls import reverse
+
+from .models import Section
+
+
+# Written last into each location's directory
+COMPLETE_MARKER = ".complete"
+
+
+def location_directory(root, location_id):
+    return os.path.join(root, str(location_id))
+
+
+def is_complete(directory):
+    return os.path.exists(os.path.join(directory, COMPLETE_MARKER))
+
+
+def section_file_name(after):
+    return f"after-{after}.html"
+
+
+def write_file(path, content):
+    """
+    Writes a file atomically, so an interrupted export never leaves a
+    truncated page behind.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def rewrite_section_urls(page, location_id, base_url=None):
+    """
+    Points the HTMX next_section URLs of a page or section at the exported
+    section files: relative to the profile's index.html, or under base_url
+    when given.
+    """
+    # Attribute values are HTML-escaped in the rendered page
+    next_section_url = re.escape(html.escape(reverse("next_section")))
+    prefix = f"{base_url.rstrip('/')}/{location_id}/sections/" if base_url else "sections/"
+
+    return re.sub(
+        rf'hx-get="{next_section_url}\?after=(\d+)[^"]*"',
+        lambda match: f'hx-get="{prefix}{section_file_name(match.group(1))}"',
+        page,
+    )
+
+
+def export_location(root, location_id, template_path, base_url=None, force=False):
+    """
+    Renders the profile and sections of a location into its directory.
+    Returns False when it was already complete.
+    """
+    # Imported here so worker processes import views after Django is set up
+    from .views import build_profile_page_context, render_section
+
+    directory = location_directory(root, location_id)
+    if not force and is_complete(directory):
+        return False
+
+    # The page is rendered from the same context the profile view uses, built
+    # once for both the page and the parents its sections are loaded with. No
+    # request is passed, as the exported pages are the same for every visitor
+    context = build_profile_page_context(location_id)
+    write_file(
+        os.path.join(directory, "index.html"),
+        rewrite_section_urls(loader.render_to_string(template_path, context), location_id, base_url),
+    )
+
+    parent_loc_ids = context["parent_loc_ids"]
+    sections = list(Section.objects.order_by("sort_order"))
+    for previous, section in zip(sections, sections[1:]):
+        fragment = render_section(None, section, location_id, parent_loc_ids)
+        write_file(
+            os.path.join(directory, "sections", section_file_name(previous.sort_order)),
+            rewrite_section_urls(fragment, location_id, base_url),
+        )
+    if sections:
+        # The last section still asks for the next one
+        write_file(os.path.join(directory, "sections", section_file_name(sections[-1].sort_order)), "")
+
+    write_file(os.path.join(directory, COMPLETE_MARKER), "")
+    return True
+
+
+def export_custom_location(root, slug, template_path, aggregator, force=False):
+    """
+    Renders the profile of a custom location, with every section inline,
+    into root/custom/<slug>/index.html. Returns False when it was already
+    complete.
+    """
+    from .views import build_profile_context
+
+    directory = os.path.join(root, "custom", slug)
+    if not force and is_complete(directory):
+        return False
+
+    context = build_profile_context(None, slug, aggregator)
+    write_file(os.path.join(directory, "index.html"), loader.render_to_string(template_path, context))
+    write_file(os.path.join(directory, COMPLETE_MARKER), "")
+    return True
+
+
+def init_worker():
+    """
+    Sets Django up in a worker process started without fork. Each worker
+    opens its own database connection on first use.
+    """
+    if not apps.ready:
+        django.setup()
+
+
+def export_batch(root, batch, options):
+    """
+    Exports a batch of ("location", id) and ("custom", slug) items in a worker
+    process. Returns the number of profiles written.
+    """
+    written = 0
+    for kind, key in batch:
+        if kind == "location":
+            written += export_location(
+                root, key, options["template"], options["base_url"], options["force"]
+            )
+        else:
+            written += export_custom_location(
+                root, key, options["custom_template"], options["aggregator"], options["force"]
+            )
+    return written
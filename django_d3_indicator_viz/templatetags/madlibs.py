@@ -1,7 +1,7 @@
 from __future__ import absolute_import
 from django import template
 from django.utils.safestring import mark_safe
-import json
+from django_d3_indicator_viz.payloads import dumps
 
 
 register = template.Library()
@@ -74,7 +74,7 @@ def tojson(value):
     """
     Convert a Python object to JSON string for use in data attributes.
     """
-    return mark_safe(json.dumps(value))
+    return mark_safe(dumps(value))
 
 
 @register.filter
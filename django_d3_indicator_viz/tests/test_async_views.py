@@ -0,0 +1,115 @@
+from asgiref.sync import async_to_sync
+from django.http import Http404
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from django.urls import reverse
+from django_d3_indicator_viz.indicator_value_aggregator import IndicatorValueAggregator
+from django_d3_indicator_viz.models import (
+    Category,
+    Indicator,
+    IndicatorDataVisual,
+    IndicatorDataVisualSource,
+    IndicatorSource,
+    IndicatorValue,
+    Location,
+    LocationType,
+    Section,
+)
+from django_d3_indicator_viz.views import (
+    abuild_profile_context,
+    abuild_profile_page_context,
+    aget_section,
+    aprofile,
+    build_profile_context,
+    build_profile_page_context,
+    get_section,
+)
+
+
+@override_settings(ROOT_URLCONF='django_d3_indicator_viz.urls')
+class AsyncViewTests(TransactionTestCase):
+    """Tests that the async profile views build what the sync ones do"""
+
+    # The async views read from worker threads on their own connections,
+    # which only see committed rows
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        loc_type = LocationType.objects.create(name='City')
+        self.location = Location.objects.create(id='1', name='Test City', location_type=loc_type)
+        Location.objects.create(id='2', name='Other City', location_type=loc_type)
+        source = IndicatorSource.objects.create(name='ACS 5-year')
+
+        for sort_order in (1, 2):
+            section = Section.objects.create(name=f'Section {sort_order}', sort_order=sort_order)
+            category = Category.objects.create(name=f'Category {sort_order}', about='', section=section)
+            indicator = Indicator.objects.create(name=f'Indicator {sort_order}', category=category, indicator_type='count')
+            visual = IndicatorDataVisual.objects.create(
+                indicator=indicator, data_visual_type='column', start_date='2023-01-01', end_date='2023-12-31'
+            )
+            IndicatorDataVisualSource.objects.create(data_visual=visual, source=source, priority=0)
+            for location_id, value in (('1', 10), ('2', 20)):
+                IndicatorValue.objects.create(
+                    indicator=indicator, location_id=location_id, source=source, value=value * sort_order,
+                    start_date='2023-01-01', end_date='2023-12-31'
+                )
+
+    def test_profile_page_context_matches(self):
+        """Test that the async profile page context equals the sync one"""
+        # Test
+        sync_context = build_profile_page_context('1')
+        async_context = async_to_sync(abuild_profile_page_context)('1')
+
+        # Assert
+        self.assertEqual(async_context, sync_context)
+        self.assertEqual(async_context['sections'][0]['name'], 'Section 1')
+
+    def test_profile_context_matches(self):
+        """Test that the async profile context equals the sync one"""
+        # Test
+        sync_context = build_profile_context(None, '1-test-city', IndicatorValueAggregator)
+        async_context = async_to_sync(abuild_profile_context)(None, '1-test-city', IndicatorValueAggregator)
+
+        # Assert
+        self.assertEqual(async_context, sync_context)
+        self.assertEqual(async_context['indicator_values_json'], sync_context['indicator_values_json'])
+
+    def test_get_section_matches(self):
+        """Test that the async section view renders the same HTML as the sync one"""
+        # Setup
+        request = self.factory.get('/sections/next/', {'after': 1, 'primary_loc_id': '1', 'parent_loc_ids': '2'})
+
+        # Test
+        sync_response = get_section(request)
+        async_response = async_to_sync(aget_section)(request)
+
+        # Assert
+        self.assertEqual(async_response.status_code, 200)
+        self.assertEqual(
+            async_response.content.replace(reverse('anext_section').encode(), reverse('next_section').encode()),
+            sync_response.content
+        )
+        self.assertIn(b'Category 2', async_response.content)
+
+    def test_sections_chain_to_async_view(self):
+        """Test that the sections of the async profile load the next section from aget_section"""
+        # Setup
+        section_request = self.factory.get('/async/sections/next/', {'after': 1, 'primary_loc_id': '1', 'parent_loc_ids': '2'})
+
+        # Test
+        page = async_to_sync(aprofile)(
+            self.factory.get('/async/profile/1/'), '1', template_path='django_d3_indicator_viz/profile.html'
+        )
+        section = async_to_sync(aget_section)(section_request)
+
+        # Assert
+        self.assertEqual(page.status_code, 200)
+        self.assertIn(f'hx-get="{reverse("anext_section")}?after=1'.encode(), page.content)
+        self.assertIn(f'hx-get="{reverse("anext_section")}?after=2'.encode(), section.content)
+        self.assertNotIn(f'hx-get="{reverse("next_section")}?'.encode(), page.content)
+
+    def test_missing_location(self):
+        """Test that an unknown location is a 404 on the async path too"""
+        # Test / Assert
+        with self.assertRaises(Http404):
+            async_to_sync(abuild_profile_page_context)('missing')
+        self.assertIsNone(async_to_sync(abuild_profile_context)(None, 'missing', IndicatorValueAggregator))
@@ -0,0 +1,194 @@
+import datetime
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django_d3_indicator_viz.bulk_load import (
+    LookupMaps,
+    RejectedRow,
+    load_indicator_values,
+    merge_rows,
+    unique_constraint_name,
+)
+from django_d3_indicator_viz.models import (
+    Category,
+    Indicator,
+    IndicatorFilterOption,
+    IndicatorFilterType,
+    IndicatorLatestVintage,
+    IndicatorSource,
+    IndicatorValue,
+    Location,
+    LocationType,
+    Section,
+    UNCATEGORIZED,
+)
+from django_d3_indicator_viz.partitioning import partition_table
+
+
+class BulkLoadTests(TransactionTestCase):
+    """Tests for the COPY-based indicator value loader"""
+
+    # Chunks are merged by worker threads on their own connections, which
+    # only see committed rows
+
+    def setUp(self):
+        loc_type = LocationType.objects.create(name='Tract')
+        self.location = Location.objects.create(id='26163000100', name='Tract 1', location_type=loc_type)
+        self.section = Section.objects.create(name='Demographics', sort_order=1)
+        self.category = Category.objects.create(name='Population', section=self.section, sort_order=1)
+        self.indicator = Indicator.objects.create(name='Total population', category=self.category)
+        self.source = IndicatorSource.objects.create(name='ACS 5-year')
+        filter_type = IndicatorFilterType.objects.create(name='Sex')
+        self.filter_option = IndicatorFilterOption.objects.create(name='Female', indicator_filter_type=filter_type)
+
+    def row(self, year=2023, value='100', filter_option='', **overrides):
+        return {
+            'indicator': str(self.indicator.id),
+            'location': self.location.id,
+            'source': 'ACS 5-year',
+            'filter_option': filter_option,
+            'start_date': f'{year - 4}-01-01',
+            'end_date': f'{year}-12-31',
+            'value': value,
+            'value_moe': '',
+            **overrides,
+        }
+
+    def load(self, rows, **kwargs):
+        return load_indicator_values(rows, chunk_size=2, workers=2, **kwargs)
+
+    def test_inserts_and_stamps(self):
+        """Test that loaded values are inserted with their category and section"""
+        # Test
+        result = self.load([self.row(2022), self.row(2023), self.row(2023, filter_option='Female')])
+
+        # Assert
+        self.assertEqual(result.merged, 3)
+        self.assertEqual(IndicatorValue.objects.count(), 3)
+        value = IndicatorValue.objects.get(end_date='2022-12-31')
+        self.assertEqual(value.value, 100)
+        self.assertIsNone(value.value_moe)
+        self.assertEqual(value.category_id, self.category.id)
+        self.assertEqual(value.section_id, self.section.id)
+
+    def test_updates_existing_values(self):
+        """Test that loading a value again updates it, with and without a filter option"""
+        # Setup
+        self.load([self.row(value='100'), self.row(value='200', filter_option='Female')])
+
+        # Test
+        self.load([self.row(value='101'), self.row(value='201', filter_option=str(self.filter_option.id))])
+
+        # Assert
+        self.assertEqual(IndicatorValue.objects.count(), 2)
+        self.assertEqual(IndicatorValue.objects.get(filter_option__isnull=True).value, 101)
+        self.assertEqual(IndicatorValue.objects.get(filter_option=self.filter_option).value, 201)
+
+    def test_last_duplicate_wins(self):
+        """Test that the last of several rows for the same value in a chunk is kept"""
+        # Test
+        load_indicator_values([self.row(value='1'), self.row(value='2'), self.row(value='3')])
+
+        # Assert
+        self.assertEqual(list(IndicatorValue.objects.values_list('value', flat=True)), [3])
+
+    def test_rejects_rows(self):
+        """Test that rows with unknown keys or invalid values are rejected and reported"""
+        # Setup
+        rejected = []
+
+        # Test
+        result = self.load(
+            [
+                self.row(),
+                self.row(location='missing'),
+                self.row(indicator='Unknown'),
+                self.row(value='n/a'),
+                self.row(end_date='last year'),
+            ],
+            on_reject=lambda row, reason: rejected.append(reason),
+        )
+
+        # Assert
+        self.assertEqual(result.rows, 5)
+        self.assertEqual(result.merged, 1)
+        self.assertEqual(
+            rejected, ['unknown location', 'unknown indicator', 'invalid value', 'invalid end_date']
+        )
+        self.assertEqual(sum(result.rejects.values()), 4)
+
+    def test_parallel_chunks_do_not_duplicate(self):
+        """Test that chunks merged at the same time never insert the same value twice"""
+        # Test
+        self.load([self.row(value=str(n)) for n in range(8)])
+
+        # Assert
+        self.assertEqual(IndicatorValue.objects.count(), 1)
+
+    def test_refreshes_derived_tables(self):
+        """Test that the latest vintages of loaded indicators are refreshed"""
+        # Test
+        self.load([self.row(2022), self.row(2023)])
+
+        # Assert
+        self.assertEqual(
+            IndicatorLatestVintage.objects.get(indicator=self.indicator, source=self.source).latest_end_date,
+            datetime.date(2023, 12, 31),
+        )
+
+    def test_resolves_unique_names(self):
+        """Test that only names shared by a single row resolve to an id"""
+        # Setup
+        IndicatorSource.objects.create(name='Decennial')
+        IndicatorSource.objects.create(name='Decennial')
+        maps = LookupMaps()
+
+        # Assert
+        self.assertEqual(maps.lookup(maps.sources, 'ACS 5-year', 'source'), self.source.id)
+        with self.assertRaises(RejectedRow):
+            maps.lookup(maps.sources, 'Decennial', 'source')
+
+
+class PartitionedMergeTests(TestCase):
+    """Tests for merging loaded values into a list partitioned indicator_value"""
+
+    # Merged on the test's connection, so partitioning is rolled back with
+    # the test rather than left for the other tests
+
+    def setUp(self):
+        loc_type = LocationType.objects.create(name='Tract')
+        self.location = Location.objects.create(id='26163000100', name='Tract 1', location_type=loc_type)
+        section = Section.objects.create(name='Demographics', sort_order=1)
+        category = Category.objects.create(name='Population', section=section, sort_order=1)
+        self.indicator = Indicator.objects.create(name='Total population', category=category)
+        self.header_indicator = Indicator.objects.create(name='Median income')
+        IndicatorSource.objects.create(name='ACS 5-year')
+        partition_table('section', connection)
+
+    def test_merges_uncategorized_values(self):
+        """Test that values of uncategorized indicators merge into the default partition"""
+        # Setup
+        maps = LookupMaps()
+        rows = [
+            (ordinal, *maps.resolve({
+                'indicator': str(indicator.id),
+                'location': self.location.id,
+                'source': 'ACS 5-year',
+                'start_date': '2019-01-01',
+                'end_date': '2023-12-31',
+                'value': '100',
+            }))
+            for ordinal, indicator in enumerate([self.indicator, self.header_indicator])
+        ]
+
+        # Test
+        with connection.cursor() as cursor:
+            merged = merge_rows(cursor, rows, *unique_constraint_name(connection))
+
+        # Assert
+        self.assertEqual(merged, 2)
+        header_value = IndicatorValue.objects.get(indicator=self.header_indicator)
+        self.assertEqual(header_value.section_id, UNCATEGORIZED)
+        with connection.cursor() as cursor:
+            cursor.execute('select indicator_id from indicator_value_default')
+            self.assertListEqual(cursor.fetchall(), [(self.header_indicator.id,)])
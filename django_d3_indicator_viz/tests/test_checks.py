@@ -0,0 +1,30 @@
+from django.db import connection
+from django.test import TestCase
+from django_d3_indicator_viz.bulk_load import KEY_CONSTRAINT
+from django_d3_indicator_viz.checks import check_key_constraint
+
+
+class KeyConstraintCheckTests(TestCase):
+    """Tests for the check of the value key's NULLS NOT DISTINCT constraint"""
+
+    def setUp(self):
+        # Read here rather than at import, before the test database exists
+        if connection.vendor != 'postgresql' or connection.pg_version < 150000:
+            self.skipTest("NULLS NOT DISTINCT requires PostgreSQL 15")
+
+    def test_passes_with_constraint(self):
+        """Test that a migrated database passes the check"""
+        # Test / Assert
+        self.assertListEqual(check_key_constraint(None, databases=['default']), [])
+
+    def test_warns_without_constraint(self):
+        """Test that a database missing the constraint is reported"""
+        # Setup
+        with connection.cursor() as cursor:
+            cursor.execute(f"alter table indicator_value drop constraint {KEY_CONSTRAINT}")
+
+        # Test
+        warnings = check_key_constraint(None, databases=['default'])
+
+        # Assert
+        self.assertListEqual([warning.id for warning in warnings], ['django_d3_indicator_viz.W001'])
@@ -0,0 +1,86 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django_d3_indicator_viz.conditional import conditional_view
+from django_d3_indicator_viz.profile_cache import bump_data_version, profile_cache
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    D3_INDICATOR_VIZ_PROFILE_CACHE='default',
+)
+class ConditionalViewTests(SimpleTestCase):
+    """Tests for conditional GET on the profile views"""
+
+    def setUp(self):
+        profile_cache().clear()
+        self.factory = RequestFactory()
+        self.calls = 0
+
+        @conditional_view('profile')
+        def view(request, location_id):
+            self.calls += 1
+            return HttpResponse(f'profile {location_id}')
+
+        self.view = view
+
+    def get(self, path='/profile/1/', **headers):
+        return self.view(self.factory.get(path, headers=headers), location_id='1')
+
+    def test_sends_etag_and_cache_control(self):
+        """Test that responses carry a strong ETag and the default Cache-Control"""
+        # Test
+        response = self.get()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('must-revalidate', response['Cache-Control'])
+        self.assertIn('max-age=0', response['Cache-Control'])
+
+    def test_not_modified_skips_view(self):
+        """Test that a matching If-None-Match is answered without running the view"""
+        # Setup
+        etag = self.get()['ETag']
+
+        # Test
+        response = self.get(if_none_match=etag)
+
+        # Assert
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.calls, 1)
+
+    def test_etag_varies_by_location_and_data(self):
+        """Test that ETags change with the parent ids and after a data load"""
+        # Setup
+        etag = self.get()['ETag']
+
+        # Test
+        other_parents = self.get('/profile/1/?parent_loc_ids=2,3')['ETag']
+        bump_data_version()
+        reloaded = self.get(if_none_match=etag)
+
+        # Assert
+        self.assertNotEqual(other_parents, etag)
+        self.assertEqual(reloaded.status_code, 200)
+        self.assertNotEqual(reloaded['ETag'], etag)
+        self.assertIn('Last-Modified', reloaded)
+
+    @override_settings(D3_INDICATOR_VIZ_CACHE_CONTROL={'profile': {'public': True, 'max_age': 300}})
+    def test_cache_control_setting(self):
+        """Test that the CACHE_CONTROL setting replaces a view's directives"""
+        # Test
+        response = self.get()
+
+        # Assert
+        self.assertIn('max-age=300', response['Cache-Control'])
+        self.assertNotIn('must-revalidate', response['Cache-Control'])
+
+    @override_settings(D3_INDICATOR_VIZ_PROFILE_CACHE=None)
+    def test_no_etag_without_profile_cache(self):
+        """Test that responses are unconditional when versions aren't tracked"""
+        # Test
+        response = self.get()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
@@ -0,0 +1,102 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django_d3_indicator_viz.db_routers import (
+    PIN_PRIMARY_COOKIE,
+    ReadReplicaRouter,
+    ReadYourWritesMiddleware,
+    use_primary,
+    use_read_replica,
+)
+from django_d3_indicator_viz.models import IndicatorValue, Location
+
+
+@override_settings(D3_INDICATOR_VIZ_READ_REPLICA='replica')
+class ReadReplicaRouterTests(SimpleTestCase):
+    """Tests for the read replica database router"""
+
+    def setUp(self):
+        self.router = ReadReplicaRouter()
+
+    def test_reads_primary_outside_replica_blocks(self):
+        """Test that reads use the default routing outside replica blocks"""
+        # Assert
+        self.assertIsNone(self.router.db_for_read(Location))
+
+    def test_reads_replica_inside_replica_blocks(self):
+        """Test that reads inside a replica block go to the replica"""
+        # Test
+        with use_read_replica():
+            db = self.router.db_for_read(Location)
+
+        # Assert
+        self.assertEqual(db, 'replica')
+
+    def test_writes_pin_the_rest_of_the_block_to_primary(self):
+        """Test that a write inside a replica block pins later reads to the primary"""
+        # Test
+        with use_read_replica():
+            self.assertEqual(self.router.db_for_write(IndicatorValue), None)
+            db = self.router.db_for_read(Location)
+        with use_read_replica():
+            next_db = self.router.db_for_read(Location)
+
+        # Assert
+        self.assertIsNone(db)
+        self.assertEqual(next_db, 'replica')
+
+    def test_use_primary_overrides_replica(self):
+        """Test that use_primary pins reads to the primary inside a replica block"""
+        # Test
+        with use_read_replica(), use_primary():
+            db = self.router.db_for_read(Location)
+
+        # Assert
+        self.assertIsNone(db)
+
+    def test_does_not_migrate_replica(self):
+        """Test that migrations never run against the replica"""
+        # Assert
+        self.assertFalse(self.router.allow_migrate('replica', 'django_d3_indicator_viz'))
+        self.assertIsNone(self.router.allow_migrate('default', 'django_d3_indicator_viz'))
+
+
+@override_settings(D3_INDICATOR_VIZ_READ_REPLICA='replica')
+class ReadYourWritesMiddlewareTests(SimpleTestCase):
+    """Tests for pinning a client's reads to the primary after a write"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = ReadReplicaRouter()
+
+    def view(self, request):
+        with use_read_replica():
+            return HttpResponse(self.router.db_for_read(Location) or 'default')
+
+    def test_sets_cookie_after_write(self):
+        """Test that a successful POST sets the pin cookie"""
+        # Test
+        response = ReadYourWritesMiddleware(self.view)(self.factory.post('/admin/'))
+
+        # Assert
+        self.assertIn(PIN_PRIMARY_COOKIE, response.cookies)
+
+    def test_pinned_client_reads_primary(self):
+        """Test that a client with the pin cookie reads from the primary"""
+        # Setup
+        request = self.factory.get('/profile/1/')
+        request.COOKIES[PIN_PRIMARY_COOKIE] = '1'
+
+        # Test
+        response = ReadYourWritesMiddleware(self.view)(request)
+
+        # Assert
+        self.assertEqual(response.content, b'default')
+
+    def test_unpinned_client_reads_replica(self):
+        """Test that other clients read from the replica"""
+        # Test
+        response = ReadYourWritesMiddleware(self.view)(self.factory.get('/profile/1/'))
+
+        # Assert
+        self.assertEqual(response.content, b'replica')
+        self.assertNotIn(PIN_PRIMARY_COOKIE, response.cookies)
@@ -0,0 +1,100 @@
+import io
+from unittest import skipIf, skipUnless
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django_d3_indicator_viz.exports import export_indicator_values, pa
+from django_d3_indicator_viz.models import (
+    Category,
+    Indicator,
+    IndicatorSource,
+    IndicatorValue,
+    Location,
+    LocationType,
+    Section,
+)
+
+
+@skipUnless(pa, "pyarrow is not installed")
+class ExportTests(TestCase):
+    """Tests for the columnar indicator value export"""
+
+    def setUp(self):
+        city_type = LocationType.objects.create(name='City')
+        tract_type = LocationType.objects.create(name='Tract')
+        self.city = Location.objects.create(id='1', name='Test City', location_type=city_type)
+        self.tract = Location.objects.create(id='2', name='Test Tract', location_type=tract_type)
+        self.section = Section.objects.create(name='Test Section')
+        category = Category.objects.create(name='Test Category', about='', section=self.section)
+        self.indicator = Indicator.objects.create(name='Population', category=category)
+        self.source = IndicatorSource.objects.create(name='Test Source')
+
+        for location in (self.city, self.tract):
+            for year in (2021, 2022, 2023):
+                IndicatorValue.objects.create(
+                    indicator=self.indicator, location=location, source=self.source,
+                    value=year, count=year * 2, start_date=f'{year}-01-01', end_date=f'{year}-12-31'
+                )
+
+    def test_writes_parquet(self):
+        """Test that a Parquet export holds every row with dictionary-encoded ids"""
+        # Setup
+        import pyarrow.parquet
+
+        sink = io.BytesIO()
+
+        # Test
+        rows = export_indicator_values(sink, 'parquet', chunk_size=4)
+        sink.seek(0)
+        table = pa.parquet.read_table(sink)
+
+        # Assert
+        self.assertEqual(rows, 6)
+        self.assertEqual(table.num_rows, 6)
+        self.assertTrue(pa.types.is_dictionary(table.schema.field('location_id').type))
+        self.assertListEqual(sorted(table.column('value').to_pylist()), [2021, 2021, 2022, 2022, 2023, 2023])
+
+    def test_writes_arrow_stream(self):
+        """Test that an Arrow IPC stream export reads back batch by batch"""
+        # Setup
+        import pyarrow.ipc
+
+        sink = io.BytesIO()
+
+        # Test
+        export_indicator_values(sink, 'arrow', chunk_size=4)
+        sink.seek(0)
+        table = pa.ipc.open_stream(sink).read_all()
+
+        # Assert
+        self.assertEqual(table.num_rows, 6)
+
+    def test_filters_by_location_type(self):
+        """Test that a slice only exports the requested location type"""
+        # Setup
+        sink = io.BytesIO()
+
+        # Test
+        rows = export_indicator_values(sink, 'parquet', location_type_ids=[self.tract.location_type_id])
+
+        # Assert
+        self.assertEqual(rows, 3)
+
+
+@skipIf(pa, "pyarrow is installed")
+@override_settings(ROOT_URLCONF='django_d3_indicator_viz.urls')
+class ExportWithoutPyarrowTests(TestCase):
+    """Tests for the export view when pyarrow is not installed"""
+
+    def test_view_reports_missing_pyarrow(self):
+        """Test that the export view answers 501 naming the export extra instead of failing"""
+        # Setup
+        staff = User.objects.create_user('staff', password='password', is_staff=True)
+        self.client.force_login(staff)
+
+        # Test
+        response = self.client.get('/exports/indicator-values/', {'format': 'parquet'})
+
+        # Assert
+        self.assertEqual(response.status_code, 501)
+        self.assertIn(b'django-d3-indicator-viz[export]', response.content)
@@ -0,0 +1,65 @@
+import json
+
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.core.serializers import serialize
+from django.test import TestCase, override_settings
+from django_d3_indicator_viz.geojson import to_geojson
+from django_d3_indicator_viz.models import (
+    Location,
+    LocationType,
+)
+
+
+def square(xmin, ymin, size):
+    return MultiPolygon(Polygon.from_bbox((xmin, ymin, xmin + size, ymin + size)), srid=4326)
+
+
+class GeoJSONTests(TestCase):
+    """Tests for the database-side GeoJSON builder"""
+
+    def setUp(self):
+        self.location_type = LocationType.objects.create(name='Tract')
+        Location.objects.create(id='1', name='Tract 1', location_type=self.location_type, geometry=square(0, 0, 1))
+        Location.objects.create(id='2', name='Tract 2', location_type=self.location_type, geometry=square(1, 0, 1))
+        Location.objects.create(id='3', name='Tract 3', location_type=self.location_type)
+
+    def test_matches_serializer(self):
+        """Test that the output matches serialize("geojson", ...)"""
+        # Setup
+        queryset = Location.objects.order_by('id')
+        fields = ('id', 'name', 'location_type')
+
+        # Test
+        built = json.loads(to_geojson(queryset, 'geometry', fields))
+
+        # Assert
+        expected = json.loads(serialize('geojson', queryset, geometry_field='geometry', fields=fields))
+        self.assertDictEqual(built, expected)
+
+    def test_keeps_queryset_order(self):
+        """Test that features follow the queryset's ordering"""
+        # Test
+        built = json.loads(to_geojson(Location.objects.order_by('-id'), 'geometry', ('name',)))
+
+        # Assert
+        self.assertListEqual([f['id'] for f in built['features']], ['3', '2', '1'])
+
+    @override_settings(D3_INDICATOR_VIZ_GEOJSON_PRECISION=1)
+    def test_rounds_coordinates(self):
+        """Test that coordinates are rounded to the configured precision"""
+        # Setup
+        Location.objects.filter(id='1').update(geometry=square(0.123456, 0.123456, 1))
+
+        # Test
+        built = json.loads(to_geojson(Location.objects.filter(id='1'), 'geometry', ('name',)))
+
+        # Assert
+        self.assertEqual(built['features'][0]['geometry']['coordinates'][0][0][0], [0.1, 0.1])
+
+    def test_empty_queryset(self):
+        """Test that an empty queryset is an empty FeatureCollection"""
+        # Test
+        built = json.loads(to_geojson(Location.objects.none(), 'geometry', ('name',)))
+
+        # Assert
+        self.assertListEqual(built['features'], [])
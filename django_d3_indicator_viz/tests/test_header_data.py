@@ -0,0 +1,101 @@
+from django.test import TestCase
+from django_d3_indicator_viz.models import (
+    Indicator,
+    IndicatorDataVisual,
+    IndicatorDataVisualSource,
+    IndicatorSource,
+    IndicatorValue,
+    Location,
+    LocationType,
+    assemble_header_data,
+    get_header_values,
+)
+
+
+class HeaderDataTests(TestCase):
+    """Tests for the header strip values of indicators without a category"""
+
+    def setUp(self):
+        loc_type = LocationType.objects.create(name='City')
+        self.location = Location.objects.create(id='1', name='Test City', location_type=loc_type)
+        self.other_location = Location.objects.create(id='2', name='Other City', location_type=loc_type)
+
+        self.primary = IndicatorSource.objects.create(name='Primary Source')
+        self.fallback = IndicatorSource.objects.create(name='Fallback Source')
+
+        self.population = Indicator.objects.create(name='Population', sort_order=0)
+        visual = IndicatorDataVisual.objects.create(
+            indicator=self.population,
+            data_visual_type='ban',
+            start_date='2022-01-01',
+            end_date='2022-12-31',
+        )
+        IndicatorDataVisualSource.objects.create(data_visual=visual, source=self.primary, priority=0)
+        IndicatorDataVisualSource.objects.create(data_visual=visual, source=self.fallback, priority=1)
+
+        self.income = Indicator.objects.create(name='Median income', sort_order=1)
+        visual = IndicatorDataVisual.objects.create(
+            indicator=self.income,
+            data_visual_type='ban',
+            start_date='2022-01-01',
+            end_date='2022-12-31',
+        )
+        IndicatorDataVisualSource.objects.create(data_visual=visual, source=self.primary, priority=0)
+
+    def create_value(self, indicator, source, end_date, value, location=None):
+        return IndicatorValue.objects.create(
+            indicator=indicator, location=location or self.location, source=source,
+            value=value, start_date='2020-01-01', end_date=end_date
+        )
+
+    def test_matches_data_visual_year(self):
+        """Test that the value is taken from the data visual's end year"""
+        # Setup
+        self.create_value(self.population, self.primary, '2021-12-31', 1)
+        self.create_value(self.population, self.primary, '2022-06-30', 2)
+        self.create_value(self.population, self.primary, '2023-12-31', 3)
+
+        # Test
+        header_data = assemble_header_data(self.location.id)
+
+        # Assert
+        self.assertDictEqual(
+            header_data[0],
+            {'indicator_name': 'Population', 'source_name': 'Primary Source', 'year': '2022', 'value': 2},
+        )
+
+    def test_falls_back_by_source_priority(self):
+        """Test that a fallback source is used when the primary has no value"""
+        # Setup
+        self.create_value(self.population, self.fallback, '2022-12-31', 5)
+
+        # Test
+        header_data = assemble_header_data(self.location.id)
+
+        # Assert
+        self.assertEqual(header_data[0]['value'], 5)
+
+    def test_keeps_data_visuals_without_values(self):
+        """Test that every header data visual is returned, in indicator order"""
+        # Test
+        header_data = assemble_header_data(self.location.id)
+
+        # Assert
+        self.assertListEqual([hd['indicator_name'] for hd in header_data], ['Population', 'Median income'])
+        self.assertIsNone(header_data[1]['value'])
+
+    def test_resolves_many_locations_in_one_query(self):
+        """Test that header values for several locations take a single query"""
+        # Setup
+        self.create_value(self.population, self.primary, '2022-12-31', 1)
+        self.create_value(self.population, self.primary, '2022-12-31', 2, location=self.other_location)
+
+        # Test
+        with self.assertNumQueries(1):
+            header_values = get_header_values([self.location.id, self.other_location.id])
+
+        # Assert
+        self.assertListEqual(
+            [(hv['location_id'], hv['value']) for hv in header_values if hv['indicator_id'] == self.population.id],
+            [('1', 1), ('2', 2)],
+        )
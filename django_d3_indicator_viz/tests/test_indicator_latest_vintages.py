@@ -0,0 +1,85 @@
+import datetime
+
+from django.test import TestCase
+from django_d3_indicator_viz.models import (
+    Indicator,
+    IndicatorLatestVintage,
+    IndicatorSource,
+    IndicatorValue,
+    Location,
+    LocationType,
+)
+
+
+class IndicatorLatestVintageTests(TestCase):
+    """Tests for the IndicatorLatestVintage table behind profile value reads"""
+
+    def setUp(self):
+        loc_type = LocationType.objects.create(name='City')
+        self.location = Location.objects.create(id='1', name='Test City', location_type=loc_type)
+        self.source = IndicatorSource.objects.create(name='Test Source')
+        self.indicator = Indicator.objects.create(name='Population')
+        self.other_indicator = Indicator.objects.create(name='Households')
+
+    def create_value(self, year, indicator=None):
+        return IndicatorValue.objects.create(
+            indicator=indicator or self.indicator, location=self.location, source=self.source,
+            value=year, start_date=f'{year}-01-01', end_date=f'{year}-12-31'
+        )
+
+    def latest_end_date(self, indicator=None):
+        return IndicatorLatestVintage.objects.get(
+            indicator=indicator or self.indicator, source=self.source
+        ).latest_end_date
+
+    def test_tracks_latest_on_save(self):
+        """Test that saving values keeps the latest end date"""
+        # Test
+        self.create_value(2021)
+        self.create_value(2023)
+        self.create_value(2022)
+
+        # Assert
+        self.assertEqual(self.latest_end_date(), datetime.date(2023, 12, 31))
+
+    def test_falls_back_when_latest_deleted(self):
+        """Test that deleting the latest value falls back to the previous one"""
+        # Setup
+        self.create_value(2022)
+        latest = self.create_value(2023)
+
+        # Test
+        latest.delete()
+
+        # Assert
+        self.assertEqual(self.latest_end_date(), datetime.date(2022, 12, 31))
+
+    def test_refreshes_previous_indicator_when_value_moves(self):
+        """Test that moving a value to another indicator refreshes both indicators"""
+        # Setup
+        self.create_value(2022)
+        moved = self.create_value(2023)
+
+        # Test
+        moved.indicator = self.other_indicator
+        moved.save()
+
+        # Assert
+        self.assertEqual(self.latest_end_date(), datetime.date(2022, 12, 31))
+        self.assertEqual(self.latest_end_date(self.other_indicator), datetime.date(2023, 12, 31))
+
+    def test_rebuild_after_bulk_load(self):
+        """Test that a full refresh picks up values loaded without signals"""
+        # Setup
+        IndicatorValue.objects.bulk_create([
+            IndicatorValue(
+                indicator=self.indicator, location=self.location, source=self.source,
+                value=5, start_date='2024-01-01', end_date='2024-12-31'
+            )
+        ])
+
+        # Test
+        IndicatorLatestVintage.refresh()
+
+        # Assert
+        self.assertEqual(self.latest_end_date(), datetime.date(2024, 12, 31))
@@ -0,0 +1,81 @@
+from django.test import TestCase, override_settings
+from django_d3_indicator_viz.models import (
+    Indicator,
+    IndicatorSource,
+    IndicatorValue,
+    Location,
+    LocationType,
+)
+
+
+@override_settings(ROOT_URLCONF='django_d3_indicator_viz.urls', D3_INDICATOR_VIZ_API_PAGE_SIZE=2)
+class IndicatorValueAPITests(TestCase):
+    """Tests for the read-only indicator value API"""
+
+    def setUp(self):
+        city_type = LocationType.objects.create(name='City')
+        tract_type = LocationType.objects.create(name='Tract')
+        self.city = Location.objects.create(id='1', name='Test City', location_type=city_type)
+        self.tract = Location.objects.create(id='2', name='Test Tract', location_type=tract_type)
+        self.indicator = Indicator.objects.create(name='Population')
+        self.source = IndicatorSource.objects.create(name='Test Source')
+
+        self.values = [
+            IndicatorValue.objects.create(
+                indicator=self.indicator, location=location, source=self.source,
+                value=year, start_date=f'{year}-01-01', end_date=f'{year}-12-31'
+            )
+            for location in (self.city, self.tract)
+            for year in (2021, 2022, 2023)
+        ]
+
+    def fetch_all(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url).json()
+            ids.extend(iv['id'] for iv in response['results'])
+            url = response['next']
+        return ids
+
+    def test_pages_through_every_value(self):
+        """Test that following the cursor returns every value once, in id order"""
+        # Test
+        ids = self.fetch_all('/api/indicator-values/')
+
+        # Assert
+        self.assertListEqual(ids, [iv.id for iv in self.values])
+
+    def test_filters_by_location_type_and_date_range(self):
+        """Test that values can be filtered by location type and end date range"""
+        # Test
+        ids = self.fetch_all(
+            f'/api/indicator-values/?location_type={self.tract.location_type_id}'
+            '&end_date_after=2022-01-01&end_date_before=2022-12-31'
+        )
+
+        # Assert
+        self.assertListEqual(ids, [self.values[4].id])
+
+    def test_filters_by_location_list(self):
+        """Test that id filters take comma-separated lists"""
+        # Test
+        ids = self.fetch_all(f'/api/indicator-values/?location={self.city.id},{self.tract.id}&page_size=10')
+
+        # Assert
+        self.assertEqual(len(ids), 6)
+
+    def test_sparse_fields(self):
+        """Test that fields= limits the returned fields"""
+        # Test
+        response = self.client.get('/api/indicator-values/?fields=id,value')
+
+        # Assert
+        self.assertSetEqual(set(response.json()['results'][0]), {'id', 'value'})
+
+    def test_rejects_unknown_fields(self):
+        """Test that unknown sparse fields are rejected"""
+        # Test
+        response = self.client.get('/api/indicator-values/?fields=id,secret')
+
+        # Assert
+        self.assertEqual(response.status_code, 400)
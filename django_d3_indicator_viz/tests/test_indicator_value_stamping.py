@@ -0,0 +1,101 @@
+from django.test import TestCase
+from django_d3_indicator_viz.models import (
+    Section,
+    Category,
+    Indicator,
+    IndicatorDataVisual,
+    IndicatorValue,
+    Location,
+    LocationType,
+    IndicatorSource,
+    UNCATEGORIZED,
+)
+
+
+class IndicatorValueStampingTests(TestCase):
+    """Tests for the denormalized category/section columns on IndicatorValue"""
+
+    def setUp(self):
+        loc_type = LocationType.objects.create(name='City')
+        self.location = Location.objects.create(id='1', name='Test City', location_type=loc_type)
+
+        self.section = Section.objects.create(name='Section A', sort_order=0)
+        self.other_section = Section.objects.create(name='Section B', sort_order=1)
+        self.category = Category.objects.create(name='Category A', about='', section=self.section)
+        self.other_category = Category.objects.create(name='Category B', about='', section=self.other_section)
+
+        self.indicator = Indicator.objects.create(name='Population', category=self.category)
+        IndicatorDataVisual.objects.create(
+            indicator=self.indicator,
+            data_visual_type='column',
+            start_date='2023-01-01',
+            end_date='2023-12-31',
+        )
+        source = IndicatorSource.objects.create(name='Test Source')
+        self.value = IndicatorValue.objects.create(
+            indicator=self.indicator, location=self.location, source=source,
+            value=10, start_date='2023-01-01', end_date='2023-12-31'
+        )
+
+    def test_stamps_on_save(self):
+        """Test that saving a value copies the indicator's category and section"""
+        # Assert
+        self.value.refresh_from_db()
+        self.assertEqual(self.value.category_id, self.category.id)
+        self.assertEqual(self.value.section_id, self.section.id)
+
+    def test_restamps_when_indicator_moves_category(self):
+        """Test that moving an indicator re-stamps its values"""
+        # Test
+        self.indicator.category = self.other_category
+        self.indicator.save()
+
+        # Assert
+        self.value.refresh_from_db()
+        self.assertEqual(self.value.category_id, self.other_category.id)
+        self.assertEqual(self.value.section_id, self.other_section.id)
+
+    def test_restamps_when_indicator_loses_category(self):
+        """Test that values of an uncategorized indicator are stamped UNCATEGORIZED rather than NULL"""
+        # Test
+        self.indicator.category = None
+        self.indicator.save()
+
+        # Assert
+        self.value.refresh_from_db()
+        self.assertEqual(self.value.category_id, UNCATEGORIZED)
+        self.assertEqual(self.value.section_id, UNCATEGORIZED)
+
+    def test_restamps_when_category_moves_section(self):
+        """Test that moving a category re-stamps the values of its indicators"""
+        # Test
+        self.category.section = self.other_section
+        self.category.save()
+
+        # Assert
+        self.value.refresh_from_db()
+        self.assertEqual(self.value.category_id, self.category.id)
+        self.assertEqual(self.value.section_id, self.other_section.id)
+
+    def test_section_reads_follow_moves(self):
+        """Test that section reads use the re-stamped section"""
+        # Test
+        self.category.section = self.other_section
+        self.category.save()
+
+        # Assert
+        self.assertListEqual(self.section.get_indicator_values([self.location]), [])
+        self.assertEqual(len(self.other_section.get_indicator_values([self.location])), 1)
+
+    def test_bulk_restamp(self):
+        """Test that restamp() fixes values written without signals"""
+        # Setup
+        IndicatorValue.objects.update(category_id=None, section_id=None)
+
+        # Test
+        updated = IndicatorValue.restamp()
+
+        # Assert
+        self.value.refresh_from_db()
+        self.assertEqual(updated, 1)
+        self.assertEqual(self.value.section_id, self.section.id)
@@ -0,0 +1,69 @@
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.test import TestCase
+from django_d3_indicator_viz.models import (
+    Location,
+    LocationAncestor,
+    LocationType,
+)
+
+
+def square(xmin, ymin, size):
+    return MultiPolygon(Polygon.from_bbox((xmin, ymin, xmin + size, ymin + size)), srid=4326)
+
+
+class LocationAncestorTests(TestCase):
+    """Tests for the LocationAncestor closure table behind Location.get_parents()"""
+
+    def setUp(self):
+        self.state_type = LocationType.objects.create(name='State')
+        self.county_type = LocationType.objects.create(name='County')
+        self.city_type = LocationType.objects.create(name='City')
+        self.tract_type = LocationType.objects.create(name='Tract')
+        self.tract_type.parent_location_types.add(self.city_type, self.county_type)
+        self.county_type.parent_location_types.add(self.state_type)
+
+        self.state = Location.objects.create(id='26', name='Michigan', location_type=self.state_type, geometry=square(0, 0, 100))
+        self.county = Location.objects.create(id='26163', name='Wayne', location_type=self.county_type, geometry=square(0, 0, 10))
+        self.city = Location.objects.create(id='2622000', name='Detroit', location_type=self.city_type, geometry=square(0, 0, 5))
+        self.tract = Location.objects.create(id='26163500100', name='Tract 5001', location_type=self.tract_type, geometry=square(1, 1, 1))
+
+        LocationAncestor.rebuild()
+
+    def test_get_parents_orders_by_area(self):
+        """Test that parents are the direct parent types, smallest first"""
+        # Test
+        parents = list(self.tract.get_parents())
+
+        # Assert
+        self.assertListEqual(parents, [self.city, self.county])
+
+    def test_transitive_ancestors_have_greater_depth(self):
+        """Test that ancestors through parent types of parent types are kept at a greater depth"""
+        # Test
+        link = LocationAncestor.objects.get(child=self.tract, ancestor=self.state)
+
+        # Assert
+        self.assertEqual(link.depth, 2)
+
+    def test_smaller_locations_are_not_ancestors(self):
+        """Test that a location is never an ancestor of a larger location"""
+        # Assert
+        self.assertFalse(LocationAncestor.objects.filter(child=self.county, ancestor=self.tract).exists())
+
+    def test_refreshes_when_geometry_changes(self):
+        """Test that moving a location's geometry refreshes its ancestors"""
+        # Test
+        self.tract.geometry = square(6, 6, 1)
+        self.tract.save()
+
+        # Assert
+        self.assertListEqual(list(self.tract.get_parents()), [self.county])
+
+    def test_refreshes_children_when_parent_geometry_changes(self):
+        """Test that shrinking a parent drops the children it no longer contains"""
+        # Test
+        self.city.geometry = square(3, 3, 2)
+        self.city.save()
+
+        # Assert
+        self.assertListEqual(list(self.tract.get_parents()), [self.county])
@@ -0,0 +1,93 @@
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.test import TestCase
+from django_d3_indicator_viz.models import (
+    CustomLocation,
+    Location,
+    LocationType,
+)
+
+
+def square(xmin, ymin, size):
+    return MultiPolygon(Polygon.from_bbox((xmin, ymin, xmin + size, ymin + size)), srid=4326)
+
+
+class LocationGeometryFieldsTests(TestCase):
+    """Tests for the stored area, point on surface and bounding box of locations"""
+
+    def setUp(self):
+        self.location_type = LocationType.objects.create(name='Tract')
+
+    def test_sets_fields_on_save(self):
+        """Test that saving a location stores the derived geometry fields"""
+        # Setup
+        location = Location.objects.create(id='1', name='Tract 1', location_type=self.location_type, geometry=square(0, 0, 2))
+
+        # Test
+        location.refresh_from_db()
+
+        # Assert
+        self.assertAlmostEqual(location.area, 4)
+        self.assertTrue(location.geometry.contains(location.point_on_surface))
+        self.assertTupleEqual(location.bbox.extent, (0, 0, 2, 2))
+
+    def test_updates_fields_with_update_fields(self):
+        """Test that saving only the geometry also saves the derived fields"""
+        # Setup
+        location = Location.objects.create(id='1', name='Tract 1', location_type=self.location_type, geometry=square(0, 0, 2))
+
+        # Test
+        location.geometry = square(10, 10, 1)
+        location.save(update_fields=["geometry"])
+        location.refresh_from_db()
+
+        # Assert
+        self.assertAlmostEqual(location.area, 1)
+        self.assertTupleEqual(location.bbox.extent, (10, 10, 11, 11))
+
+    def test_clears_fields_without_geometry(self):
+        """Test that a location without geometry has no derived fields"""
+        # Setup
+        location = Location.objects.create(id='1', name='Tract 1', location_type=self.location_type)
+
+        # Assert
+        self.assertIsNone(location.area)
+        self.assertIsNone(location.point_on_surface)
+        self.assertIsNone(location.bbox)
+
+    def test_sibling_box_does_not_need_geometry(self):
+        """Test that sibling_box works from the stored bounding box"""
+        # Setup
+        Location.objects.create(id='1', name='Tract 1', location_type=self.location_type, geometry=square(0, 0, 1))
+        location = Location.objects.defer("geometry").get(id='1')
+
+        # Test
+        with self.assertNumQueries(0):
+            box = location.sibling_box()
+
+        # Assert
+        self.assertTupleEqual(box.extent, (-3.5, -1, 2, 2.5))
+
+    def test_sibling_box_without_bbox(self):
+        """Test that sibling_box reads the geometry before the bbox is backfilled, and is None without either"""
+        # Setup
+        Location.objects.create(id='1', name='Tract 1', location_type=self.location_type, geometry=square(0, 0, 1))
+        Location.objects.create(id='2', name='Tract 2', location_type=self.location_type)
+        Location.objects.filter(id='1').update(bbox=None)
+
+        # Test
+        box = Location.objects.get(id='1').sibling_box()
+        no_box = Location.objects.get(id='2').sibling_box()
+
+        # Assert
+        self.assertTupleEqual(box.extent, (-3.5, -1, 2, 2.5))
+        self.assertIsNone(no_box)
+
+    def test_sets_fields_on_custom_location_save(self):
+        """Test that custom locations store the derived geometry fields too"""
+        # Setup
+        custom = CustomLocation.objects.create(
+            name='Custom', slug='custom', location_type=self.location_type, geometry=square(0, 0, 3)
+        )
+
+        # Assert
+        self.assertAlmostEqual(custom.area, 9)
@@ -0,0 +1,67 @@
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.test import TestCase, override_settings
+from django_d3_indicator_viz.models import (
+    GeometryTier,
+    Location,
+    LocationType,
+)
+
+
+def jagged(points):
+    # A 1x1 square whose bottom edge zigzags by 0.0005 between the given number of points
+    bottom = [(i / points, 0.0005 * (i % 2)) for i in range(points + 1)]
+    ring = [*bottom, (1, 1), (0, 1), bottom[0]]
+    return MultiPolygon(Polygon(ring), srid=4326)
+
+
+class LocationGeometryTierTests(TestCase):
+    """Tests for the simplified geometry tiers of locations"""
+
+    def setUp(self):
+        self.location_type = LocationType.objects.create(name='Tract')
+
+    def test_sets_tiers_on_save(self):
+        """Test that saving a location stores a simplified geometry per tier"""
+        # Setup
+        location = Location.objects.create(id='1', name='Tract 1', location_type=self.location_type, geometry=jagged(100))
+
+        # Test
+        location.refresh_from_db()
+
+        # Assert
+        overview = location.geometry_overview
+        neighborhood = location.geometry_neighborhood
+        self.assertEqual(overview.geom_type, 'MultiPolygon')
+        self.assertLess(overview.num_coords, neighborhood.num_coords)
+        self.assertLessEqual(neighborhood.num_coords, location.geometry.num_coords)
+
+    @override_settings(D3_INDICATOR_VIZ_GEOMETRY_TIER_TOLERANCES={'overview': 0, 'city': 0, 'neighborhood': 0})
+    def test_tolerances_come_from_settings(self):
+        """Test that the tier tolerances are read from settings"""
+        # Setup
+        location = Location.objects.create(id='1', name='Tract 1', location_type=self.location_type, geometry=jagged(10))
+
+        # Assert
+        self.assertEqual(location.geometry_overview.num_coords, location.geometry.num_coords)
+
+    def test_simplify_geometries_fills_tiers(self):
+        """Test that simplify_geometries() fills tiers for rows written without save()"""
+        # Setup
+        location = Location.objects.create(id='1', name='Tract 1', location_type=self.location_type, geometry=jagged(100))
+        Location.objects.update(geometry_overview=None, geometry_city=None, geometry_neighborhood=None)
+
+        # Test
+        Location.simplify_geometries()
+        location.refresh_from_db()
+
+        # Assert
+        for tier in GeometryTier:
+            self.assertIsNotNone(getattr(location, Location.geometry_field_for(tier)))
+
+    def test_clears_tiers_without_geometry(self):
+        """Test that a location without geometry has no tiers"""
+        # Setup
+        location = Location.objects.create(id='1', name='Tract 1', location_type=self.location_type)
+
+        # Assert
+        self.assertIsNone(location.geometry_city)
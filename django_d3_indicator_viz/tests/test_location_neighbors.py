@@ -0,0 +1,65 @@
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.test import TestCase
+from django_d3_indicator_viz.models import (
+    Location,
+    LocationNeighbor,
+    LocationType,
+)
+
+
+def square(xmin, ymin, size):
+    return MultiPolygon(Polygon.from_bbox((xmin, ymin, xmin + size, ymin + size)), srid=4326)
+
+
+class LocationNeighborTests(TestCase):
+    """Tests for the LocationNeighbor table behind Location.get_siblings()"""
+
+    def setUp(self):
+        tract_type = LocationType.objects.create(name='Tract')
+        county_type = LocationType.objects.create(name='County')
+
+        self.tract = Location.objects.create(id='1', name='Tract 1', location_type=tract_type, geometry=square(0, 0, 1))
+        # Shares an edge with the tract
+        self.touching = Location.objects.create(id='2', name='Tract 2', location_type=tract_type, geometry=square(1, 0, 1))
+        # Inside the viewport to the left, but not touching
+        self.in_viewport = Location.objects.create(id='3', name='Tract 3', location_type=tract_type, geometry=square(-3, 0, 1))
+        # Far away
+        self.far = Location.objects.create(id='4', name='Tract 4', location_type=tract_type, geometry=square(50, 50, 1))
+        # Touching, but a different location type
+        Location.objects.create(id='5', name='County 5', location_type=county_type, geometry=square(0, 1, 1))
+
+        LocationNeighbor.rebuild()
+
+    def test_adjacent_siblings(self):
+        """Test that adjacent siblings are only the touching ones of the same type"""
+        # Test
+        siblings = set(self.tract.get_siblings(adjacent=True))
+
+        # Assert
+        self.assertSetEqual(siblings, {self.touching})
+
+    def test_viewport_siblings(self):
+        """Test that viewport siblings follow Location.sibling_box"""
+        # Test
+        siblings = set(self.tract.get_siblings(nearby=True))
+
+        # Assert
+        self.assertSetEqual(siblings, {self.touching, self.in_viewport})
+
+    def test_touching_siblings_have_zero_distance(self):
+        """Test that touching siblings are stored with a zero distance"""
+        # Test
+        link = LocationNeighbor.objects.get(location=self.tract, neighbor=self.touching)
+
+        # Assert
+        self.assertEqual(link.distance, 0)
+
+    def test_refreshes_both_directions_when_geometry_changes(self):
+        """Test that moving a location updates its neighbors and its siblings' neighbors"""
+        # Test
+        self.far.geometry = square(0, -1, 1)
+        self.far.save()
+
+        # Assert
+        self.assertIn(self.far, set(self.tract.get_siblings(adjacent=True)))
+        self.assertIn(self.tract, set(self.far.get_siblings(adjacent=True)))
@@ -0,0 +1,93 @@
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.test import TestCase, override_settings
+from django_d3_indicator_viz.models import (
+    GeometryTier,
+    Location,
+    LocationType,
+)
+from django_d3_indicator_viz.tiles import (
+    TILE_CONTENT_TYPE,
+    get_tile,
+    tier_for_zoom,
+    tile_cache,
+    tile_version,
+)
+
+
+def square(xmin, ymin, size):
+    return MultiPolygon(Polygon.from_bbox((xmin, ymin, xmin + size, ymin + size)), srid=4326)
+
+
+@override_settings(
+    ROOT_URLCONF='django_d3_indicator_viz.urls',
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class LocationTileTests(TestCase):
+    """Tests for the location vector tile view and its cache"""
+
+    def setUp(self):
+        tile_cache().clear()
+        self.location_type = LocationType.objects.create(name='Tract')
+        self.location = Location.objects.create(
+            id='1', name='Tract 1', location_type=self.location_type, geometry=square(0.1, 0.1, 1)
+        )
+
+    def tile_url(self, z=0, x=0, y=0):
+        return f'/tiles/{self.location_type.id}/{z}/{x}/{y}.mvt'
+
+    def test_serves_tile(self):
+        """Test that the tile view returns a non-empty vector tile"""
+        # Test
+        response = self.client.get(self.tile_url())
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], TILE_CONTENT_TYPE)
+        self.assertGreater(len(response.content), 0)
+
+    def test_empty_tile_outside_locations(self):
+        """Test that a tile without locations is empty"""
+        # Test
+        response = self.client.get(self.tile_url(z=4, x=0, y=0))
+
+        # Assert
+        self.assertEqual(response.content, b'')
+
+    def test_rejects_tiles_out_of_range(self):
+        """Test that tile coordinates outside the zoom level are not found"""
+        # Test
+        response = self.client.get(self.tile_url(z=1, x=2, y=0))
+
+        # Assert
+        self.assertEqual(response.status_code, 404)
+
+    def test_serves_cached_tile(self):
+        """Test that a cached tile is served without querying the database"""
+        # Setup
+        tile = get_tile(self.location_type.id, 0, 0, 0)
+
+        # Test
+        with self.assertNumQueries(0):
+            cached = get_tile(self.location_type.id, 0, 0, 0)
+
+        # Assert
+        self.assertEqual(cached, tile)
+
+    def test_invalidates_when_location_changes(self):
+        """Test that saving a location invalidates its location type's tiles"""
+        # Setup
+        version = tile_version(self.location_type.id)
+
+        # Test
+        self.location.geometry = square(50, 50, 1)
+        self.location.save()
+
+        # Assert
+        self.assertGreater(tile_version(self.location_type.id), version)
+
+    def test_tier_follows_zoom(self):
+        """Test that low zoom levels use coarser geometry tiers"""
+        # Assert
+        self.assertEqual(tier_for_zoom(3), GeometryTier.OVERVIEW)
+        self.assertEqual(tier_for_zoom(10), GeometryTier.CITY)
+        self.assertEqual(tier_for_zoom(14), GeometryTier.NEIGHBORHOOD)
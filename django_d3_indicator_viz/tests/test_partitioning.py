@@ -0,0 +1,132 @@
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django_d3_indicator_viz.models import (
+    Category,
+    Indicator,
+    IndicatorSource,
+    IndicatorValue,
+    Location,
+    LocationType,
+    Section,
+    UNCATEGORIZED,
+)
+from django_d3_indicator_viz.partitioning import (
+    detach_years_before,
+    get_partition_key,
+    get_partitions,
+    list_partition_name,
+    partition_table,
+    year_partition_name,
+)
+
+
+class PartitioningTests(TestCase):
+    """Tests for partitioning indicator_value"""
+
+    def setUp(self):
+        loc_type = LocationType.objects.create(name='City')
+        self.location = Location.objects.create(id='1', name='Test City', location_type=loc_type)
+        self.section = Section.objects.create(name='Test Section')
+        category = Category.objects.create(name='Test Category', about='', section=self.section)
+        self.indicator = Indicator.objects.create(name='Population', category=category)
+        self.source = IndicatorSource.objects.create(name='Test Source')
+        self.value = self.create_value(2020)
+
+    def create_value(self, year):
+        return IndicatorValue.objects.create(
+            indicator=self.indicator, location=self.location, source=self.source,
+            value=year, start_date=f'{year}-01-01', end_date=f'{year}-12-31'
+        )
+
+    def partition_names(self):
+        return {name for name, _ in get_partitions(connection)}
+
+    def test_range_partitioning_keeps_rows(self):
+        """Test that partitioning by end date keeps rows and ORM access"""
+        # Test
+        partition_table('end_date', connection)
+        created = self.create_value(2021)
+
+        # Assert
+        self.assertEqual(get_partition_key(connection), 'end_date')
+        self.assertIn(year_partition_name(2020), self.partition_names())
+        self.assertSetEqual(
+            set(IndicatorValue.objects.values_list('id', flat=True)), {self.value.id, created.id}
+        )
+        self.assertGreater(created.id, self.value.id)
+
+    def test_keeps_unique_together(self):
+        """Test that duplicate values are still rejected after partitioning"""
+        # Setup
+        partition_table('end_date', connection)
+
+        # Test / Assert
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            IndicatorValue.objects.bulk_create([
+                IndicatorValue(
+                    indicator=self.indicator, location=self.location, source=self.source,
+                    value=1, start_date='2020-01-01', end_date='2020-12-31'
+                )
+            ])
+
+    def test_list_partitioning_by_section(self):
+        """Test that partitioning by section gives each section a partition"""
+        # Test
+        partition_table('section', connection)
+        other_section = Section.objects.create(name='Other Section')
+
+        # Assert
+        self.assertIn(list_partition_name('section', self.section.id), self.partition_names())
+        self.assertIn(list_partition_name('section', other_section.id), self.partition_names())
+        self.assertEqual(len(self.section.get_indicator_values([self.location])), 1)
+
+    def test_list_partitioning_keeps_primary_key(self):
+        """Test that list partitioning keeps a primary key on id and the key"""
+        # Test
+        partition_table('section', connection)
+
+        # Assert
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "select pg_get_constraintdef(oid) from pg_constraint "
+                "where conrelid = 'indicator_value'::regclass and contype = 'p'"
+            )
+            self.assertEqual(cursor.fetchone()[0], 'PRIMARY KEY (id, section_id)')
+
+    def test_list_partitioning_keeps_header_values(self):
+        """Test that values of uncategorized indicators go to the default partition"""
+        # Setup
+        header_indicator = Indicator.objects.create(name='Median income')
+        existing = IndicatorValue.objects.create(
+            indicator=header_indicator, location=self.location, source=self.source,
+            value=1, start_date='2020-01-01', end_date='2020-12-31'
+        )
+        # Stamped before UNCATEGORIZED existed
+        IndicatorValue.objects.filter(id=existing.id).update(category_id=None, section_id=None)
+
+        # Test
+        partition_table('section', connection)
+        created = IndicatorValue.objects.create(
+            indicator=header_indicator, location=self.location, source=self.source,
+            value=2, start_date='2021-01-01', end_date='2021-12-31'
+        )
+
+        # Assert
+        self.assertEqual(get_partition_key(connection), 'section')
+        self.assertEqual(created.section_id, UNCATEGORIZED)
+        with connection.cursor() as cursor:
+            cursor.execute('select id from indicator_value_default order by id')
+            self.assertListEqual([id for id, in cursor.fetchall()], [existing.id, created.id])
+
+    def test_detaches_old_vintages(self):
+        """Test that detaching a year removes its values from indicator_value"""
+        # Setup
+        partition_table('end_date', connection)
+        kept = self.create_value(2021)
+
+        # Test
+        detached = detach_years_before(2021, connection, concurrently=False)
+
+        # Assert
+        self.assertIn(year_partition_name(2020), detached)
+        self.assertListEqual(list(IndicatorValue.objects.values_list('id', flat=True)), [kept.id])
@@ -0,0 +1,147 @@
+import datetime
+import decimal
+import json
+from unittest import skipUnless
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django_d3_indicator_viz.models import LocationType
+from django_d3_indicator_viz.payloads import (
+    decode_columnar,
+    dumps,
+    encode_columnar,
+    encode_indicator_values,
+    orjson,
+    orjson_dumps,
+    stdlib_dumps,
+)
+
+
+class ColumnarPayloadTests(SimpleTestCase):
+    """Tests for the columnar encoding of section indicator values"""
+
+    # Payloads are decoded with the Python decode_columnar; decodeIndicatorValues
+    # in chart-connector.js is not tested here
+
+    def setUp(self):
+        self.rows = [
+            {
+                'id': 1,
+                'indicator_id': 1,
+                'location_id': '26163',
+                'filter_option_id': None,
+                'start_date': '2022-01-01',
+                'end_date': '2022-12-31',
+                'value': 1.5,
+            },
+            {
+                'id': 2,
+                'indicator_id': 1,
+                'location_id': '26',
+                'filter_option_id': 3,
+                'start_date': '2023-01-01',
+                'end_date': '2023-12-31',
+                'value': None,
+            },
+            {
+                'id': 3,
+                'indicator_id': 2,
+                'location_id': '26163',
+                'filter_option_id': None,
+                'start_date': '2022-01-01',
+                'end_date': '2022-12-31',
+                'value': 2.5,
+            },
+        ]
+
+    def test_round_trip(self):
+        """Test that decoding a columnar payload gives back the rows"""
+        # Test
+        payload = encode_columnar(self.rows)
+
+        # Assert
+        self.assertEqual(payload['encoding'], 'columnar')
+        self.assertEqual(payload['length'], 3)
+        self.assertEqual(decode_columnar(payload), self.rows)
+
+    def test_repeated_values_use_lookups(self):
+        """Test that location ids and dates are stored once, as lookup indexes"""
+        # Test
+        payload = encode_columnar(self.rows)
+
+        # Assert
+        self.assertEqual(payload['lookups']['location_id'], ['26163', '26'])
+        self.assertEqual(payload['columns']['location_id'], [0, 1, 0])
+        self.assertEqual(payload['lookups']['end_date'], ['2022-12-31', '2023-12-31'])
+        self.assertEqual(payload['columns']['end_date'], [0, 1, 0])
+        self.assertEqual(payload['columns']['value'], [1.5, None, 2.5])
+
+    def test_empty(self):
+        """Test that no rows encode to an empty payload"""
+        # Test
+        payload = encode_columnar([])
+
+        # Assert
+        self.assertEqual(payload['length'], 0)
+        self.assertEqual(decode_columnar(payload), [])
+
+    def test_rows_by_default(self):
+        """Test that indicator values stay a list of dicts unless columnar payloads are on"""
+        # Assert
+        self.assertIs(encode_indicator_values(self.rows), self.rows)
+        with override_settings(D3_INDICATOR_VIZ_COLUMNAR_PAYLOADS=True):
+            self.assertEqual(encode_indicator_values(self.rows)['encoding'], 'columnar')
+
+
+def upper_dumps(value):
+    """A custom encoder for the JSON_DUMPS setting"""
+    return json.dumps(value).upper()
+
+
+class DumpsTests(TestCase):
+    """Tests for the pluggable JSON encoder of profile and section payloads"""
+
+    def setUp(self):
+        self.payload = {
+            'end_date': datetime.date(2023, 12, 31),
+            'updated': datetime.datetime(2024, 1, 2, 3, 4, 5),
+            'value': decimal.Decimal('12.50'),
+            'values': [1, None, 2.5],
+        }
+
+    def test_stdlib_encodes_dates_and_decimals(self):
+        """Test that dates are ISO 8601 and Decimals strings with the standard library"""
+        # Test
+        result = json.loads(stdlib_dumps(self.payload))
+
+        # Assert
+        self.assertEqual(result['end_date'], '2023-12-31')
+        self.assertEqual(result['updated'], '2024-01-02T03:04:05')
+        self.assertEqual(result['value'], '12.50')
+        self.assertEqual(result['values'], [1, None, 2.5])
+
+    @skipUnless(orjson, 'orjson is not installed')
+    def test_orjson_matches_stdlib(self):
+        """Test that orjson and the standard library encode the same payload"""
+        # Assert
+        self.assertEqual(json.loads(orjson_dumps(self.payload)), json.loads(stdlib_dumps(self.payload)))
+
+    def test_querysets_encode_as_lists(self):
+        """Test that querysets are encoded as lists of their rows"""
+        # Setup
+        LocationType.objects.create(name='County', sort_order=1)
+        LocationType.objects.create(name='Tract', sort_order=2)
+
+        # Test
+        result = json.loads(dumps(LocationType.objects.order_by('sort_order').values('name')))
+
+        # Assert
+        self.assertEqual(result, [{'name': 'County'}, {'name': 'Tract'}])
+
+    def test_encoder_setting(self):
+        """Test that the JSON_DUMPS setting replaces the encoder"""
+        # Test
+        with override_settings(D3_INDICATOR_VIZ_JSON_DUMPS='django_d3_indicator_viz.tests.test_payloads.upper_dumps'):
+            result = dumps({'name': 'county'})
+
+        # Assert
+        self.assertEqual(result, '{"NAME": "COUNTY"}')
@@ -0,0 +1,228 @@
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django_d3_indicator_viz.db_routers import ReadReplicaRouter, use_read_replica
+from django_d3_indicator_viz.models import Category, ColorScale, Location, LocationType, Section
+from django_d3_indicator_viz.profile_cache import (
+    bump_data_version,
+    data_version,
+    get_or_build,
+    get_or_render_section,
+    profile_cache,
+    profile_cache_key,
+    section_cache_key,
+    section_cache_stats,
+)
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    D3_INDICATOR_VIZ_PROFILE_CACHE='default',
+)
+class ProfileCacheTests(TestCase):
+    """Tests for the profile context cache and its data version"""
+
+    def setUp(self):
+        profile_cache().clear()
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return {'builds': self.builds}
+
+    def test_caches_contexts(self):
+        """Test that a context is built once and then read from the cache"""
+        # Test
+        first = get_or_build(('context', '1'), self.build)
+        second = get_or_build(('context', '1'), self.build)
+
+        # Assert
+        self.assertEqual(first, {'builds': 1})
+        self.assertEqual(second, {'builds': 1})
+        self.assertEqual(self.builds, 1)
+
+    def test_force_rebuilds(self):
+        """Test that forcing a build replaces the cached context"""
+        # Setup
+        get_or_build(('context', '1'), self.build)
+
+        # Test
+        get_or_build(('context', '1'), self.build, force=True)
+
+        # Assert
+        self.assertEqual(get_or_build(('context', '1'), self.build), {'builds': 2})
+
+    def test_missing_locations_are_not_cached(self):
+        """Test that a context of None is built again on the next request"""
+        # Test
+        get_or_build(('context', '1'), lambda: None)
+
+        # Assert
+        self.assertEqual(get_or_build(('context', '1'), self.build), {'builds': 1})
+
+    def test_bump_invalidates(self):
+        """Test that bumping the data version rebuilds every context"""
+        # Setup
+        get_or_build(('context', '1'), self.build)
+        version = data_version()
+
+        # Test
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_data_version()
+
+        # Assert
+        self.assertEqual(data_version(), version + 1)
+        self.assertEqual(get_or_build(('context', '1'), self.build), {'builds': 2})
+
+    def test_location_save_bumps_version(self):
+        """Test that saving a location invalidates the cached profiles"""
+        # Setup
+        version = data_version()
+        location_type = LocationType.objects.create(name='Tract')
+
+        # Test
+        with self.captureOnCommitCallbacks(execute=True):
+            Location.objects.create(
+                id='1',
+                name='Tract 1',
+                location_type=location_type,
+                geometry=MultiPolygon(Polygon.from_bbox((0, 0, 1, 1)), srid=4326),
+            )
+
+        # Assert
+        self.assertGreater(data_version(), version)
+
+    def test_lookup_edits_bump_version(self):
+        """Test that editing the lookups serialized into profiles invalidates them"""
+        # Setup
+        color_scale = ColorScale.objects.create(name='Blues', colors=['#fff', '#00f'])
+        version = data_version()
+
+        # Test
+        color_scale.colors = ['#fff', '#008']
+        with self.captureOnCommitCallbacks(execute=True):
+            color_scale.save()
+
+        # Assert
+        self.assertGreater(data_version(), version)
+
+    def test_bump_waits_for_commit(self):
+        """Test that a save inside a transaction leaves the version alone until it commits"""
+        # Setup
+        color_scale = ColorScale.objects.create(name='Blues', colors=['#fff', '#00f'])
+        version = data_version()
+
+        # Test
+        with self.captureOnCommitCallbacks() as callbacks, transaction.atomic():
+            color_scale.save()
+            version_before_commit = data_version()
+        for callback in callbacks:
+            callback()
+
+        # Assert
+        self.assertEqual(version_before_commit, version)
+        self.assertGreater(data_version(), version)
+
+    @override_settings(D3_INDICATOR_VIZ_READ_REPLICA='replica')
+    def test_misses_read_from_primary(self):
+        """Test that misses are built from the primary inside a replica block"""
+        # Setup
+        router = ReadReplicaRouter()
+
+        # Test
+        with use_read_replica():
+            replica_alias = router.db_for_read(Location)
+            context = get_or_build(('context', '1'), lambda: {'alias': router.db_for_read(Location)})
+
+        # Assert
+        self.assertEqual(replica_alias, 'replica')
+        self.assertEqual(context, {'alias': None})
+
+    @override_settings(D3_INDICATOR_VIZ_PROFILE_CACHE=None)
+    def test_off_by_default(self):
+        """Test that contexts are always built when the cache is off"""
+        # Test
+        get_or_build(('context', '1'), self.build)
+        get_or_build(('context', '1'), self.build)
+
+        # Assert
+        self.assertEqual(self.builds, 2)
+        self.assertIsNone(data_version())
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    D3_INDICATOR_VIZ_PROFILE_CACHE='default',
+)
+class SectionCacheTests(TestCase):
+    """Tests for the section fragment cache"""
+
+    def setUp(self):
+        profile_cache().clear()
+        self.demographics = Section.objects.create(name='Demographics', sort_order=1)
+        self.economy = Section.objects.create(name='Economy', sort_order=2)
+        self.renders = []
+
+    def render(self, section):
+        def render_html():
+            self.renders.append(section.id)
+            return f'<section>{section.name} {len(self.renders)}</section>'
+        return get_or_render_section(section.id, '1', '2,3', render_html)
+
+    def test_caches_sections(self):
+        """Test that a section is rendered once per location and parents"""
+        # Test
+        first = self.render(self.demographics)
+        second = self.render(self.demographics)
+        other_parents = get_or_render_section(self.demographics.id, '1', '2', lambda: 'other')
+
+        # Assert
+        self.assertEqual(first, second)
+        self.assertEqual(other_parents, 'other')
+        self.assertEqual(section_cache_stats(), {'hits': 1, 'misses': 2})
+
+    def test_section_edit_only_invalidates_that_section(self):
+        """Test that editing a section's categories only renders that section again"""
+        # Setup
+        self.render(self.demographics)
+        self.render(self.economy)
+
+        # Test
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.create(name='Income', section=self.economy, sort_order=1)
+        self.render(self.demographics)
+        self.render(self.economy)
+
+        # Assert
+        self.assertEqual(self.renders, [self.demographics.id, self.economy.id, self.economy.id])
+
+    def test_data_version_invalidates_every_section(self):
+        """Test that a data load renders every section again"""
+        # Setup
+        self.render(self.demographics)
+        self.render(self.economy)
+
+        # Test
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_data_version()
+        self.render(self.demographics)
+        self.render(self.economy)
+
+        # Assert
+        self.assertEqual(len(self.renders), 4)
+
+    def test_keys_are_memcached_safe(self):
+        """Test that client-supplied location ids can't make an invalid memcached key"""
+        # Setup
+        location_id = '1 ' + 'x' * 300
+
+        # Test
+        keys = [
+            section_cache_key(self.demographics.id, location_id, '2,\n3'),
+            profile_cache_key('page', location_id),
+        ]
+
+        # Assert
+        for key in keys:
+            self.assertLessEqual(len(key), 250)
+            self.assertNotRegex(key, r'[\s\x00-\x1f\x7f]')
@@ -0,0 +1,121 @@
+from django.test import TestCase
+from django_d3_indicator_viz.models import (
+    Section,
+    Category,
+    Indicator,
+    IndicatorDataVisual,
+    IndicatorDataVisualSource,
+    IndicatorValue,
+    Location,
+    LocationType,
+    IndicatorSource,
+    ResolvedIndicatorValue,
+)
+
+
+class ResolvedIndicatorValueTests(TestCase):
+    """Tests for the ResolvedIndicatorValue derived table behind Section.get_indicator_values()"""
+
+    def setUp(self):
+        loc_type = LocationType.objects.create(name='City')
+        self.location = Location.objects.create(id='1', name='Test City', location_type=loc_type)
+
+        self.section = Section.objects.create(name='Test Section')
+        category = Category.objects.create(name='Test Category', about='', section=self.section)
+        self.primary = IndicatorSource.objects.create(name='Primary Source')
+        self.fallback = IndicatorSource.objects.create(name='Fallback Source')
+
+        self.column_indicator = Indicator.objects.create(name='Population', category=category)
+        self.column_visual = IndicatorDataVisual.objects.create(
+            indicator=self.column_indicator,
+            data_visual_type='column',
+            start_date='2023-01-01',
+            end_date='2023-12-31',
+        )
+        IndicatorDataVisualSource.objects.create(data_visual=self.column_visual, source=self.primary, priority=0)
+        IndicatorDataVisualSource.objects.create(data_visual=self.column_visual, source=self.fallback, priority=1)
+
+        self.line_indicator = Indicator.objects.create(name='Population over time', category=category)
+        line_visual = IndicatorDataVisual.objects.create(
+            indicator=self.line_indicator,
+            data_visual_type='line',
+            start_date='2021-01-01',
+            end_date='2023-12-31',
+        )
+        IndicatorDataVisualSource.objects.create(data_visual=line_visual, source=self.primary, priority=0)
+
+    def create_value(self, indicator, source, year, value):
+        return IndicatorValue.objects.create(
+            indicator=indicator, location=self.location, source=source,
+            value=value, start_date=f'{year}-01-01', end_date=f'{year}-12-31'
+        )
+
+    def test_keeps_priority_winner_on_save(self):
+        """Test that saving values keeps only the priority-winning value"""
+        # Setup
+        self.create_value(self.column_indicator, self.fallback, 2023, 1)
+        winner = self.create_value(self.column_indicator, self.primary, 2023, 2)
+
+        # Test
+        values = self.section.get_indicator_values([self.location])
+
+        # Assert
+        self.assertListEqual([v['id'] for v in values], [winner.id])
+
+    def test_falls_back_when_winner_deleted(self):
+        """Test that deleting the winning value promotes the fallback source"""
+        # Setup
+        fallback = self.create_value(self.column_indicator, self.fallback, 2023, 1)
+        winner = self.create_value(self.column_indicator, self.primary, 2023, 2)
+
+        # Test
+        winner.delete()
+        values = self.section.get_indicator_values([self.location])
+
+        # Assert
+        self.assertListEqual([v['id'] for v in values], [fallback.id])
+
+    def test_keeps_full_history_for_line_visuals(self):
+        """Test that line visuals keep every value"""
+        # Setup
+        for year in (2021, 2022, 2023):
+            self.create_value(self.line_indicator, self.primary, year, year)
+
+        # Test
+        values = self.section.get_indicator_values([self.location])
+
+        # Assert
+        self.assertEqual(len(values), 3)
+
+    def test_refreshes_when_source_priority_changes(self):
+        """Test that changing data visual source priority re-resolves the winner"""
+        # Setup
+        fallback = self.create_value(self.column_indicator, self.fallback, 2023, 1)
+        self.create_value(self.column_indicator, self.primary, 2023, 2)
+
+        # Test
+        IndicatorDataVisualSource.objects.filter(
+            data_visual=self.column_visual, source=self.primary
+        ).get().delete()
+        values = self.section.get_indicator_values([self.location])
+
+        # Assert
+        self.assertListEqual([v['id'] for v in values], [fallback.id])
+
+    def test_rebuild_restores_table_after_bulk_load(self):
+        """Test that a full refresh picks up values loaded without signals"""
+        # Setup
+        IndicatorValue.objects.bulk_create([
+            IndicatorValue(
+                indicator=self.column_indicator, location=self.location, source=self.primary,
+                value=5, start_date='2023-01-01', end_date='2023-12-31'
+            )
+        ])
+        self.assertListEqual(self.section.get_indicator_values([self.location]), [])
+
+        # Test
+        IndicatorValue.restamp()
+        ResolvedIndicatorValue.refresh()
+
+        # Assert
+        self.assertEqual(len(self.section.get_indicator_values([self.location])), 1)
@@ -0,0 +1,144 @@
+import tablib
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django_d3_indicator_viz.models import (
+    Category,
+    Indicator,
+    IndicatorLatestVintage,
+    IndicatorSource,
+    IndicatorValue,
+    Location,
+    LocationType,
+    Section,
+)
+from django_d3_indicator_viz.resources import IndicatorValueResource, finish_import_progress, get_import_progress
+
+
+HEADERS = ['indicator', 'location', 'source', 'filter_option', 'start_date', 'end_date', 'value']
+
+
+class IndicatorValueResourceTests(TestCase):
+    """Tests for the high-volume indicator value import"""
+
+    def setUp(self):
+        cache.clear()
+        loc_type = LocationType.objects.create(name='Tract')
+        self.location = Location.objects.create(id='26163000100', name='Tract 1', location_type=loc_type)
+        self.section = Section.objects.create(name='Demographics', sort_order=1)
+        self.category = Category.objects.create(name='Population', section=self.section, sort_order=1)
+        self.indicator = Indicator.objects.create(name='Total population', category=self.category)
+        self.source = IndicatorSource.objects.create(name='ACS 5-year')
+        self.user = get_user_model().objects.create(username='importer')
+
+    def dataset(self, *rows):
+        return tablib.Dataset(*rows, headers=HEADERS)
+
+    def row(self, year=2023, value=100, location=None):
+        return (
+            self.indicator.id,
+            location or self.location.id,
+            self.source.id,
+            '',
+            f'{year - 4}-01-01',
+            f'{year}-12-31',
+            value,
+        )
+
+    def test_imports_and_stamps(self):
+        """Test that imported values are created with their category and section"""
+        # Test
+        result = IndicatorValueResource().import_data(self.dataset(self.row(2022), self.row(2023)))
+
+        # Assert
+        self.assertFalse(result.has_errors())
+        self.assertEqual(IndicatorValue.objects.count(), 2)
+        value = IndicatorValue.objects.get(end_date='2023-12-31')
+        self.assertEqual(value.category_id, self.category.id)
+        self.assertEqual(value.section_id, self.section.id)
+        self.assertTrue(IndicatorLatestVintage.objects.filter(indicator=self.indicator).exists())
+
+    def test_updates_by_key(self):
+        """Test that rows without an id update the value with the same key"""
+        # Setup
+        IndicatorValueResource().import_data(self.dataset(self.row(value=100)))
+
+        # Test
+        result = IndicatorValueResource().import_data(self.dataset(self.row(value=250)))
+
+        # Assert
+        self.assertFalse(result.has_errors())
+        self.assertEqual(IndicatorValue.objects.get().value, 250)
+
+    def test_unknown_location(self):
+        """Test that a row with an unknown location is reported as a row error"""
+        # Test
+        result = IndicatorValueResource().import_data(self.dataset(self.row(location='99999')))
+
+        # Assert
+        self.assertTrue(result.has_validation_errors() or result.has_errors())
+        self.assertFalse(IndicatorValue.objects.exists())
+
+    def test_dry_run(self):
+        """Test that a dry run doesn't create values"""
+        # Test
+        result = IndicatorValueResource().import_data(self.dataset(self.row()), dry_run=True)
+
+        # Assert
+        self.assertFalse(result.has_errors())
+        self.assertFalse(IndicatorValue.objects.exists())
+
+    def test_progress(self):
+        """Test that the progress of a user's import is recorded"""
+        # Test
+        IndicatorValueResource().import_data(self.dataset(self.row(2022), self.row(2023)), user=self.user)
+
+        # Assert
+        self.assertEqual(
+            get_import_progress(self.user.pk), {'processed': 2, 'total': 2, 'dry_run': False, 'done': False}
+        )
+
+    def test_finish_progress(self):
+        """Test that finishing an import records its outcome"""
+        # Setup
+        IndicatorValueResource().import_data(self.dataset(self.row()), user=self.user)
+
+        # Test
+        finish_import_progress(self.user.pk, totals={'new': 1, 'update': 0})
+
+        # Assert
+        progress = get_import_progress(self.user.pk)
+        self.assertTrue(progress['done'])
+        self.assertEqual(progress['totals'], {'new': 1, 'update': 0})
+        self.assertEqual(progress['processed'], 1)
+
+    @override_settings(D3_INDICATOR_VIZ_IMPORT_BATCH_SIZE=1)
+    def test_batch_size_setting(self):
+        """Test that the batch size is read when the resource is created, without changing Meta"""
+        # Test
+        resource = IndicatorValueResource()
+        result = resource.import_data(self.dataset(self.row(2022), self.row(2023)))
+
+        # Assert
+        self.assertEqual(resource._meta.batch_size, 1)
+        self.assertIsNot(resource._meta, IndicatorValueResource._meta)
+        self.assertFalse(result.has_errors())
+        self.assertEqual(IndicatorValue.objects.count(), 2)
+
+    @override_settings(
+        CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+            'imports': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        },
+        D3_INDICATOR_VIZ_IMPORT_PROGRESS_CACHE='imports',
+    )
+    def test_progress_cache_setting(self):
+        """Test that progress is recorded in the configured cache"""
+        # Test
+        IndicatorValueResource().import_data(self.dataset(self.row()), user=self.user)
+
+        # Assert
+        self.assertEqual(
+            get_import_progress(self.user.pk), {'processed': 1, 'total': 1, 'dry_run': False, 'done': False}
+        )
@@ -0,0 +1,126 @@
+from django.test import TestCase
+from django_d3_indicator_viz.models import (
+    Section,
+    Category,
+    Indicator,
+    IndicatorDataVisual,
+    IndicatorDataVisualSource,
+    IndicatorValue,
+    Location,
+    LocationType,
+    IndicatorSource,
+)
+from django_d3_indicator_viz.views import roll_section
+
+
+class SectionVisualMetadataTests(TestCase):
+    """Tests for Section.get_visual_metadata() - batched visual metadata resolution"""
+
+    def setUp(self):
+        loc_type = LocationType.objects.create(name='City')
+        self.location = Location.objects.create(id='1', name='Test City', location_type=loc_type)
+
+        self.section = Section.objects.create(name='Test Section')
+        self.primary = IndicatorSource.objects.create(name='Primary Source')
+        self.fallback = IndicatorSource.objects.create(name='Fallback Source')
+
+        self.indicators = []
+        for category_index in range(2):
+            category = Category.objects.create(
+                name=f'Category {category_index}', about='', section=self.section
+            )
+            for indicator_index, visual_type in enumerate(['column', 'ban', 'line']):
+                indicator = Indicator.objects.create(
+                    name=f'Indicator {category_index}-{indicator_index}',
+                    category=category,
+                    indicator_type='count',
+                )
+                visual = IndicatorDataVisual.objects.create(
+                    indicator=indicator,
+                    data_visual_type=visual_type,
+                    start_date='2023-01-01',
+                    end_date='2023-12-31',
+                    columns=6,
+                )
+                IndicatorDataVisualSource.objects.create(data_visual=visual, source=self.primary, priority=0)
+                IndicatorDataVisualSource.objects.create(data_visual=visual, source=self.fallback, priority=1)
+                for year in (2021, 2022, 2023):
+                    for source in (self.primary, self.fallback):
+                        IndicatorValue.objects.create(
+                            indicator=indicator, location=self.location, source=source,
+                            value=year, start_date=f'{year}-01-01', end_date=f'{year}-12-31'
+                        )
+                self.indicators.append(indicator)
+
+    def test_resolves_every_indicator_in_section(self):
+        """Test that every indicator with a data visual gets metadata"""
+        # Test
+        metadata = self.section.get_visual_metadata(self.location)
+
+        # Assert
+        self.assertSetEqual(set(metadata), {indicator.id for indicator in self.indicators})
+
+    def test_prefers_priority_source_and_latest_start_date(self):
+        """Test that the winning value follows source priority, then start date"""
+        # Test
+        metadata = self.section.get_visual_metadata(self.location)
+
+        # Assert
+        column_indicator = self.indicators[0]
+        meta = metadata[column_indicator.id]
+        self.assertEqual(meta.source_id, self.primary.id)
+        self.assertEqual(meta.start_date.year, 2023)
+        self.assertEqual(meta.data_visual_type, 'column')
+        self.assertEqual(meta.columns, 6)
+
+    def test_matches_per_indicator_metadata_for_single_value_visuals(self):
+        """Test that non-line visuals resolve to the same value as Indicator.get_visual_metadata"""
+        # Test
+        metadata = self.section.get_visual_metadata(self.location)
+
+        # Assert
+        for indicator in self.indicators:
+            if metadata[indicator.id].data_visual_type == 'line':
+                continue
+            expected = indicator.get_visual_metadata(self.location)
+            self.assertEqual(metadata[indicator.id].id, expected.id)
+
+    def test_line_visuals_span_full_date_range(self):
+        """Test that line visuals cover the full date range of the winning source"""
+        # Test
+        metadata = self.section.get_visual_metadata(self.location)
+
+        # Assert
+        line_indicator = self.indicators[2]
+        meta = metadata[line_indicator.id]
+        self.assertEqual(meta.start_date.isoformat(), '2021-01-01')
+        self.assertEqual(meta.end_date.isoformat(), '2023-12-31')
+
+    def test_skips_indicators_without_data_visual(self):
+        """Test that indicators without a data visual are left out"""
+        # Setup
+        category = self.section.category_set.first()
+        orphan = Indicator.objects.create(name='No Visual', category=category)
+
+        # Test
+        metadata = self.section.get_visual_metadata(self.location)
+
+        # Assert
+        self.assertNotIn(orphan.id, metadata)
+
+    def test_query_count_is_constant(self):
+        """Test that resolving metadata does not scale with the number of indicators"""
+        # Test / Assert - data visuals, winning values, line chart date ranges
+        with self.assertNumQueries(3):
+            self.section.get_visual_metadata(self.location)
+
+    def test_roll_section_query_count_is_constant(self):
+        """Test that rolling a section does not issue per-indicator queries"""
+        # Test / Assert - visual metadata (3), categories, prefetched indicators, indicator values
+        with self.assertNumQueries(6):
+            rolled = roll_section(self.section, self.location, [])
+
+        self.assertEqual(
+            sum(len(category['indicators']) for category in rolled['categories']),
+            len(self.indicators),
+        )
@@ -0,0 +1,92 @@
+import os
+import tempfile
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django_d3_indicator_viz.models import Category, Location, LocationType, Section
+from django_d3_indicator_viz.static_export import (
+    COMPLETE_MARKER,
+    export_location,
+    location_directory,
+    rewrite_section_urls,
+)
+
+
+@override_settings(ROOT_URLCONF='django_d3_indicator_viz.urls')
+class StaticExportTests(SimpleTestCase):
+    """Tests for the static-site export of profiles"""
+
+    page = (
+        '<header class="section-contents" '
+        'hx-get="/sections/next/?after=3&amp;primary_loc_id=26163&amp;parent_loc_ids=26" '
+        'hx-trigger="intersect once">'
+    )
+
+    def test_rewrites_section_urls_relative(self):
+        """Test that next_section URLs point at the section files next to the profile"""
+        # Test
+        result = rewrite_section_urls(self.page, '26163')
+
+        # Assert
+        self.assertIn('hx-get="sections/after-3.html"', result)
+        self.assertIn('hx-trigger="intersect once"', result)
+
+    def test_rewrites_section_urls_with_base_url(self):
+        """Test that next_section URLs are absolute under a base URL"""
+        # Test
+        result = rewrite_section_urls(self.page, '26163', '/static-profiles/')
+
+        # Assert
+        self.assertIn('hx-get="/static-profiles/26163/sections/after-3.html"', result)
+
+    def test_skips_complete_locations(self):
+        """Test that a location marked complete is not exported again"""
+        # Setup
+        with tempfile.TemporaryDirectory() as root:
+            directory = location_directory(root, '26163')
+            os.makedirs(directory)
+            open(os.path.join(directory, COMPLETE_MARKER), 'w').close()
+
+            # Test
+            result = export_location(root, '26163', 'profile.html')
+
+            # Assert
+            self.assertFalse(result)
+            self.assertEqual(os.listdir(directory), [COMPLETE_MARKER])
+
+
+@override_settings(ROOT_URLCONF='django_d3_indicator_viz.urls')
+class ExportLocationTests(TestCase):
+    """Tests for exporting a location's profile and sections"""
+
+    def setUp(self):
+        loc_type = LocationType.objects.create(name='City')
+        Location.objects.create(id='26163', name='Test City', location_type=loc_type)
+        for sort_order in (1, 2):
+            section = Section.objects.create(name=f'Section {sort_order}', sort_order=sort_order)
+            Category.objects.create(name=f'Category {sort_order}', about='', section=section)
+
+    def test_writes_profile_and_sections(self):
+        """Test that a location's page, section files and marker are written"""
+        # Setup
+        with tempfile.TemporaryDirectory() as root:
+            directory = location_directory(root, '26163')
+
+            # Test
+            result = export_location(root, '26163', 'django_d3_indicator_viz/profile.html')
+
+            # Assert
+            self.assertTrue(result)
+            self.assertSetEqual(set(os.listdir(directory)), {'index.html', 'sections', COMPLETE_MARKER})
+            self.assertSetEqual(
+                set(os.listdir(os.path.join(directory, 'sections'))), {'after-1.html', 'after-2.html'}
+            )
+            with open(os.path.join(directory, 'index.html'), encoding='utf-8') as f:
+                page = f.read()
+            self.assertIn('Section 1', page)
+            self.assertIn('hx-get="sections/after-1.html"', page)
+            with open(os.path.join(directory, 'sections', 'after-1.html'), encoding='utf-8') as f:
+                section = f.read()
+            self.assertIn('Section 2', section)
+            self.assertIn('hx-get="sections/after-2.html"', section)
+            with open(os.path.join(directory, 'sections', 'after-2.html'), encoding='utf-8') as f:
+                self.assertEqual(f.read(), '')
@@ -0,0 +1,117 @@
+"""
+Mapbox Vector Tiles of Location geometries, one layer per location type.
+
+Tiles are built with ST_AsMVT from the simplified geometry tier that fits the
+zoom level and cached in the Django cache. Every cache key carries a version
+per location type, so invalidating a type is a single counter increment and
+stale tiles simply expire.
+"""
+from django.core.cache import caches
+from django.db import connection
+
+from .conf import get_setting
+from .models import GeometryTier, Location, LocationType
+
+
+TILE_CONTENT_TYPE = "application/vnd.mapbox-vector-tile"
+
+# The name of the layer inside every tile
+TILE_LAYER = "locations"
+
+# The highest zoom level served by each tier, coarsest first. Deeper zoom
+# levels use the finest tier.
+TILE_TIER_MAX_ZOOM = (
+    (GeometryTier.OVERVIEW, 8),
+    (GeometryTier.CITY, 11),
+)
+
+TILE_SQL = """
+    with bounds as (
+        select st_tileenvelope(%(z)s, %(x)s, %(y)s) as geom
+    ),
+    features as (
+        select
+            l.id,
+            l.name,
+            l.location_type_id,
+            st_asmvtgeom(
+                st_transform(l.{field}, 3857), bounds.geom, %(extent)s, %(buffer)s, true
+            ) as geom
+        from location l, bounds
+        where l.location_type_id = %(location_type_id)s
+            and l.{field} && st_transform(bounds.geom, st_srid(l.{field}))
+    )
+    select st_asmvt(features.*, %(layer)s, %(extent)s, 'geom')
+    from features
+    where geom is not null
+"""
+
+
+def tile_cache():
+    return caches[get_setting("TILE_CACHE", "default")]
+
+
+def tier_for_zoom(z):
+    """
+    The GeometryTier served at a zoom level.
+    """
+    for tier, max_zoom in TILE_TIER_MAX_ZOOM:
+        if z <= max_zoom:
+            return tier
+    return GeometryTier.NEIGHBORHOOD
+
+
+def tile_version(location_type_id):
+    return tile_cache().get_or_set(f"d3iv:tiles:{location_type_id}:version", 1, timeout=None)
+
+
+def invalidate_tiles(location_type_ids=None):
+    """
+    Drops the cached tiles of the given location types, or of every location
+    type when none are given.
+    """
+    if location_type_ids is None:
+        location_type_ids = LocationType.objects.values_list("id", flat=True)
+
+    cache = tile_cache()
+    for location_type_id in set(location_type_ids):
+        key = f"d3iv:tiles:{location_type_id}:version"
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Not cached yet (or evicted), so no tiles can be keyed on it
+            cache.set(key, 2, timeout=None)
+
+
+def build_tile(location_type_id, z, x, y):
+    """
+    Renders a single tile from the database.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            TILE_SQL.format(field=Location.geometry_field_for(tier_for_zoom(z))),
+            {
+                "location_type_id": location_type_id,
+                "z": z,
+                "x": x,
+                "y": y,
+                "layer": TILE_LAYER,
+                "extent": get_setting("TILE_EXTENT", 4096),
+                "buffer": get_setting("TILE_BUFFER", 64),
+            },
+        )
+        tile = cursor.fetchone()[0]
+    return bytes(tile) if tile is not None else b""
+
+
+def get_tile(location_type_id, z, x, y):
+    """
+    Returns a tile from the cache, building and caching it on a miss.
+    """
+    cache = tile_cache()
+    key = f"d3iv:tiles:{location_type_id}:{tile_version(location_type_id)}:{z}:{x}:{y}"
+    tile = cache.get(key)
+    if tile is None:
+        tile = build_tile(location_type_id, z, x, y)
+        cache.set(key, tile, timeout=get_setting("TILE_CACHE_TIMEOUT", 60 * 60 * 24))
+    return tile
@@ -15,10 +15,15 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
 from .views import *
 
 urlpatterns = [
     path('profile/<str:location_id>/', profile, name='profile'),
-    path('api/section-data/<str:location_id>/<int:section_id>/', section_data, name='section_data'),
+    path('sections/next/', get_section, name='next_section'),
+    path('async/profile/<str:location_id>/', aprofile, name='aprofile'),
+    path('async/sections/next/', aget_section, name='anext_section'),
+    path('api/', include(router.urls)),
+    path('exports/indicator-values/', export_indicator_values_view, name='export_indicator_values'),
+    path('tiles/<int:location_type_id>/<int:z>/<int:x>/<int:y>.mvt', location_tile, name='location_tile'),
 ]
@@ -1,10 +1,16 @@
-from django.core.serializers import serialize
-from django.db.models import Q, OuterRef, Subquery, Prefetch
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.db.models import Count, Max, Q, OuterRef, Subquery, Prefetch
 from django.shortcuts import render, get_object_or_404
-from django.http import HttpResponse, JsonResponse
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.template import loader
+from django.urls import NoReverseMatch, reverse
+from django.utils.cache import patch_cache_control
 from django_filters import rest_framework as filters
 from rest_framework import routers, serializers, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
 
 from .models import (
     Section,
@@ -16,9 +22,11 @@ from .models import (
     IndicatorValue,
     Location,
     CustomLocation,
+    GeometryTier,
     IndicatorFilterOption,
     LocationType,
     assemble_header_data,
+    get_header_values,
 )
 from .serializers import (
     CategorySerializer,
@@ -29,53 +37,178 @@ from .serializers import (
     LocationTypeSerializer,
     ColorScaleSerializer,
 )
+from .conditional import conditional_view
+from .conf import get_setting
+from .db_routers import ReadReplicaMixin, read_replica
+from .exports import EXPORT_FORMATS, export_indicator_values
+from .geojson import to_geojson
+from .payloads import dumps, encode_indicator_values
+from .profile_cache import aget_or_build, aget_or_render_section, get_or_build, get_or_render_section
+from .tiles import TILE_CONTENT_TYPE, get_tile
 from django_d3_indicator_viz.indicator_value_aggregator import (
     aggregation_result,
     IndicatorValueAggregator,
 )
 
-import json
+import asyncio
+import tempfile
+from functools import partial
 
 
-def build_profile_context(request, location_slug, indicator_value_aggregator):
+# The location fields sent to the page, matching LocationSerializer
+LOCATION_VALUE_FIELDS = ("id", "name", "location_type_id", "color")
+
+
+@read_replica
+def build_profile_context(request, location_slug, indicator_value_aggregator, force=False):
     """
     Build the context for the profile page. Mostly 
     """
+    try:
+        geoid, *slug = location_slug.split("-")
+
+        location = Location.objects.defer(*Location.GEOMETRY_FIELDS).select_related("location_type").get(id=geoid)
+
+        return get_or_build(
+            ("context", location.id),
+            lambda: __build_profile_context(location, False, indicator_value_aggregator),
+            force=force,
+        )
+
+    except Location.DoesNotExist:
+        try:
+            location = CustomLocation.objects.defer("geometry", "bbox").get(slug__iexact=location_slug)
 
-    is_custom_location = False
+            return get_or_build(
+                ("custom-context", location.id, __aggregator_path(indicator_value_aggregator)),
+                lambda: __build_profile_context(location, True, indicator_value_aggregator),
+                force=force,
+            )
+
+        except CustomLocation.DoesNotExist:
+            return None
+
+
+@read_replica
+async def abuild_profile_context(request, location_slug, indicator_value_aggregator, force=False):
+    """
+    build_profile_context for async views, running its independent queries
+    concurrently.
+    """
     try:
         geoid, *slug = location_slug.split("-")
 
-        location = Location.objects.get(id=geoid)
+        location = await (
+            Location.objects.defer(*Location.GEOMETRY_FIELDS).select_related("location_type").aget(id=geoid)
+        )
 
-        (
-            location_type,
-            locations,
-            parent_locations,
-            location_geojson,
-            sibling_locations_geojson,
-            indicator_values_dict_list,
-            header_data,
-        ) = __build_standard_profile_context(location)
+        return await aget_or_build(
+            ("context", location.id),
+            lambda: __abuild_profile_context(location, False, indicator_value_aggregator),
+            force=force,
+        )
 
     except Location.DoesNotExist:
         try:
-            location = CustomLocation.objects.get(slug__iexact=location_slug)
-            is_custom_location = True
-
-            (
-                location_type,
-                locations,
-                parent_locations,
-                location_geojson,
-                sibling_locations_geojson,
-                indicator_values_dict_list,
-                header_data,
-            ) = __build_custom_profile_context(location, indicator_value_aggregator)
+            location = await CustomLocation.objects.defer("geometry", "bbox").aget(slug__iexact=location_slug)
+
+            return await aget_or_build(
+                ("custom-context", location.id, __aggregator_path(indicator_value_aggregator)),
+                lambda: __abuild_profile_context(location, True, indicator_value_aggregator),
+                force=force,
+            )
 
         except CustomLocation.DoesNotExist:
             return None
 
+
+def __aggregator_path(indicator_value_aggregator):
+    """
+    The dotted path of an aggregator class or instance. Custom locations are
+    aggregated, so it's part of their cache key.
+    """
+    aggregator = (
+        indicator_value_aggregator
+        if isinstance(indicator_value_aggregator, type)
+        else type(indicator_value_aggregator)
+    )
+    return f"{aggregator.__module__}.{aggregator.__qualname__}"
+
+
+def run_step(step):
+    """
+    Runs a step of an async view in a worker thread, then closes the thread's
+    database connection unless it may be reused (CONN_MAX_AGE).
+    """
+    try:
+        return step()
+    finally:
+        close_old_connections()
+
+
+async def run_concurrently(*steps):
+    """
+    Runs independent sync steps concurrently, each in a worker thread with
+    its own database connection, and returns their results in order.
+    """
+    return await asyncio.gather(
+        *(sync_to_async(run_step, thread_sensitive=False)(step) for step in steps)
+    )
+
+
+def __build_profile_context(location, is_custom_location, indicator_value_aggregator):
+    """
+    Build the context for the profile page of a location or custom location.
+    """
+    if is_custom_location:
+        location_context = __build_custom_profile_context(location, indicator_value_aggregator)
+    else:
+        location_context = __combine_standard_profile_context(
+            location, *(step() for step in __standard_profile_steps(location))
+        )
+
+    return __assemble_profile_context(
+        location, is_custom_location, location_context, __build_common_profile_context(location.id)
+    )
+
+
+async def __abuild_profile_context(location, is_custom_location, indicator_value_aggregator):
+    """
+    __build_profile_context with the common and location steps run
+    concurrently.
+    """
+    if is_custom_location:
+        # The custom context's queries depend on one another, so it's one step
+        location_steps = [partial(__build_custom_profile_context, location, indicator_value_aggregator)]
+    else:
+        location_steps = __standard_profile_steps(location)
+
+    common_context, *location_results = await run_concurrently(
+        partial(__build_common_profile_context, location.id), *location_steps
+    )
+    if is_custom_location:
+        location_context = location_results[0]
+    else:
+        location_context = __combine_standard_profile_context(location, *location_results)
+
+    # Encoding the payloads is CPU-bound, so it stays off the event loop
+    (context,) = await run_concurrently(
+        partial(__assemble_profile_context, location, is_custom_location, location_context, common_context)
+    )
+    return context
+
+
+def __assemble_profile_context(location, is_custom_location, location_context, common_context):
+    (
+        location_type,
+        locations,
+        parent_locations,
+        location_geojson,
+        sibling_locations_geojson,
+        indicator_values_dict_list,
+        header_data,
+    ) = location_context
+
     (
         sections,
         categories,
@@ -84,7 +217,7 @@ def build_profile_context(request, location_slug, indicator_value_aggregator):
         color_scales,
         data_visuals,
         filter_options,
-    ) = __build_common_profile_context(location_type, parent_locations, location.id)
+    ) = common_context
 
     return {
         "sections": sections,
@@ -95,28 +228,52 @@ def build_profile_context(request, location_slug, indicator_value_aggregator):
         "location": location,
         "location_type": location_type,
         "parent_locations": parent_locations,
-        "indicators_json": json.dumps(list(indicators), default=str),
-        "locations_json": json.dumps(list(locations), default=str),
+        "indicators_json": dumps(indicators),
+        "locations_json": dumps(locations),
         "location_geojson": location_geojson,
         "sibling_locations_geojson": sibling_locations_geojson,
-        "parent_locations_json": json.dumps(list(parent_locations), default=str),
-        "location_types_json": json.dumps(list(location_types), default=str),
-        "color_scales_json": json.dumps(list(color_scales), default=str),
-        "data_visuals_json": json.dumps(list(data_visuals), default=str),
-        "indicator_values_json": json.dumps(indicator_values_dict_list, default=str),
-        "filter_options_json": json.dumps(list(filter_options), default=str),
+        "sibling_tiles_url": __location_tiles_url(location_type),
+        "parent_locations_json": dumps(parent_locations),
+        "location_types_json": dumps(location_types),
+        "color_scales_json": dumps(color_scales),
+        "data_visuals_json": dumps(data_visuals),
+        "indicator_values_json": dumps(indicator_values_dict_list),
+        "filter_options_json": dumps(filter_options),
         "is_custom_location": is_custom_location,
     }
 
 
-def __build_common_profile_context(location_type, parent_locations, location_id=None):
-    sections = Section.objects.all().order_by("sort_order").values()
-    categories = Category.objects.all().order_by("sort_order").values()
-    indicators = Indicator.objects.all().order_by("sort_order").values()
+def __serialize_locations(locations, tier, fields):
+    """
+    Serializes a queryset of locations to GeoJSON using the stored simplified
+    geometry of the given tier instead of the full-precision geometry.
+    """
+    return to_geojson(locations, Location.geometry_field_for(tier), fields)
+
+
+def __location_tiles_url(location_type):
+    """
+    The tile URL template ({z}/{x}/{y}) for a location type's vector tiles,
+    or None when the tile view isn't routed.
+    """
+    try:
+        url = reverse(
+            "location_tile", kwargs={"location_type_id": location_type.id, "z": 0, "x": 0, "y": 0}
+        )
+    except NoReverseMatch:
+        return None
+    return url.removesuffix("0/0/0.mvt") + "{z}/{x}/{y}.mvt"
+
 
-    location_types = LocationType.objects.all().values()
+def __build_common_profile_context(location_id=None):
+    # Evaluated here, so async views read them in their worker thread
+    sections = list(Section.objects.all().order_by("sort_order").values())
+    categories = list(Category.objects.all().order_by("sort_order").values())
+    indicators = list(Indicator.objects.all().order_by("sort_order").values())
 
-    color_scales = ColorScale.objects.all().order_by("name").values()
+    location_types = list(LocationType.objects.all().values())
+
+    color_scales = list(ColorScale.objects.all().order_by("name").values())
 
     # Get data visuals with resolved sources based on data availability
     data_visuals = [
@@ -128,7 +285,7 @@ def __build_common_profile_context(location_type, parent_locations, location_id=
     # Filter out any that returned None (no sources configured)
     data_visuals = [dv for dv in data_visuals if dv is not None]
 
-    filter_options = (
+    filter_options = list(
         IndicatorFilterOption.objects.all().order_by("sort_order").values()
     )
 
@@ -143,34 +300,62 @@ def __build_common_profile_context(location_type, parent_locations, location_id=
     )
 
 
-def __build_standard_profile_context(location):
+def __standard_profile_steps(location):
+    """
+    The independent steps of a standard location's context, run one after
+    another by the sync views and concurrently by the async ones.
+    """
+    return [
+        partial(__standard_profile_values, location),
+        partial(__profile_location_geojson, location),
+        partial(__adjacent_siblings_geojson, location),
+        # indicators with no category will be shown in the header area
+        partial(assemble_header_data, location.id),
+    ]
+
+
+def __combine_standard_profile_context(location, values, location_geojson, sibling_locations_geojson, header_data):
+    parent_locations, locations, indicator_values_dict_list = values
+    return (
+        location.location_type,
+        locations,
+        parent_locations,
+        location_geojson,
+        sibling_locations_geojson,
+        indicator_values_dict_list,
+        header_data,
+    )
+
+
+def __profile_location_geojson(location):
+    return __serialize_locations(
+        Location.objects.filter(id=location.id), GeometryTier.NEIGHBORHOOD, ("id", "name")
+    )
+
+
+def __adjacent_siblings_geojson(location):
+    # With sibling map tiles, the map loads siblings from the tile view instead
+    if get_setting("SIBLING_MAP_TILES", False):
+        return None
+    return __serialize_locations(
+        location.get_siblings(adjacent=True),
+        GeometryTier.CITY,
+        ("id", "name", "location_type"),
+    )
+
+
+def __standard_profile_values(location):
     location_type = location.location_type
-    parent_location_types = location.location_type.parent_location_types.all()
 
     # Parent locations are of a different type than the profile location, 
     # set up as a parent type of the profile location's type, have a larger 
-    # area, and contain the profile location's center point
-
+    # area, and contain the profile location's center point. They are
+    # precomputed in the LocationAncestor table.
 
     # limit to the two closest parent locations
-    parent_locations = Location.objects.extra(
-        select={"area": "st_area(geometry)"},
-        where=[
-            "location_type_id <> %s",
-            "location_type_id = any(%s)",
-            "st_area(geometry) > (select st_area(geometry) from location where id = %s)",
-            "st_contains(geometry, (select st_pointonsurface(geometry) from location where id = %s))",
-        ],
-        params=[
-            location_type.id,
-            list(parent_location_types.values_list("id", flat=True)),
-            location.id,
-            location.id,
-        ],
-        order_by=["area"],
-    )[:2].values()
+    parent_locations = list(location.get_parents(defer_geom=True).values(*LOCATION_VALUE_FIELDS))
 
-    locations = (
+    locations = list(
         Location.objects.filter(
             Q(location_type_id=location_type.id)
             | Q(id__in=[loc["id"] for loc in parent_locations])
@@ -178,24 +363,6 @@ def __build_standard_profile_context(location):
         .order_by("location_type__name", "name")
         .values("id", "location_type_id", "name")
     )
-    location_geojson = serialize(
-        "geojson", [location], geometry_field="geometry", fields=("id", "name")
-    )
-
-    sibling_locations_geojson = serialize(
-        "geojson",
-        (
-            Location.objects
-            .filter(location_type_id=location_type.id)
-            .exclude(id=location.id)
-            .extra(
-                where=["ST_DWithin(geometry, (SELECT geometry FROM location WHERE id = %s), %s)"],
-                params=[location.id, 0.01]
-            )
-        ),
-        geometry_field="geometry",
-        fields=("id", "name", "location_type"),
-    )
 
     # indicator values are all values for the profile location
     # additional values for the profile location's parents or siblings are included if the data visual's location comparison type is set
@@ -209,16 +376,14 @@ def __build_standard_profile_context(location):
             join indicator_data_visual idv on iv.indicator_id = idv.indicator_id
             join indicator_data_visual_source idvs on idvs.data_visual_id = idv.id and idvs.source_id = iv.source_id
             left join indicator_filter_option ifo on iv.filter_option_id = ifo.id
+            left join indicator_latest_vintage ilv on ilv.indicator_id = iv.indicator_id and ilv.source_id = iv.source_id
         where (iv.location_id = %s
             or (idv.location_comparison_type = 'siblings' and l.location_type_id = %s)
             or (idv.location_comparison_type = 'parents' and l.id = any(%s)))
             and (idv.start_date IS NULL or iv.start_date = idv.start_date or idv.data_visual_type = 'line')
             and (idv.start_date IS NOT NULL
                  or idv.data_visual_type = 'line'
-                 or iv.end_date = (SELECT MAX(iv2.end_date)
-                                  FROM indicator_value iv2
-                                  WHERE iv2.indicator_id = iv.indicator_id
-                                    AND iv2.source_id = iv.source_id))
+                 or iv.end_date = ilv.latest_end_date)
         order by i.sort_order, l.name, iv.start_date, ifo.sort_order
         """,
         (
@@ -231,85 +396,49 @@ def __build_standard_profile_context(location):
         indicator_values
     )
 
-    # indicators with no category will be shown in the header area
-    from django.db.models import Exists, OuterRef, Subquery, Q
-    from django.db.models.expressions import RawSQL
-
-    header_data_visuals = list(
-        IndicatorDataVisual.objects.filter(indicator__category_id__isnull=True)
-        .select_related("indicator")
-        .prefetch_related('indicatordatavisualsource_set__source')
-        .extra(
-            select={
-                'header_value': '''
-                    SELECT iv.value
-                    FROM indicator_value iv
-                    JOIN indicator_data_visual_source idvs ON iv.source_id = idvs.source_id
-                    WHERE iv.indicator_id = indicator_data_visual.indicator_id
-                      AND EXTRACT(YEAR FROM iv.end_date) = EXTRACT(YEAR FROM indicator_data_visual.end_date)
-                      AND iv.location_id = %s
-                      AND idvs.data_visual_id = indicator_data_visual.id
-                    ORDER BY idvs.priority, iv.end_date DESC
-                    LIMIT 1
-                '''
-            },
-            select_params=(location.id,)
-        )
-        .order_by("indicator__sort_order")
-    )
-
-    header_data = [
-        {
-            "indicator_name": hdv.indicator.name,
-            "source_name": hdv.indicatordatavisualsource_set.first().source.name if hdv.indicatordatavisualsource_set.first() else None,
-            "year": str(hdv.end_date.year) if hdv.end_date else None,
-            "value": hdv.header_value if hdv.header_value else None,
-        }
-        for hdv in header_data_visuals
-    ]
-
-    return (
-        location_type,
-        locations,
-        parent_locations,
-        location_geojson,
-        sibling_locations_geojson,
-        indicator_values_dict_list,
-        header_data,
-    )
+    return parent_locations, locations, indicator_values_dict_list
 
 
 def __build_custom_profile_context(location, indicator_value_aggregator):
 
     # Only one we need the geography on
-    location_type = location.locations.first().location_type
+    location_type = (
+        location.locations.defer(*Location.GEOMETRY_FIELDS).select_related("location_type").first().location_type
+    )
     
     # This table says which 
 
-    parent_location_types = location_type.parent_location_types.all()
     # parent locations are of a different type than the profile location, 
     # set up as a parent type of the profile location's type, have a larger area, 
     # and contain the profile location's center point limit to the two closest 
     # parent locations
-
-    parent_locations = Location.objects.extra(
-        select={"area": "st_area(geometry)"},
-        where=[
-            "location_type_id <> %s",
-            "location_type_id = any(%s)",
-
-            # This handles the 'custom' stuff basically unioning the 
-            "st_area(geometry) > (select st_area(st_union(geometry)) from location where id = any(%s))",
-            "st_contains(geometry, (select st_pointonsurface(st_union(geometry)) from location where id = any(%s)))",
-        ],
-        params=[
-            location_type.id,
-            list(parent_location_types.values_list("id", flat=True)),
-            list(location.locations.values_list("id", flat=True)),
-            list(location.locations.values_list("id", flat=True)),
-        ],
-        order_by=["area"],
-    )[:2].values()
+    if location.point_on_surface is not None:
+        parent_locations = (
+            Location.objects.exclude(location_type_id=location_type.id)
+            .filter(
+                location_type__in=location_type.parent_location_types.all(),
+                area__gt=location.area,
+                geometry__contains=location.point_on_surface,
+            )
+            .order_by("area")[:2]
+            .values(*LOCATION_VALUE_FIELDS)
+        )
+    else:
+        # Without a stored union geometry, use the precomputed parents shared 
+        # by the locations that make up the custom location, falling back to 
+        # the parents shared by most of them when they straddle a boundary
+        parent_locations = (
+            Location.objects.filter(
+                descendant_links__child__in=location.locations.all(),
+                descendant_links__depth=1,
+            )
+            .annotate(
+                member_count=Count("descendant_links"),
+                area_rank=Max("descendant_links__area_rank"),
+            )
+            .order_by("-member_count", "area_rank")[:2]
+            .values(*LOCATION_VALUE_FIELDS)
+        )
     locations = (
         Location.objects.filter(
             Q(location_type_id=location_type.id)
@@ -327,64 +456,62 @@ def __build_custom_profile_context(location, indicator_value_aggregator):
             "name": location.name,
         }
     )
-    location_geojson = serialize(
-        "geojson",
+    location_geojson = __serialize_locations(
         Location.objects.filter(
             Q(id__in=location.locations.values_list("id", flat=True))
         ),
-        geometry_field="geometry",
-        fields=("id", "name"),
+        GeometryTier.NEIGHBORHOOD,
+        ("id", "name"),
     )
     # include all sibling locations of the same type as the profile location, including those that make up the custom location
-    sibling_locations_geojson = serialize(
-        "geojson",
-        Location.objects.filter(Q(location_type_id=location_type.id)),
-        geometry_field="geometry",
-        fields=("id", "name", "location_type"),
-    )
+    # every location of the type is drawn, so use the coarsest tier
+    sibling_locations_geojson = None
+    if not get_setting("SIBLING_MAP_TILES", False):
+        sibling_locations_geojson = __serialize_locations(
+            Location.objects.filter(Q(location_type_id=location_type.id)),
+            GeometryTier.OVERVIEW,
+            ("id", "name", "location_type"),
+        )
 
     # indicator values are all values for the profile location
     # additional values for the profile location's parents or siblings are included if the data visual's location comparison type is set
     # values are filtered by the corresponding data visual's source and start date (start date is ignored if the data visual type is 'line')
-    custom_indicator_values = IndicatorValue.objects.raw(
+    # the rows are read once, rather than once per data visual below
+    custom_indicator_values = __build_indicator_values_dict_list(IndicatorValue.objects.raw(
         """
-        select *
+        select iv.*, l.name, idv.*, i.*, ifo.*
         from indicator_value iv
             join location l on iv.location_id = l.id
             join indicator i on iv.indicator_id = i.id
             join indicator_data_visual idv on iv.indicator_id = idv.indicator_id
             join indicator_data_visual_source idvs on idvs.data_visual_id = idv.id and idvs.source_id = iv.source_id
             left join indicator_filter_option ifo on iv.filter_option_id = ifo.id
+            left join indicator_latest_vintage ilv on ilv.indicator_id = iv.indicator_id and ilv.source_id = iv.source_id
         where iv.location_id = any(%s)
             and (idv.start_date IS NULL or iv.start_date = idv.start_date or idv.data_visual_type = 'line')
             and (idv.start_date IS NOT NULL
                  or idv.data_visual_type = 'line'
-                 or iv.end_date = (SELECT MAX(iv2.end_date)
-                                  FROM indicator_value iv2
-                                  WHERE iv2.indicator_id = iv.indicator_id
-                                    AND iv2.source_id = iv.source_id))
+                 or iv.end_date = ilv.latest_end_date)
         order by i.sort_order, l.name, iv.start_date, ifo.sort_order
         """,
         ([id for id in location.locations.values_list("id", flat=True)],),
-    )
+    ))
     parent_sibling_indicator_values = IndicatorValue.objects.raw(
         """
-        select *
+        select iv.*, l.name, idv.*, i.*, ifo.*
         from indicator_value iv
             join location l on iv.location_id = l.id
             join indicator i on iv.indicator_id = i.id
             join indicator_data_visual idv on iv.indicator_id = idv.indicator_id
             join indicator_data_visual_source idvs on idvs.data_visual_id = idv.id and idvs.source_id = iv.source_id
             left join indicator_filter_option ifo on iv.filter_option_id = ifo.id
+            left join indicator_latest_vintage ilv on ilv.indicator_id = iv.indicator_id and ilv.source_id = iv.source_id
         where ((idv.location_comparison_type = 'siblings' and l.location_type_id = %s)
             or (idv.location_comparison_type = 'parents' and l.id = any(%s)))
             and (idv.start_date IS NULL or iv.start_date = idv.start_date or idv.data_visual_type = 'line')
             and (idv.start_date IS NOT NULL
                  or idv.data_visual_type = 'line'
-                 or iv.end_date = (SELECT MAX(iv2.end_date)
-                                  FROM indicator_value iv2
-                                  WHERE iv2.indicator_id = iv.indicator_id
-                                    AND iv2.source_id = iv.source_id))
+                 or iv.end_date = ilv.latest_end_date)
         order by i.sort_order, l.name, iv.start_date, ifo.sort_order
         """,
         (location_type.id, [loc["id"] for loc in parent_locations]),
@@ -406,33 +533,34 @@ def __build_custom_profile_context(location, indicator_value_aggregator):
     indicator_values_dict_list.extend(
         __build_indicator_values_dict_list(parent_sibling_indicator_values)
     )
-    # indicators with no category will be shown in the header area
+    # indicators with no category will be shown in the header area, with
+    # the values of the locations making up the custom location aggregated
     header_data_visuals = IndicatorDataVisual.objects.filter(
         indicator__category_id__isnull=True
-    ).prefetch_related('indicatordatavisualsource_set__source').order_by("indicator__sort_order")
+    ).select_related("indicator").in_bulk()
+    header_values = {}
+    for hv in get_header_values(location.locations.values_list("id", flat=True)):
+        entry = header_values.setdefault(hv["data_visual_id"], (hv, []))
+        if hv["indicator_value_id"] is not None:
+            entry[1].append(hv)
     header_data = []
-    for hdv in header_data_visuals:
-        indicators = Indicator.objects.filter(id=hdv.indicator_id)
-        indicator_values = IndicatorValue.objects.filter(
-            indicator_id=hdv.indicator_id,
-            location_id__in=location.locations.values_list("id", flat=True),
-            source_id=hdv.get_primary_source().id if hdv.get_primary_source() else None,
-            start_date=hdv.start_date,
-            end_date=hdv.end_date,
-        )
+    for data_visual_id, (hv, member_values) in header_values.items():
         aggregated_value = (
-            __aggregate_indicator_values(
-                location, hdv, indicator_values, indicator_value_aggregator
-            )[0]
-            if indicator_values.exists()
+            __aggregate_indicator_value_set(
+                location,
+                header_data_visuals[data_visual_id],
+                member_values,
+                indicator_value_aggregator,
+            )
+            if member_values
             else None
         )
         header_data.append(
             {
-                "indicator_name": hdv.indicator.name,
-                "source_name": hdv.get_primary_source().name if hdv.get_primary_source() else None,
-                "year": str(hdv.end_date.year) if hdv.end_date else None,
-                "value": aggregated_value.value if aggregated_value else None,
+                "indicator_name": hv["indicator_name"],
+                "source_name": hv["source_name"],
+                "year": str(hv["year"]) if hv["year"] else None,
+                "value": aggregated_value["value"] if aggregated_value else None,
             }
         )
 
@@ -451,7 +579,7 @@ def __aggregate_indicator_values(
     custom_location, data_visual, indicator_values, indicator_value_aggregator
 ):
     grouped_values = {}
-    for iv in __build_indicator_values_dict_list(indicator_values):
+    for iv in indicator_values:
         if iv["indicator_id"] != data_visual.indicator.id:
             continue
         key = (iv["filter_option_id"], iv["start_date"])
@@ -641,14 +769,20 @@ def __build_indicator_values_dict_list(indicator_values):
     ]
 
 
-def roll_indicators(category, location):
+def roll_indicators(category, location, visual_metadata=None):
     """
     Annoying that this is necessary, but we're handling the case where 
     there isn't a data visual associated with an indicator.
+
+    Pass the section's resolved visual_metadata (see
+    Section.get_visual_metadata) to avoid per-indicator queries.
     """
     result = []
     for indicator in category.indicator_set.all():
-        meta = indicator.get_visual_metadata(location)
+        if visual_metadata is None:
+            meta = indicator.get_visual_metadata(location)
+        else:
+            meta = visual_metadata.get(indicator.id)
         if not meta: continue
         result.append(
             {
@@ -668,97 +802,210 @@ def roll_section(section, primary_location, comparison_locations):
     """
     Pre computing some things. 
     """
+    return __section_dict(
+        section,
+        roll_categories(section, primary_location),
+        roll_section_values(section, primary_location, comparison_locations),
+    )
+
+
+def roll_categories(section, primary_location):
+    visual_metadata = section.get_visual_metadata(primary_location)
+
+    return [
+        {
+            "id": category.id,
+            "name": category.name,
+            "anchor": category.anchor,
+            "indicators": roll_indicators(category, primary_location, visual_metadata)
+        } for category in section.category_set.prefetch_related("indicator_set")
+    ]
+
+
+def roll_section_values(section, primary_location, comparison_locations):
+    """
+    The encoded indicator values of a section.
+    """
+    return dumps(
+        encode_indicator_values(section.get_indicator_values([primary_location, *comparison_locations]))
+    )
+
+
+def __section_dict(section, categories, indicator_values):
     return {
         "name": section.name,
         "anchor": section.anchor,
         "sort_order": section.sort_order,
-        "categories": [
-            {
-                "id": category.id,
-                "name": category.name,
-                "anchor": category.anchor,
-                "indicators": roll_indicators(category, primary_location)            
-            } for category in section.category_set.all()
-        ],
-        "indicator_values": json.dumps(section.get_indicator_values([primary_location, *comparison_locations])),
+        "categories": categories,
+        "indicator_values": indicator_values,
     }
 
 
+@read_replica
+@conditional_view("profile")
 def profile(request, location_id, template_path="django_d3_indicators_viz/profile.html"):
-    location = get_object_or_404(Location, id=location_id)
-    location_type = location.location_type
+    return render(request, template_path, build_profile_page_context(location_id))
 
-    # Serialize location geometry
-    location_geojson = serialize(
-        "geojson", [location], geometry_field="geometry", fields=("id", "name")
+
+@read_replica
+@conditional_view("profile")
+async def aprofile(request, location_id, template_path="django_d3_indicators_viz/profile.html"):
+    """
+    profile for ASGI deployments, running the page's independent queries
+    concurrently.
+    """
+    context = await abuild_profile_page_context(location_id)
+    # The page's sections chain to aget_section rather than get_section
+    return await sync_to_async(render)(
+        request, template_path, {**context, "next_section_view": "anext_section"}
     )
 
-    # limit to the two closest parent locations
-    parent_locations = location.get_parents()
 
+@read_replica
+def build_profile_page_context(location_id, force=False):
+    """
+    The context of the profile view, from the profile cache when it's on.
+    """
+    return get_or_build(
+        ("page", location_id), lambda: __build_profile_page_context(location_id), force=force
+    )
+
+
+@read_replica
+async def abuild_profile_page_context(location_id, force=False):
+    """
+    build_profile_page_context for async views.
+    """
+    return await aget_or_build(
+        ("page", location_id), lambda: __abuild_profile_page_context(location_id), force=force
+    )
+
+
+def __profile_page_location(location_id):
+    return get_object_or_404(
+        Location.objects.defer(*Location.GEOMETRY_FIELDS).select_related("location_type"), id=location_id
+    )
+
+
+def __first_section():
+    # Get the first section, but as an iterator, not individually.
+    return Section.objects.all().order_by('sort_order').first()
+
+
+def __profile_page_steps(location, section):
+    """
+    The independent steps of the profile page context, run one after another
+    by profile and concurrently by aprofile.
+    """
+    return [
+        partial(__profile_location_geojson, location),
+        partial(__nearby_siblings_geojson, location),
+        __profile_page_metadata,
+        partial(assemble_header_data, location.id),
+        partial(roll_categories, section, location),
+        partial(__profile_page_parents_and_values, location, section),
+    ]
+
+
+def __build_profile_page_context(location_id):
+    location = __profile_page_location(location_id)
+    section = __first_section()
+    return __assemble_profile_page_context(
+        location, section, *(step() for step in __profile_page_steps(location, section))
+    )
+
+
+async def __abuild_profile_page_context(location_id):
+    location, section = await run_concurrently(
+        partial(__profile_page_location, location_id), __first_section
+    )
+    results = await run_concurrently(*__profile_page_steps(location, section))
+
+    # Serializing and encoding the profile data is CPU-bound, so it stays off
+    # the event loop
+    (context,) = await run_concurrently(
+        partial(__assemble_profile_page_context, location, section, *results)
+    )
+    return context
+
+
+def __nearby_siblings_geojson(location):
     # The display siblings only focusing on the bounding box that roughly
     # covers the map, where all siblings skips the geometry for a speed-up
-    display_siblings = location.get_siblings(nearby=True)
 
-    display_siblings_geojson = serialize(
-        "geojson",
-        display_siblings,
-        geometry_field="geometry",
-        fields=("id", "name", "location_type"),
-    )
-    
     # TODO (Mike): We'll eventually have to put this back, but for now 
     # we don't compare with siblings, and when we do we have to get to
     # all siblings within parents -- which is different than display.
     # all_siblings = location.get_siblings(defer_geom=True)
+    if get_setting("SIBLING_MAP_TILES", False):
+        return None
+    return __serialize_locations(
+        location.get_siblings(nearby=True),
+        GeometryTier.CITY,
+        ("id", "name", "location_type"),
+    )
 
+
+def __profile_page_metadata():
     # This is messy, but these are needed globally and can't be called from within
     # the tree. These are expected to be complete even down to the charts layer ...
-    filter_options = IndicatorFilterOption.objects.all()
-    color_scales = ColorScale.objects.all()
-    location_types = LocationType.objects.all()
+    return {
+        "filterOptions": IndicatorFilterOptionSerializer(IndicatorFilterOption.objects.all(), many=True).data,
+        "colorScales": ColorScaleSerializer(ColorScale.objects.all(), many=True).data,
+        "locationTypes": LocationTypeSerializer(LocationType.objects.all(), many=True).data,
+    }
+
+
+def __profile_page_parents_and_values(location, section):
+    # limit to the two closest parent locations
+    parent_locations = list(location.get_parents(defer_geom=True))
+    return (
+        parent_locations,
+        LocationSerializer(parent_locations, many=True).data,
+        roll_section_values(section, location, parent_locations),
+    )
+
+
+def __assemble_profile_page_context(
+    location, section, location_geojson, display_siblings_geojson, metadata, header_data, categories, parents_and_values
+):
+    location_type = location.location_type
+    parent_locations, parents_data, indicator_values = parents_and_values
 
-    header_data = assemble_header_data(location_id)
-    
-    # Get the first section, but as an iterator, not individually.
-    section = Section.objects.all().order_by('sort_order').first()
-    
     # FIXME (Mike): This creates a list with these unpacks, to then 
     # create another list within 'roll_section.' try to avoid this many
     # list creations.
-    sections = [roll_section(section, location, parent_locations)]
+    sections = [__section_dict(section, categories, indicator_values)]
 
     # Build profile data for JavaScript (locations, filter options, etc.)
     profile_data = {
-        "filterOptions": IndicatorFilterOptionSerializer(filter_options, many=True).data,
-        "colorScales": ColorScaleSerializer(color_scales, many=True).data,
-        "locationTypes": LocationTypeSerializer(location_types, many=True).data,
+        **metadata,
         "locations": {
             "primary": LocationSerializer(location).data,
-            "parents": LocationSerializer(parent_locations, many=True).data,
+            "parents": parents_data,
             "siblings": [] # LocationSerializer(all_siblings, many=True).data,
         },
     }
 
-    return render(
-        request, template_path,
-        {
-            "sections": sections,
-            "profile_data_json": json.dumps(profile_data),
-            "primary_loc_id": location_id,
-            "parent_loc_ids": ",".join(loc.id for loc in parent_locations),
-            "sibling_loc_ids": "", # ",".join(loc.id for loc in all_siblings),
-            "header_data": header_data,
-            "location": location,
-            "location_type": location_type,
-            "parent_locations": parent_locations,
-            "location_geojson": location_geojson,
-            "sibling_locations_geojson": display_siblings_geojson,
-            "is_custom_location": False,
-        }
-    )
+    return {
+        "sections": sections,
+        "profile_data_json": dumps(profile_data),
+        "primary_loc_id": location.id,
+        "parent_loc_ids": ",".join(loc.id for loc in parent_locations),
+        "sibling_loc_ids": "", # ",".join(loc.id for loc in all_siblings),
+        "header_data": header_data,
+        "location": location,
+        "location_type": location_type,
+        "parent_locations": parent_locations,
+        "location_geojson": location_geojson,
+        "sibling_locations_geojson": display_siblings_geojson,
+        "sibling_tiles_url": __location_tiles_url(location_type),
+        "is_custom_location": False,
+    }
 
 
+@read_replica
+@conditional_view("get_section")
 def get_section(request):
     after = request.GET.get("after")
     next_section = Section.objects.filter(sort_order__gt=after).first()
@@ -768,26 +1015,240 @@ def get_section(request):
 
     primary_loc_id = request.GET.get('primary_loc_id')
     parent_loc_ids = request.GET.get('parent_loc_ids', '')
-    sibling_loc_ids = request.GET.get('sibling_loc_ids', '')
 
+    return HttpResponse(render_section(request, next_section, primary_loc_id, parent_loc_ids))
+
+
+@read_replica
+@conditional_view("get_section")
+async def aget_section(request):
+    """
+    get_section for ASGI deployments, running the section's independent
+    queries concurrently.
+    """
+    after = request.GET.get("after")
+    next_section = await Section.objects.filter(sort_order__gt=after).afirst()
+
+    if not next_section:
+        return HttpResponse("")
+
+    primary_loc_id = request.GET.get('primary_loc_id')
+    parent_loc_ids = request.GET.get('parent_loc_ids', '')
+
+    return HttpResponse(await arender_section(request, next_section, primary_loc_id, parent_loc_ids))
+
+
+def __section_location_steps(primary_loc_id, parent_loc_ids):
     # If you hit '', you'll get a list with [''] on split, so handle that case
     lst_parent_loc_ids = parent_loc_ids.split(",") if parent_loc_ids else []
-    lst_sibling_loc_ids = sibling_loc_ids.split(",") if sibling_loc_ids else []
 
-    location = Location.objects.get(id=primary_loc_id)
-    parent_locations = Location.objects.filter(id__in=lst_parent_loc_ids)
+    return [
+        partial(Location.objects.defer(*Location.GEOMETRY_FIELDS).get, id=primary_loc_id),
+        partial(list, Location.objects.filter(id__in=lst_parent_loc_ids).defer(*Location.GEOMETRY_FIELDS)),
+    ]
+
+
+def __section_steps(section, location, parent_locations):
+    return [
+        partial(roll_categories, section, location),
+        partial(roll_section_values, section, location, parent_locations),
+    ]
 
-    return render(
-        request, "django_d3_indicator_viz/section.html",
+
+def __section_html(
+    request, section, primary_loc_id, parent_loc_ids, next_section_view, categories, indicator_values
+):
+    return loader.render_to_string(
+        "django_d3_indicator_viz/section.html",
         {
-            "section": roll_section(next_section, location, parent_locations),
+            "section": __section_dict(section, categories, indicator_values),
             "primary_loc_id": primary_loc_id,
             "parent_loc_ids": parent_loc_ids,
             "sibling_loc_ids": "",
+            "next_section_view": next_section_view,
+        },
+        request,
+    )
+
+
+def render_section(request, section, primary_loc_id, parent_loc_ids, next_section_view="next_section"):
+    """
+    The HTML of a section for a primary location and its comma-separated
+    parent location ids, from the section cache when it's on. The section
+    loads the next one from the next_section_view URL.
+    """
+    def render_html():
+        location, parent_locations = (step() for step in __section_location_steps(primary_loc_id, parent_loc_ids))
+        return __section_html(
+            request,
+            section,
+            primary_loc_id,
+            parent_loc_ids,
+            next_section_view,
+            *(step() for step in __section_steps(section, location, parent_locations)),
+        )
+
+    return get_or_render_section(section.id, primary_loc_id, parent_loc_ids, render_html, next_section_view)
+
+
+async def arender_section(request, section, primary_loc_id, parent_loc_ids, next_section_view="anext_section"):
+    """
+    render_section for async views, with the section's categories and
+    values read concurrently.
+    """
+    async def render_html():
+        location, parent_locations = await run_concurrently(
+            *__section_location_steps(primary_loc_id, parent_loc_ids)
+        )
+        return await sync_to_async(__section_html)(
+            request,
+            section,
+            primary_loc_id,
+            parent_loc_ids,
+            next_section_view,
+            *await run_concurrently(*__section_steps(section, location, parent_locations)),
+        )
+
+    return await aget_or_render_section(
+        section.id, primary_loc_id, parent_loc_ids, render_html, next_section_view
+    )
+
+
+class NumberInFilter(filters.BaseInFilter, filters.NumberFilter):
+    pass
+
+
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    pass
+
+
+class IndicatorValueFilter(filters.FilterSet):
+    """
+    Filters for the indicator value API. The id filters take comma-separated
+    lists, and the date filters take ranges as <field>_after and
+    <field>_before.
+    """
+
+    indicator = NumberInFilter(field_name="indicator_id")
+    location = CharInFilter(field_name="location_id")
+    location_type = NumberInFilter(field_name="location__location_type_id")
+    source = NumberInFilter(field_name="source_id")
+    start_date = filters.DateFromToRangeFilter()
+    end_date = filters.DateFromToRangeFilter()
+
+    class Meta:
+        model = IndicatorValue
+        fields = []
+
+
+class IndicatorValueCursorPagination(CursorPagination):
+    """
+    Keyset pagination on id, so every page is an index range scan instead of
+    an OFFSET scan over the pages before it.
+    """
+
+    ordering = "id"
+    page_size_query_param = "page_size"
+
+    @property
+    def page_size(self):
+        return get_setting("API_PAGE_SIZE", 1000)
+
+    @property
+    def max_page_size(self):
+        return get_setting("API_MAX_PAGE_SIZE", 10000)
+
+
+class IndicatorValueViewSet(ReadReplicaMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Read-only bulk access to indicator values. Pass fields=id,value,... to
+    only return some fields.
+    """
+
+    queryset = IndicatorValue.objects.all()
+    serializer_class = IndicatorValueSerializer
+    filter_backends = [filters.DjangoFilterBackend]
+    filterset_class = IndicatorValueFilter
+    pagination_class = IndicatorValueCursorPagination
+
+    def get_fields(self):
+        fields = self.request.query_params.get("fields")
+        if not fields:
+            return None
+        fields = fields.split(",")
+        unknown = set(fields) - set(IndicatorValueSerializer.Meta.fields)
+        if unknown:
+            raise ValidationError({"fields": f"Unknown fields: {', '.join(sorted(unknown))}."})
+        return fields
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_fields()
+        if fields is not None:
+            queryset = queryset.only(*fields)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", self.get_fields())
+        return super().get_serializer(*args, **kwargs)
+
+
+router = routers.SimpleRouter()
+router.register("indicator-values", IndicatorValueViewSet, basename="indicator-value")
+
+
+@staff_member_required
+@read_replica
+def export_indicator_values_view(request):
+    """
+    Download a slice of indicator values as a Parquet file or Arrow IPC
+    stream. Takes format=parquet|arrow and comma-separated section,
+    location_type and source ids. The export is spooled to a temporary file,
+    so memory stays flat.
+    """
+    export_format = request.GET.get("format", "parquet")
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest(f"format must be one of {', '.join(EXPORT_FORMATS)}.")
+    try:
+        filters = {
+            f"{name}_ids": [int(id) for id in request.GET[name].split(",")]
+            for name in ("section", "location_type", "source")
+            if request.GET.get(name)
         }
+    except ValueError:
+        return HttpResponseBadRequest("section, location_type and source must be comma-separated ids.")
+
+    export_file = tempfile.TemporaryFile()
+    try:
+        export_indicator_values(export_file, export_format, **filters)
+    except ImportError as e:
+        # pyarrow isn't installed
+        export_file.close()
+        return HttpResponse(str(e), status=501, content_type="text/plain")
+    export_file.seek(0)
+
+    content_type, extension = EXPORT_FORMATS[export_format]
+    return FileResponse(
+        export_file,
+        as_attachment=True,
+        filename=f"indicator_values.{extension}",
+        content_type=content_type,
     )
 
 
+@read_replica
+def location_tile(request, location_type_id, z, x, y):
+    """
+    Serve a Mapbox Vector Tile of the locations of a location type.
+    """
+    if z > get_setting("TILE_MAX_ZOOM", 22) or x >= 2 ** z or y >= 2 ** z:
+        raise Http404("Tile out of range.")
+
+    response = HttpResponse(get_tile(location_type_id, z, x, y), content_type=TILE_CONTENT_TYPE)
+    patch_cache_control(response, public=True, max_age=get_setting("TILE_MAX_AGE", 60 * 60))
+    return response
+
+
 # Create your views here.
 def demo(request, location_slug=None):
     """